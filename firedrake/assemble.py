@@ -1,6 +1,9 @@
 import numpy
 import ufl
 from collections import defaultdict
+from ufl.algorithms.multifunction import MultiFunction
+from ufl.classes import Restricted
+from ufl.corealg.map_dag import map_expr_dag
 
 from pyop2 import op2
 from pyop2.base import collecting_loops
@@ -13,6 +16,7 @@ from firedrake import matrix
 from firedrake import parameters
 from firedrake import solving
 from firedrake import utils
+from firedrake.memory import memory_hook
 from firedrake.slate import slate
 from firedrake.slate import slac
 
@@ -20,6 +24,7 @@ from firedrake.slate import slac
 __all__ = ["assemble"]
 
 
+@memory_hook
 def assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
              inverse=False, mat_type=None, sub_mat_type=None, appctx={}, **kwargs):
     """Evaluate f.
@@ -40,9 +45,11 @@ def assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
          of the local matrices.
     :arg mat_type: (optional) string indicating how a 2-form (matrix) should be
          assembled -- either as a monolithic matrix ('aij' or 'baij'), a block matrix
-         ('nest'), or left as a :class:`.ImplicitMatrix` giving matrix-free
-         actions ('matfree').  If not supplied, the default value in
-         ``parameters["default_matrix_type"]`` is used.  BAIJ differs
+         ('nest'), left as a :class:`.ImplicitMatrix` giving matrix-free
+         actions ('matfree'), or a :class:`.PartiallyAssembledMatrix`
+         storing the element matrices ('partial').  If not supplied,
+         the default value in ``parameters["default_matrix_type"]`` is
+         used.  BAIJ differs
          from AIJ in that only the block sparsity rather than the dof
          sparsity is constructed.  This can result in some memory
          savings, but does not work with all PETSc preconditioners.
@@ -131,7 +138,7 @@ def create_assembly_callable(f, tensor=None, bcs=None, form_compiler_parameters=
     """
     if tensor is None:
         raise ValueError("Have to provide tensor to write to")
-    if mat_type == "matfree":
+    if mat_type in ["matfree", "partial"]:
         return tensor.assemble
     loops = _assemble(f, tensor=tensor, bcs=bcs,
                       form_compiler_parameters=form_compiler_parameters,
@@ -145,6 +152,62 @@ def create_assembly_callable(f, tensor=None, bcs=None, form_compiler_parameters=
     return thunk
 
 
+class GeometricQuantitySubstitution(MultiFunction):
+    """UFL MultiFunction replacing geometric quantities on meshes
+    with static geometry by precomputed fields.
+
+    :arg integral_type: the type of the integral being transformed.
+
+    See :attr:`.MeshGeometry.static_geometry`.
+    """
+    def __init__(self, integral_type):
+        super(GeometricQuantitySubstitution, self).__init__()
+        self.interior_facet = integral_type.startswith("interior_facet")
+
+    expr = MultiFunction.reuse_if_untouched
+
+    def terminal(self, o):
+        return o
+
+    def geometric_quantity(self, o):
+        mesh = o.ufl_domain()
+        name = o._ufl_handler_name_
+        if not (getattr(mesh, "static_geometry", False) and mesh.has_geometric_quantity(name)):
+            return o
+        f = mesh.geometric_quantity(name)
+        if name == "facet_area" and self.interior_facet:
+            # Single valued, but the trace field needs a restriction.
+            return f('+')
+        return f
+
+    def restricted(self, o, operand):
+        if isinstance(operand, Restricted):
+            # Already restricted facet area
+            return operand
+        return self.reuse_if_untouched(o, operand)
+
+
+def substitute_geometric_quantities(form):
+    """Replace geometric quantities in a form by precomputed fields.
+
+    :arg form: the :class:`~ufl.classes.Form`.
+    :returns: the form with the geometric quantities on meshes with
+        :attr:`~.MeshGeometry.static_geometry` replaced by the fields
+        of :meth:`~.MeshGeometry.geometric_quantity`, or ``form`` if
+        there is nothing to replace.
+    """
+    if not any(getattr(m, "static_geometry", False) for m in form.ufl_domains()):
+        return form
+    integrals = []
+    for integral in form.integrals():
+        mapper = GeometricQuantitySubstitution(integral.integral_type())
+        integrals.append(integral.reconstruct(integrand=map_expr_dag(mapper, integral.integrand())))
+    if all(new.integrand() is old.integrand()
+           for new, old in zip(integrals, form.integrals())):
+        return form
+    return ufl.Form(integrals)
+
+
 @utils.known_pyop2_safe
 def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
               inverse=False, mat_type=None, sub_mat_type=None,
@@ -165,7 +228,7 @@ def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
     :arg inverse: (optional) if f is a 2-form, then assemble the inverse
          of the local matrices.
     :arg mat_type: (optional) type for assembled matrices, one of
-        "nest", "aij", "baij", or "matfree".
+        "nest", "aij", "baij", "matfree" or "partial".
     :arg sub_mat_type: (optional) type for assembled sub matrices
         inside a "nest" matrix.  One of "aij" or "baij".
     :arg appctx: Additional information to hang on the assembled
@@ -173,7 +236,7 @@ def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
     """
     if mat_type is None:
         mat_type = parameters.parameters["default_matrix_type"]
-    if mat_type not in ["matfree", "aij", "baij", "nest"]:
+    if mat_type not in ["matfree", "partial", "aij", "baij", "nest"]:
         raise ValueError("Unrecognised matrix type, '%s'" % mat_type)
     if sub_mat_type is None:
         sub_mat_type = parameters.parameters["default_sub_matrix_type"]
@@ -193,6 +256,9 @@ def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
         if m.topology != f.ufl_domains()[0].topology:
             raise NotImplementedError("All integration domains must share a mesh topology.")
 
+    if isinstance(f, ufl.form.Form):
+        f = substitute_geometric_quantities(f)
+
     if isinstance(f, slate.TensorBase):
         kernels = slac.compile_expression(f, tsfc_parameters=form_compiler_parameters)
         integral_types = [kernel.kinfo.integral_type for kernel in kernels]
@@ -215,7 +281,7 @@ def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
     zero_tensor = lambda: None
 
     if is_mat:
-        matfree = mat_type == "matfree"
+        matfree = mat_type in ["matfree", "partial"]
         nest = mat_type == "nest"
         if nest:
             baij = sub_mat_type == "baij"
@@ -226,12 +292,12 @@ def _assemble(f, tensor=None, bcs=None, form_compiler_parameters=None,
                 raise NotImplementedError("Inverse not implemented with matfree")
             if collect_loops:
                 raise NotImplementedError("Can't collect loops with matfree")
+            cls = matrix.PartiallyAssembledMatrix if mat_type == "partial" else matrix.ImplicitMatrix
             if tensor is None:
-                return matrix.ImplicitMatrix(f, bcs,
-                                             fc_params=form_compiler_parameters,
-                                             appctx=appctx)
-            if not isinstance(tensor, matrix.ImplicitMatrix):
-                raise ValueError("Expecting implicit matrix with matfree")
+                return cls(f, bcs, fc_params=form_compiler_parameters,
+                           appctx=appctx)
+            if not isinstance(tensor, cls):
+                raise ValueError("Expecting %s with %s" % (cls.__name__, mat_type))
             tensor.assemble()
             return tensor
         test, trial = f.arguments()
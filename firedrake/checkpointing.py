@@ -1,10 +1,12 @@
 from firedrake.petsc import PETSc
-from pyop2.mpi import COMM_WORLD, dup_comm, free_comm
+from pyop2.mpi import COMM_WORLD, MPI, dup_comm, free_comm
 from firedrake import hdf5interface as h5i
+from pyop2.datatypes import IntType, ScalarType
 import firedrake
 import numpy as np
 import os
 import h5py
+from math import gcd
 
 
 __all__ = ["DumbCheckpoint", "HDF5File", "FILE_READ", "FILE_CREATE", "FILE_UPDATE"]
@@ -20,6 +22,351 @@ FILE_UPDATE = PETSc.Viewer.Mode.APPEND
 """Open a checkpoint file for updating.  Creates the file if it does not exist, providing both read and write access."""
 
 
+def _dataset_options(comm, local_size, chunk_size=None, compression=None,
+                     compression_opts=None, shuffle=False):
+    """Compute h5py dataset creation options for a distributed vector.
+
+    :arg comm: The communicator the dataset is written over.
+    :arg local_size: The number of entries (or blocks) owned by this
+        process.
+    :arg chunk_size: The requested number of entries (or blocks) per
+        chunk, or ``None`` for a contiguous dataset.
+    :arg compression: The compression filter (e.g. ``"gzip"``), or
+        ``None``.
+    :arg compression_opts: Options for the compression filter (the
+        compression level for ``"gzip"``).
+    :arg shuffle: Apply the byte shuffle filter before compressing?
+
+    :returns: a dict of keyword arguments to
+        :meth:`h5py:Group.create_dataset` (without the shape).
+
+    Chunk boundaries are aligned with the process ownership ranges
+    where possible, so that each chunk is written by exactly one
+    process.  This keeps parallel compressed writes collective.  The
+    chunk size is the largest divisor of all the local sizes that
+    does not exceed ``chunk_size``.  If that is smaller than half the
+    requested size, the requested size is used as is, and HDF5 takes
+    care of chunks that straddle process boundaries.
+    """
+    if chunk_size is None and compression is None and not shuffle:
+        return {}
+    sizes = comm.allgather(local_size)
+    total = sum(sizes)
+    if chunk_size is None:
+        chunk_size = min(max(sizes), 2**20)
+    chunk_size = max(1, min(int(chunk_size), total))
+    common = 0
+    for size in sizes:
+        common = gcd(common, size)
+    aligned = 1
+    divisor = 1
+    while divisor*divisor <= common:
+        if common % divisor == 0:
+            for d in (divisor, common // divisor):
+                if aligned < d <= chunk_size:
+                    aligned = d
+        divisor += 1
+    if 2*aligned >= chunk_size:
+        chunk_size = aligned
+    options = {"chunks": (chunk_size, ),
+               "shuffle": shuffle}
+    if compression is not None:
+        options["compression"] = compression
+        options["compression_opts"] = compression_opts
+    return options
+
+
+def _open_h5file(filename, mode, comm):
+    """Open an h5py File for parallel access.
+
+    :arg filename: The name of the file.
+    :arg mode: The access mode, see :class:`h5py:File`.
+    :arg comm: The communicator to open the file on.
+    """
+    # Create the directory if necessary
+    dirname = os.path.dirname(filename)
+    try:
+        os.makedirs(dirname)
+    except OSError:
+        pass
+
+    # Try to use MPI
+    try:
+        return h5py.File(filename, mode, driver="mpio", comm=comm)
+    except NameError:  # the error you get if h5py isn't compiled against parallel HDF5
+        raise RuntimeError("h5py *must* be installed with MPI support")
+
+
+def _write_ragged(h5file, path, array, comm):
+    """Collectively write arrays of differing length on each process.
+
+    :arg h5file: The h5py File to write to.
+    :arg path: The path of the group to create.
+    :arg array: This process' data, the arrays on all processes must
+        agree in all but the first dimension.
+    :arg comm: The communicator the file is open on.
+
+    The arrays are concatenated in rank order into the dataset
+    ``path/data``, and the dataset ``path/offsets`` records where the
+    data of each process starts.  Use :func:`_read_ragged` to read
+    them back.
+    """
+    array = np.asarray(array)
+    sizes = comm.allgather(array.shape[0])
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(IntType)
+    grp = h5file.require_group(path)
+    dset = grp.create_dataset("offsets", data=offsets)
+    dset = grp.create_dataset("data", shape=(offsets[-1], ) + array.shape[1:],
+                              dtype=array.dtype)
+    _write_dataset(dset, slice(offsets[comm.rank], offsets[comm.rank + 1]), array)
+
+
+def _read_ragged(h5file, path, comm):
+    """Read this process' part of data written by :func:`_write_ragged`.
+
+    :arg h5file: The h5py File to read from.
+    :arg path: The path of the group.
+    :arg comm: The communicator the file is open on (must have the
+        same size as when writing).
+    """
+    grp = h5file[path]
+    start, end = grp["offsets"][comm.rank:comm.rank + 2]
+    return grp["data"][start:end]
+
+
+def _write_dataset(dset, selection, array):
+    """Write this process' part of a dataset, collectively if possible.
+
+    :arg dset: The h5py dataset.
+    :arg selection: The selection owned by this process.
+    :arg array: The data to write.
+    """
+    # Another MPI/non-MPI difference
+    try:
+        with dset.collective:
+            dset[selection] = array
+    except AttributeError:
+        dset[selection] = array
+
+
+class _AsyncWriter(object):
+
+    """Write datasets to disk with non-blocking MPI-IO.
+
+    :arg comm: The communicator the file is open on.
+
+    Data are copied into one of two staging buffers, so that the next
+    write can be staged while the previous one is still in flight.  At
+    most one write is in flight at any time.
+
+    The staged data are written with ``MPI_File_iwrite_at`` directly
+    into the storage HDF5 allocates for a contiguous dataset, so no
+    HDF5 (or other collective) calls are made while the write is in
+    flight.  How much of the write overlaps with computation depends
+    on the progress the MPI library makes on non-blocking I/O.
+    """
+    def __init__(self, comm):
+        self.comm = comm
+        self._buffers = [None, None]
+        self._current = 0
+        self._pending = None
+
+    def stage(self, array):
+        """Copy data into the free staging buffer.
+
+        :arg array: The data to stage.
+        :returns: the staging buffer.
+
+        This does not touch the file, so may be called while a write
+        is in flight.
+        """
+        buf = self._buffers[self._current]
+        if buf is None or buf.shape != array.shape or buf.dtype != array.dtype:
+            buf = np.empty_like(array)
+            self._buffers[self._current] = buf
+        buf[...] = array
+        self._current = 1 - self._current
+        return buf
+
+    def create_dataset(self, group, name, shape, dtype):
+        """Create a contiguous dataset for :meth:`submit`.
+
+        :arg group: The h5py Group to create the dataset in.
+        :arg name: The (relative or absolute) path of the dataset,
+            missing intermediate groups are created.
+        :arg shape: The shape of the dataset.
+        :arg dtype: The data type of the dataset.
+
+        The storage of the dataset is allocated on creation and never
+        filled, so that HDF5 does not write to it.  Must be called
+        collectively, after :meth:`wait`.
+        """
+        dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+        dcpl.set_alloc_time(h5py.h5d.ALLOC_TIME_EARLY)
+        dcpl.set_fill_time(h5py.h5d.FILL_TIME_NEVER)
+        lcpl = h5py.h5p.create(h5py.h5p.LINK_CREATE)
+        lcpl.set_create_intermediate_group(True)
+        dsid = h5py.h5d.create(group.id, name.encode(),
+                               h5py.h5t.py_create(np.dtype(dtype), logical=True),
+                               h5py.h5s.create_simple(shape), dcpl=dcpl, lcpl=lcpl)
+        return h5py.Dataset(dsid)
+
+    def submit(self, dset, selection, buf):
+        """Start writing a staged buffer to a dataset.
+
+        :arg dset: The h5py dataset, created by :meth:`create_dataset`.
+        :arg selection: The slice of rows owned by this process.
+        :arg buf: The staging buffer returned by :meth:`stage`.
+
+        Must be called collectively.
+        """
+        assert self._pending is None
+        offset = dset.id.get_offset()
+        if offset is None:
+            # No storage allocated (an empty dataset)
+            _write_dataset(dset, selection, buf)
+            return
+        # Make the dataset metadata visible before writing the data
+        # through a separate file handle.
+        dset.file.flush()
+        row = int(np.prod(dset.shape[1:], dtype=int)) * buf.dtype.itemsize
+        fh = MPI.File.Open(self.comm, dset.file.filename, MPI.MODE_WRONLY)
+        request = fh.Iwrite_at(offset + selection.start * row, buf)
+        self._pending = (fh, request)
+
+    def wait(self):
+        """Wait for the in-flight write (if any) to complete.
+
+        Must be called collectively."""
+        if self._pending is not None:
+            fh, request = self._pending
+            self._pending = None
+            request.Wait()
+            fh.Close()
+            self.comm.Barrier()
+
+
+class _TimestepIndex(object):
+
+    """An on-disk index of stored timesteps.
+
+    The index is stored as one extendible (unlimited dimension)
+    dataset per column, so appending an entry costs O(1) independent
+    of the number of stored entries.  The values are cached in memory,
+    and lookups by time use a binary search.
+
+    :arg h5file: The h5py File the index is stored in.
+    :arg group: The path of the group holding the index datasets.
+    :arg columns: A tuple of ``(name, dtype, attribute)`` triples, one
+        per column.  ``attribute`` names the attribute on the root
+        group that stored the column in files written by older
+        versions, these are read (and migrated on the first append)
+        if the index group does not exist.
+    """
+
+    chunk_size = 4096
+    """Number of entries per chunk of the index datasets."""
+
+    def __init__(self, h5file, group, columns):
+        self.h5file = h5file
+        self.group = group
+        self.columns = columns
+        self._size = 0
+        self._data = {}
+        self._order = None
+        self._sorted = True
+        if group in h5file:
+            grp = h5file[group]
+            for name, dtype, _ in columns:
+                self._data[name] = grp[name][:].astype(dtype)
+        else:
+            attrs = h5file["/"].attrs
+            for name, dtype, attr in columns:
+                self._data[name] = np.asarray(attrs.get(attr, []), dtype=dtype)
+        self._size = len(self._data[columns[0][0]])
+        times = self._data[columns[0][0]]
+        self._sorted = bool(np.all(times[1:] >= times[:-1]))
+
+    def __len__(self):
+        return self._size
+
+    def _require_datasets(self):
+        """Create the index datasets (migrating any legacy attributes)."""
+        if self.group in self.h5file:
+            return self.h5file[self.group]
+        grp = self.h5file.create_group(self.group)
+        attrs = self.h5file["/"].attrs
+        for name, dtype, attr in self.columns:
+            values = self._data[name][:self._size]
+            grp.create_dataset(name, data=values, dtype=dtype,
+                               maxshape=(None, ),
+                               chunks=(self.chunk_size, ))
+            if attr in attrs:
+                del attrs[attr]
+        return grp
+
+    def append(self, *values):
+        """Append an entry to the index.
+
+        :arg values: The value of each column.
+
+        Must be called collectively."""
+        grp = self._require_datasets()
+        n = self._size
+        for (name, dtype, _), value in zip(self.columns, values):
+            dset = grp[name]
+            dset.resize((n + 1, ))
+            dset[n] = value
+            data = self._data[name]
+            if len(data) == n:
+                # Grow geometrically for amortised O(1) appends
+                data = np.resize(data, max(2*n, 16))
+                self._data[name] = data
+            data[n] = value
+        times = self._data[self.columns[0][0]]
+        if n > 0 and times[n] < times[n - 1]:
+            self._sorted = False
+        self._order = None
+        self._size = n + 1
+
+    def values(self, name):
+        """Return (a copy of) the stored values of a column.
+
+        :arg name: The column name."""
+        return self._data[name][:self._size].copy()
+
+    def value(self, name, i):
+        """Return a single stored value.
+
+        :arg name: The column name.
+        :arg i: The position of the entry."""
+        if not 0 <= i < self._size:
+            raise IndexError("Entry %d out of range" % i)
+        return self._data[name][i]
+
+    def nearest(self, t):
+        """Return the position of the entry with time closest to ``t``.
+
+        :arg t: The time to look up.
+
+        Raises :exc:`ValueError` if the index is empty."""
+        if self._size == 0:
+            raise ValueError("No timesteps stored")
+        times = self._data[self.columns[0][0]][:self._size]
+        if self._sorted:
+            order = None
+        else:
+            if self._order is None:
+                self._order = np.argsort(times, kind="mergesort")
+                self._sorted_times = times[self._order]
+            order = self._order
+            times = self._sorted_times
+        i = np.searchsorted(times, t)
+        if i == self._size or (i > 0 and t - times[i - 1] <= times[i] - t):
+            i -= 1
+        return i if order is None else order[i]
+
+
 class DumbCheckpoint(object):
 
     """A very dumb checkpoint object.
@@ -37,6 +384,24 @@ class DumbCheckpoint(object):
          :data:`~.FILE_CREATE`, or :data:`~.FILE_UPDATE`)
     :arg comm: (optional) communicator the writes should be collective
          over.
+    :arg chunk_size: (optional) number of entries per HDF5 chunk used
+         when storing function data.
+    :arg compression: (optional) compression filter used when storing
+         function data, e.g. ``"gzip"``.
+    :arg compression_opts: (optional) options for the compression
+         filter (for ``"gzip"``, the compression level).
+    :arg shuffle: apply the byte shuffle filter to stored function
+         data?  This usually improves compression of floating point
+         data.
+    :arg async_write: write function data asynchronously?  If
+         ``True``, :meth:`store` copies the data into a staging buffer
+         and returns while the data are written to disk with
+         non-blocking MPI-IO.  See :meth:`wait`.
+
+    If any of ``chunk_size``, ``compression`` or ``shuffle`` are
+    provided, function data are written to chunked datasets (see
+    :ref:`checkpoint-compression`), otherwise they are written
+    contiguously by the PETSc viewer.
 
     This object can be used in a context manager (in which case it
     closes the file when the scope is exited).
@@ -51,9 +416,16 @@ class DumbCheckpoint(object):
 
     """
     def __init__(self, basename, single_file=True,
-                 mode=FILE_UPDATE, comm=None):
+                 mode=FILE_UPDATE, comm=None, chunk_size=None,
+                 compression=None, compression_opts=None, shuffle=False,
+                 async_write=False):
         self.comm = dup_comm(comm or COMM_WORLD)
         self.mode = mode
+        self._dataset_options = dict(chunk_size=chunk_size,
+                                     compression=compression,
+                                     compression_opts=compression_opts,
+                                     shuffle=shuffle)
+        self._writer = _AsyncWriter(self.comm) if async_write else None
 
         self._single = single_file
         self._made_file = False
@@ -71,6 +443,7 @@ class DumbCheckpoint(object):
              internal index is used, incremented by 1 every time
              :meth:`set_timestep` is called.
         """
+        self.wait()
         if idx is not None:
             self._tidx = idx
         else:
@@ -78,12 +451,17 @@ class DumbCheckpoint(object):
         self._time = t
         if self.mode == FILE_READ:
             return
-        indices = self.read_attribute("/", "stored_time_indices", [])
-        new_indices = np.concatenate((indices, [self._tidx]))
-        self.write_attribute("/", "stored_time_indices", new_indices)
-        steps = self.read_attribute("/", "stored_time_steps", [])
-        new_steps = np.concatenate((steps, [self._time]))
-        self.write_attribute("/", "stored_time_steps", new_steps)
+        self._timestep_index.append(self._time, self._tidx)
+
+    @property
+    def _timestep_index(self):
+        """The index of timesteps stored in the current file."""
+        self.wait()
+        if not hasattr(self, "_tindex"):
+            self._tindex = _TimestepIndex(self.h5file, "/stored_timesteps",
+                                          (("steps", ScalarType, "stored_time_steps"),
+                                           ("indices", IntType, "stored_time_indices")))
+        return self._tindex
 
     def get_timesteps(self):
         """Return all the time steps (and time indices) in the current
@@ -92,9 +470,21 @@ class DumbCheckpoint(object):
         This is useful when reloading from a checkpoint file that
         contains multiple timesteps and one wishes to determine the
         final available timestep in the file."""
-        indices = self.read_attribute("/", "stored_time_indices", [])
-        steps = self.read_attribute("/", "stored_time_steps", [])
-        return steps, indices
+        index = self._timestep_index
+        return index.values("steps"), index.values("indices")
+
+    def get_nearest_timestep(self, t):
+        """Return the stored time step closest to ``t``, and its index.
+
+        :arg t: The time to look up.
+
+        This does not scan the stored timesteps, so is cheap even for
+        files with very many timesteps.  The returned values may be
+        passed to :meth:`set_timestep` to load the data stored at that
+        time.  Raises :exc:`ValueError` if no timesteps are stored."""
+        index = self._timestep_index
+        i = index.nearest(t)
+        return index.value("steps", i), index.value("indices", i)
 
     def new_file(self, name=None):
         """Open a new on-disk file for writing checkpoint data.
@@ -152,6 +542,7 @@ class DumbCheckpoint(object):
     @property
     def vwr(self):
         """The PETSc Viewer used to store and load function data."""
+        self.wait()
         if hasattr(self, '_vwr'):
             return self._vwr
         self.new_file()
@@ -160,13 +551,26 @@ class DumbCheckpoint(object):
     @property
     def h5file(self):
         """An h5py File object pointing at the open file handle."""
+        self.wait()
         if hasattr(self, '_h5file'):
             return self._h5file
         self._h5file = h5i.get_h5py_file(self.vwr)
         return self._h5file
 
+    def wait(self):
+        """Wait for any in-flight asynchronous write to complete.
+
+        After this returns, all data passed to :meth:`store` are in
+        the file.  This is a no-op if the checkpoint was not created
+        with ``async_write=True``.  Must be called collectively."""
+        if getattr(self, "_writer", None) is not None:
+            self._writer.wait()
+
     def close(self):
         """Close the checkpoint file (flushing any pending writes)"""
+        self.wait()
+        if hasattr(self, "_tindex"):
+            del self._tindex
         if hasattr(self, "_vwr"):
             self._vwr.destroy()
             del self._vwr
@@ -199,6 +603,11 @@ class DumbCheckpoint(object):
 
         This function is timestep-aware and stores to the appropriate
         place if :meth:`set_timestep` has been called.
+
+        If the checkpoint was created with ``async_write=True``, this
+        returns once the data have been staged, and the write
+        completes in the background (see :meth:`wait`).  Chunked or
+        compressed data are always written synchronously.
         """
         if self.mode is FILE_READ:
             raise IOError("Cannot store to checkpoint opened with mode 'FILE_READ'")
@@ -208,6 +617,13 @@ class DumbCheckpoint(object):
         group = self._get_data_group()
         self._write_timestep_attr(group)
         with function.dat.vec_ro as v:
+            bs = v.getBlockSize()
+            options = _dataset_options(self.comm, v.getLocalSize() // bs,
+                                       **self._dataset_options)
+            if options or self._writer is not None:
+                self._write_h5py(v, group, name, options)
+                return
+            self.wait()
             self.vwr.pushGroup(group)
             oname = v.getName()
             v.setName(name)
@@ -215,6 +631,45 @@ class DumbCheckpoint(object):
             v.setName(oname)
             self.vwr.popGroup()
 
+    def _write_h5py(self, v, group, name, options):
+        """Write a PETSc Vec to a dataset using h5py.
+
+        :arg v: The Vec to write.
+        :arg group: The group to write into.
+        :arg name: The name of the dataset.
+        :arg options: Dataset creation options (see
+             :func:`_dataset_options`).
+
+        The dataset layout matches that of ``VecView`` so that it can
+        be read back with :meth:`load`.
+        """
+        bs = v.getBlockSize()
+        start, end = v.getOwnershipRange()
+        if bs > 1:
+            shape = (v.getSize() // bs, bs)
+            if "chunks" in options:
+                options["chunks"] = options["chunks"] + (bs, )
+            array = v.array_r.reshape(-1, bs)
+        else:
+            shape = (v.getSize(), )
+            array = v.array_r
+        rows = slice(start // bs, end // bs)
+        # Chunked datasets are written by HDF5, so synchronously
+        asynchronous = self._writer is not None and not options
+        if asynchronous:
+            array = self._writer.stage(array)
+        self.wait()
+        grp = self.h5file.require_group(group)
+        if name in grp:
+            del grp[name]
+        if asynchronous:
+            dset = self._writer.create_dataset(grp, name, shape, array.dtype)
+            self._writer.submit(dset, rows, array)
+        else:
+            dset = grp.create_dataset(name, shape=shape, dtype=array.dtype,
+                                      **options)
+            _write_dataset(dset, rows, array)
+
     def load(self, function, name=None):
         """Store a function from the checkpoint file.
 
@@ -229,6 +684,7 @@ class DumbCheckpoint(object):
             raise ValueError("Can only load functions")
         name = name or function.name()
         group = self._get_data_group()
+        self.wait()
         with function.dat.vec_wo as v:
             self.vwr.pushGroup(group)
             oname = v.getName()
@@ -246,6 +702,7 @@ class DumbCheckpoint(object):
 
         Raises :exc:`~.exceptions.AttributeError` if writing the attribute fails.
         """
+        self.wait()
         try:
             self.h5file[obj].attrs[name] = val
         except KeyError:
@@ -260,6 +717,7 @@ class DumbCheckpoint(object):
              provided an :exc:`~.exceptions.AttributeError` is raised if the
              attribute does not exist.
         """
+        self.wait()
         try:
             return self.h5file[obj].attrs[name]
         except KeyError:
@@ -273,6 +731,7 @@ class DumbCheckpoint(object):
         :arg obj: The path to the data object.
         :arg name: The name of the attribute.
         """
+        self.wait()
         try:
             return (name in self.h5file[obj].attrs)
         except KeyError:
@@ -304,13 +763,34 @@ class HDF5File(object):
         :class:`h5py:File` for details on the meaning.
     :arg comm: communicator the writes should be collective
          over.
+    :arg chunk_size: (optional) number of entries per HDF5 chunk used
+         when writing functions.
+    :arg compression: (optional) compression filter used when writing
+         functions, e.g. ``"gzip"``.
+    :arg compression_opts: (optional) options for the compression
+         filter (for ``"gzip"``, the compression level).
+    :arg shuffle: apply the byte shuffle filter to written functions?
+    :arg async_write: write functions asynchronously?  If ``True``,
+        :meth:`write` copies the data into a staging buffer and
+        returns while the data are written to disk with non-blocking
+        MPI-IO.  See :meth:`wait`.
+
+    If none of ``chunk_size``, ``compression`` or ``shuffle`` are
+    provided, functions are written to contiguous datasets.
 
     This object can be used in a context manager (in which case it
     closes the file when the scope is exited).
 
     """
-    def __init__(self, filename, file_mode, comm=None):
+    def __init__(self, filename, file_mode, comm=None, chunk_size=None,
+                 compression=None, compression_opts=None, shuffle=False,
+                 async_write=False):
         self.comm = dup_comm(comm or COMM_WORLD)
+        self._dataset_options = dict(chunk_size=chunk_size,
+                                     compression=compression,
+                                     compression_opts=compression_opts,
+                                     shuffle=shuffle)
+        self._writer = _AsyncWriter(self.comm) if async_write else None
 
         self._filename = filename
         self._mode = file_mode
@@ -319,18 +799,7 @@ class HDF5File(object):
         if file_mode == 'r' and not exists:
             raise IOError("File '%s' does not exist, cannot be opened for reading" % filename)
 
-        # Create the directory if necessary
-        dirname = os.path.dirname(filename)
-        try:
-            os.makedirs(dirname)
-        except OSError:
-            pass
-
-        # Try to use MPI
-        try:
-            self._h5file = h5py.File(filename, file_mode, driver="mpio", comm=self.comm)
-        except NameError:  # the error you get if h5py isn't compiled against parallel HDF5
-            raise RuntimeError("h5py *must* be installed with MPI support")
+        self._h5file = _open_h5file(filename, file_mode, self.comm)
 
         if file_mode == 'r':
             nprocs = self.attributes('/')['nprocs']
@@ -345,21 +814,49 @@ class HDF5File(object):
 
         :arg t: The timestamp value.
         """
+        self.wait()
         if self._mode == 'r':
             return
-        attrs = self.attributes("/")
-        timestamps = attrs.get("stored_timestamps", [])
-        attrs["stored_timestamps"] = np.concatenate((timestamps, [t]))
+        self._timestamp_index.append(t)
+
+    @property
+    def _timestamp_index(self):
+        """The index of stored timestamps."""
+        self.wait()
+        if not hasattr(self, "_tindex"):
+            self._tindex = _TimestepIndex(self._h5file, "/stored_timestamps",
+                                          (("timestamps", ScalarType, "stored_timestamps"), ))
+        return self._tindex
 
     def get_timestamps(self):
         """Get the timestamps this HDF5File knows about."""
+        return self._timestamp_index.values("timestamps")
+
+    def get_nearest_timestamp(self, t):
+        """Return the stored timestamp closest to ``t``.
+
+        :arg t: The time to look up.
+
+        This does not scan the stored timestamps, so is cheap even for
+        files with very many timestamps.  Raises :exc:`ValueError` if
+        no timestamps are stored."""
+        index = self._timestamp_index
+        return index.value("timestamps", index.nearest(t))
 
-        attrs = self.attributes("/")
-        timestamps = attrs.get("stored_timestamps", [])
-        return timestamps
+    def wait(self):
+        """Wait for any in-flight asynchronous write to complete.
+
+        After this returns, all data passed to :meth:`write` are in
+        the file.  This is a no-op if the file was not opened with
+        ``async_write=True``.  Must be called collectively."""
+        if getattr(self, "_writer", None) is not None:
+            self._writer.wait()
 
     def close(self):
         """Close the checkpoint file (flushing any pending writes)"""
+        self.wait()
+        if hasattr(self, "_tindex"):
+            del self._tindex
         if hasattr(self, '_h5file'):
             self._h5file.flush()
             # Need to explicitly close the h5py File so that all
@@ -371,6 +868,7 @@ class HDF5File(object):
 
     def flush(self):
         """Flush any pending writes."""
+        self.wait()
         self._h5file.flush()
 
     def write(self, function, path, timestamp=None):
@@ -380,6 +878,11 @@ class HDF5File(object):
         :arg path: the path to store the function under.
         :arg timestamp: timestamp associated with function, or None for
                         stationary data
+
+        If the file was opened with ``async_write=True``, this returns
+        once the data have been staged, and the write completes in the
+        background (see :meth:`wait`).  Chunked or compressed data are
+        always written synchronously.
         """
         if self._mode == 'r':
             raise IOError("Cannot store to checkpoint opened with mode 'FILE_READ'")
@@ -391,19 +894,30 @@ class HDF5File(object):
             path = path + suffix
 
         with function.dat.vec_ro as v:
-            dset = self._h5file.create_dataset(path, shape=(v.getSize(),), dtype=function.dat.dtype)
-
-            # Another MPI/non-MPI difference
-            try:
-                with dset.collective:
-                    dset[slice(*v.getOwnershipRange())] = v.array_r
-            except AttributeError:
-                dset[slice(*v.getOwnershipRange())] = v.array_r
-
-        if timestamp is not None:
-            attr = self.attributes(path)
-            attr["timestamp"] = timestamp
-            self._set_timestamp(timestamp)
+            options = _dataset_options(self.comm, v.getLocalSize(),
+                                       **self._dataset_options)
+            selection = slice(*v.getOwnershipRange())
+            array = v.array_r
+            # Chunked datasets are written by HDF5, so synchronously
+            asynchronous = self._writer is not None and not options
+            if asynchronous:
+                array = self._writer.stage(array)
+            self.wait()
+            if asynchronous:
+                dset = self._writer.create_dataset(self._h5file, path, (v.getSize(),),
+                                                   function.dat.dtype)
+            else:
+                dset = self._h5file.create_dataset(path, shape=(v.getSize(),), dtype=function.dat.dtype,
+                                                   **options)
+            if timestamp is not None:
+                attr = self.attributes(path)
+                attr["timestamp"] = timestamp
+                self._set_timestamp(timestamp)
+
+            if asynchronous:
+                self._writer.submit(dset, selection, array)
+            else:
+                _write_dataset(dset, selection, array)
 
     def read(self, function, path, timestamp=None):
         """Store a function from the checkpoint file.
@@ -417,12 +931,14 @@ class HDF5File(object):
             suffix = "/%.15e" % timestamp
             path = path + suffix
 
+        self.wait()
         with function.dat.vec_wo as v:
             dset = self._h5file[path]
             v.array[:] = dset[slice(*v.getOwnershipRange())]
 
     def attributes(self, obj):
         """:arg obj: The path to the group."""
+        self.wait()
         return self._h5file[obj].attrs
 
     def __enter__(self):
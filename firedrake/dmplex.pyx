@@ -1168,6 +1168,336 @@ def validate_mesh(PETSc.DM plex):
         raise ValueError("Provided mesh has some entities not reachable by traversing cells (maybe rogue vertices?)")
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def get_dag(PETSc.DM plex):
+    """Return the cones and supports of all points in a plex.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :returns: a 5-tuple ``(cone_sizes, cones, orientations,
+        support_sizes, supports)``, where the cones, orientations and
+        supports of all points are concatenated in point order.
+    """
+    cdef:
+        PetscInt pStart, pEnd, p, i, n, ncone, nsupport
+        PetscInt *cone = NULL
+        PetscInt *orientation = NULL
+        PetscInt *support = NULL
+        np.ndarray[PetscInt, ndim=1, mode="c"] cone_sizes, support_sizes
+        np.ndarray[PetscInt, ndim=1, mode="c"] cones, orientations, supports
+
+    pStart, pEnd = plex.getChart()
+    cone_sizes = np.empty(pEnd - pStart, dtype=IntType)
+    support_sizes = np.empty(pEnd - pStart, dtype=IntType)
+    for p in range(pStart, pEnd):
+        CHKERR(DMPlexGetConeSize(plex.dm, p, &n))
+        cone_sizes[p - pStart] = n
+        CHKERR(DMPlexGetSupportSize(plex.dm, p, &n))
+        support_sizes[p - pStart] = n
+
+    cones = np.empty(np.sum(cone_sizes), dtype=IntType)
+    orientations = np.empty(np.sum(cone_sizes), dtype=IntType)
+    supports = np.empty(np.sum(support_sizes), dtype=IntType)
+    ncone = 0
+    nsupport = 0
+    for p in range(pStart, pEnd):
+        CHKERR(DMPlexGetCone(plex.dm, p, &cone))
+        CHKERR(DMPlexGetConeOrientation(plex.dm, p, &orientation))
+        for i in range(cone_sizes[p - pStart]):
+            cones[ncone] = cone[i]
+            orientations[ncone] = orientation[i]
+            ncone += 1
+        CHKERR(DMPlexGetSupport(plex.dm, p, &support))
+        for i in range(support_sizes[p - pStart]):
+            supports[nsupport] = support[i]
+            nsupport += 1
+    return cone_sizes, cones, orientations, support_sizes, supports
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def set_dag(PETSc.DM plex, PetscInt pStart, PetscInt pEnd,
+            np.ndarray[PetscInt, ndim=1, mode="c"] cone_sizes,
+            np.ndarray[PetscInt, ndim=1, mode="c"] cones,
+            np.ndarray[PetscInt, ndim=1, mode="c"] orientations,
+            np.ndarray[PetscInt, ndim=1, mode="c"] support_sizes,
+            np.ndarray[PetscInt, ndim=1, mode="c"] supports):
+    """Set the cones and supports of all points in a plex.
+
+    :arg plex: The (empty) DMPlex to build, its dimension must be set.
+    :arg pStart: The first point in the chart.
+    :arg pEnd: One past the last point in the chart.
+
+    The remaining arguments are as returned by :func:`get_dag`.  The
+    supports are set explicitly (rather than by symmetrizing), so that
+    the support order, and hence any numbering derived from it, is
+    reproduced exactly.  The plex is stratified on return.
+    """
+    cdef:
+        PetscInt p, ncone, nsupport
+
+    plex.setChart(pStart, pEnd)
+    for p in range(pStart, pEnd):
+        CHKERR(DMPlexSetConeSize(plex.dm, p, cone_sizes[p - pStart]))
+        CHKERR(DMPlexSetSupportSize(plex.dm, p, support_sizes[p - pStart]))
+    plex.setUp()
+    ncone = 0
+    nsupport = 0
+    for p in range(pStart, pEnd):
+        if cone_sizes[p - pStart] > 0:
+            CHKERR(DMPlexSetCone(plex.dm, p, &cones[ncone]))
+            CHKERR(DMPlexSetConeOrientation(plex.dm, p, &orientations[ncone]))
+        ncone += cone_sizes[p - pStart]
+        if support_sizes[p - pStart] > 0:
+            CHKERR(DMPlexSetSupport(plex.dm, p, &supports[nsupport]))
+        nsupport += support_sizes[p - pStart]
+    plex.stratify()
+
+
+def get_label_values(PETSc.DM plex, name):
+    """Return the points in a label and their values.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :arg name: The name of the label.
+    :returns: a 2-tuple of arrays ``(points, values)``.
+    """
+    points = [np.empty(0, dtype=IntType)]
+    values = [np.empty(0, dtype=IntType)]
+    for value in plex.getLabelIdIS(name).indices:
+        stratum = plex.getStratumIS(name, value).indices
+        points.append(stratum)
+        values.append(np.full(stratum.shape, value, dtype=IntType))
+    return (np.concatenate(points).astype(IntType),
+            np.concatenate(values).astype(IntType))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def set_label_values(PETSc.DM plex, name,
+                     np.ndarray[PetscInt, ndim=1, mode="c"] points,
+                     np.ndarray[PetscInt, ndim=1, mode="c"] values):
+    """Create a label and set its values.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :arg name: The name of the label.
+    :arg points: The labelled points.
+    :arg values: The label value for each point.
+    """
+    cdef:
+        PetscInt i
+        DMLabel label
+
+    name = name.encode() if isinstance(name, str) else name
+    plex.createLabel(name)
+    CHKERR(DMGetLabel(plex.dm, <char *>name, &label))
+    for i in range(points.shape[0]):
+        CHKERR(DMLabelSetValue(label, points[i], values[i]))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def get_vertex_coordinates(PETSc.DM plex):
+    """Return the plex coordinates of all local vertices.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :returns: an array of shape ``(num_vertices, dim)`` of vertex
+        coordinates, in vertex point order.
+    """
+    cdef:
+        PetscInt vStart, vEnd, v, d, dim, offset
+        PETSc.Section section
+        np.ndarray[PetscReal, ndim=2, mode="c"] coords
+        np.ndarray[PetscReal, ndim=1, mode="c"] plex_coords
+
+    vStart, vEnd = plex.getDepthStratum(0)
+    dim = plex.getCoordinateDim()
+    section = plex.getCoordinateSection()
+    plex_coords = plex.getCoordinatesLocal().array_r.astype(np.double)
+    coords = np.empty((vEnd - vStart, dim), dtype=np.double)
+    for v in range(vStart, vEnd):
+        CHKERR(PetscSectionGetOffset(section.sec, v, &offset))
+        for d in range(dim):
+            coords[v - vStart, d] = plex_coords[offset + d]
+    return coords
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def set_vertex_coordinates(PETSc.DM plex,
+                           np.ndarray[PetscReal, ndim=2, mode="c"] coords):
+    """Set the plex coordinates of all local vertices.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :arg coords: An array of shape ``(num_vertices, dim)`` of vertex
+        coordinates, in vertex point order.
+    """
+    cdef:
+        PetscInt vStart, vEnd, v, dim
+        PETSc.Section section
+
+    vStart, vEnd = plex.getDepthStratum(0)
+    dim = coords.shape[1]
+    plex.setCoordinateDim(dim)
+    section = plex.getCoordinateSection()
+    section.setNumFields(1)
+    section.setFieldComponents(0, dim)
+    section.setChart(vStart, vEnd)
+    for v in range(vStart, vEnd):
+        CHKERR(PetscSectionSetDof(section.sec, v, dim))
+        CHKERR(PetscSectionSetFieldDof(section.sec, v, 0, dim))
+    section.setUp()
+    vec = PETSc.Vec().createWithArray(coords.reshape(-1).copy(), bsize=dim,
+                                      comm=PETSc.COMM_SELF)
+    plex.setCoordinatesLocal(vec)
+
+
+def create_from_cell_list_parallel(MPI.Comm comm, PetscInt dim,
+                                   np.ndarray[int, ndim=2, mode="c"] cells,
+                                   np.ndarray[PetscReal, ndim=2, mode="c"] coords):
+    """Create a distributed DMPlex from distributed cell and vertex lists.
+
+    :arg comm: The communicator to build the plex on.
+    :arg dim: The topological dimension of the mesh.
+    :arg cells: This process' cells, given by their global vertex
+        numbers.
+    :arg coords: The coordinates of this process' contiguous block of
+        vertices (in global vertex number order).
+    :returns: a 2-tuple of the interpolated plex and an SF mapping
+        each local vertex to its owning process' block of vertices.
+
+    The plex is distributed "naively", each process has the cells it
+    provided, it should be redistributed with a proper partitioner.
+    """
+    cdef:
+        PETSc.DM plex = PETSc.DMPlex()
+        PETSc.SF vertex_sf = PETSc.SF()
+
+    CHKERR(DMPlexCreateFromCellListParallel(comm.ob_mpi, dim,
+                                            cells.shape[0], coords.shape[0],
+                                            cells.shape[1], PETSC_TRUE,
+                                            <const int *>cells.data,
+                                            coords.shape[1],
+                                            <const PetscReal *>coords.data,
+                                            &vertex_sf.sf, &plex.dm))
+    return plex, vertex_sf
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def mark_exterior_facets(PETSc.DM plex):
+    """Label the facets on the domain boundary of a distributed plex.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+
+    Facets are marked with "exterior_facets" if they are in the
+    support of exactly one cell across all processes.  Unlike
+    ``DMPlexMarkBoundaryFaces``, this does not mark facets on the
+    boundary between processes, so may be used on a plex that is
+    already distributed.
+    """
+    cdef:
+        PetscInt pStart, pEnd, fStart, fEnd, f, n
+        DMLabel label
+        np.ndarray[PetscInt, ndim=1, mode="c"] nsupport, leaf_nsupport
+
+    pStart, pEnd = plex.getChart()
+    fStart, fEnd = plex.getHeightStratum(1)
+    nsupport = np.zeros(pEnd - pStart, dtype=IntType)
+    for f in range(fStart, fEnd):
+        CHKERR(DMPlexGetSupportSize(plex.dm, f, &n))
+        nsupport[f - pStart] = n
+
+    if plex.comm.size > 1:
+        try:
+            dtype = MPI.__TypeDict__[np.dtype(IntType).char]
+        except AttributeError:
+            dtype = MPI._typedict[np.dtype(IntType).char]
+        sf = plex.getPointSF()
+        # Sum the support sizes on the owners, then send them back.
+        leaf_nsupport = nsupport.copy()
+        sf.reduceBegin(dtype, leaf_nsupport, nsupport, MPI.SUM)
+        sf.reduceEnd(dtype, leaf_nsupport, nsupport, MPI.SUM)
+        leaf_nsupport = nsupport.copy()
+        sf.bcastBegin(dtype, nsupport, leaf_nsupport)
+        sf.bcastEnd(dtype, nsupport, leaf_nsupport)
+        nsupport = leaf_nsupport
+
+    plex.createLabel(b"exterior_facets")
+    CHKERR(DMGetLabel(plex.dm, b"exterior_facets", &label))
+    for f in range(fStart, fEnd):
+        if nsupport[f - pStart] == 1:
+            CHKERR(DMLabelSetValue(label, f, 1))
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def get_cell_vertices(PETSc.DM plex):
+    """Return the vertices of each cell in a plex.
+
+    :arg plex: The DMPlex object encapsulating the mesh topology
+    :returns: an array of shape ``(num_cells, vertices_per_cell)`` of
+        vertex indices (counted from the first vertex point), suitable
+        for :func:`create_from_cell_list_parallel`.  For
+        quadrilaterals the vertices are ordered cyclically.
+    """
+    cdef:
+        PetscInt dim, cStart, cEnd, vStart, vEnd, c, ci, i, p
+        PetscInt nclosure, ncone, nvertices
+        PetscInt *closure = NULL
+        PetscInt *cone = NULL
+        PetscInt *orientation = NULL
+        PetscInt *edge = NULL
+        np.ndarray[int, ndim=2, mode="c"] cells
+        bint quad
+
+    dim = plex.getDimension()
+    cStart, cEnd = plex.getHeightStratum(0)
+    vStart, vEnd = plex.getDepthStratum(0)
+    if cStart == cEnd:
+        return np.empty((0, dim + 1), dtype=np.int32)
+    CHKERR(DMPlexGetConeSize(plex.dm, cStart, &ncone))
+    quad = dim == 2 and ncone == 4
+    nvertices = 0
+    CHKERR(DMPlexGetTransitiveClosure(plex.dm, cStart, PETSC_TRUE,
+                                      &nclosure, &closure))
+    for ci in range(nclosure):
+        if vStart <= closure[2*ci] < vEnd:
+            nvertices += 1
+    # Only intervals, triangles, quadrilaterals and tetrahedra (with
+    # as many vertices as cone points) are supported.
+    if nvertices != ncone:
+        CHKERR(DMPlexRestoreTransitiveClosure(plex.dm, cStart, PETSC_TRUE,
+                                              NULL, &closure))
+        raise NotImplementedError("Cells with %d facets and %d vertices are not supported"
+                                  % (ncone, nvertices))
+    cells = np.empty((cEnd - cStart, nvertices), dtype=np.int32)
+    for c in range(cStart, cEnd):
+        if quad:
+            # The first vertex of each (oriented) edge
+            CHKERR(DMPlexGetCone(plex.dm, c, &cone))
+            CHKERR(DMPlexGetConeOrientation(plex.dm, c, &orientation))
+            for ci in range(4):
+                CHKERR(DMPlexGetCone(plex.dm, cone[ci], &edge))
+                cells[c - cStart, ci] = (edge[1] if orientation[ci] < 0 else edge[0]) - vStart
+        else:
+            CHKERR(DMPlexGetTransitiveClosure(plex.dm, c, PETSC_TRUE,
+                                              &nclosure, &closure))
+            i = 0
+            for ci in range(nclosure):
+                p = closure[2*ci]
+                if vStart <= p < vEnd:
+                    if i == nvertices:
+                        CHKERR(DMPlexRestoreTransitiveClosure(plex.dm, c, PETSC_TRUE,
+                                                              NULL, &closure))
+                        raise NotImplementedError("Meshes with mixed cell types are not supported")
+                    cells[c - cStart, i] = p - vStart
+                    i += 1
+    if closure != NULL:
+        CHKERR(DMPlexRestoreTransitiveClosure(plex.dm, 0, PETSC_TRUE,
+                                              NULL, &closure))
+    return cells
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def plex_renumbering(PETSc.DM plex,
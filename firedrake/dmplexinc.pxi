@@ -25,10 +25,16 @@ cdef extern from "petscdmplex.h" nogil:
     int DMPlexGetConeOrientation(PETSc.PetscDM,PetscInt,PetscInt*[])
     int DMPlexGetSupportSize(PETSc.PetscDM,PetscInt,PetscInt*)
     int DMPlexGetSupport(PETSc.PetscDM,PetscInt,PetscInt*[])
+    int DMPlexSetConeSize(PETSc.PetscDM,PetscInt,PetscInt)
+    int DMPlexSetCone(PETSc.PetscDM,PetscInt,PetscInt[])
+    int DMPlexSetConeOrientation(PETSc.PetscDM,PetscInt,PetscInt[])
+    int DMPlexSetSupportSize(PETSc.PetscDM,PetscInt,PetscInt)
+    int DMPlexSetSupport(PETSc.PetscDM,PetscInt,PetscInt[])
 
     int DMPlexGetTransitiveClosure(PETSc.PetscDM,PetscInt,PetscBool,PetscInt *,PetscInt *[])
     int DMPlexRestoreTransitiveClosure(PETSc.PetscDM,PetscInt,PetscBool,PetscInt *,PetscInt *[])
     int DMPlexDistributeData(PETSc.PetscDM,PETSc.PetscSF,PETSc.PetscSection,MPI.MPI_Datatype,void*,PETSc.PetscSection,void**)
+    int DMPlexCreateFromCellListParallel(MPI.MPI_Comm,PetscInt,PetscInt,PetscInt,PetscInt,PetscBool,const int[],PetscInt,const PetscReal[],PETSc.PetscSF*,PETSc.PetscDM*)
     int DMPlexSetAdjacencyUser(PETSc.PetscDM,int(*)(PETSc.PetscDM,PetscInt,PetscInt*,PetscInt[],void*),void*)
 
 cdef extern from "petscdmlabel.h" nogil:
@@ -49,6 +55,7 @@ cdef extern from "petscis.h" nogil:
     int PetscSectionGetOffset(PETSc.PetscSection,PetscInt,PetscInt*)
     int PetscSectionGetDof(PETSc.PetscSection,PetscInt,PetscInt*)
     int PetscSectionSetDof(PETSc.PetscSection,PetscInt,PetscInt)
+    int PetscSectionSetFieldDof(PETSc.PetscSection,PetscInt,PetscInt,PetscInt)
     int PetscSectionSetPermutation(PETSc.PetscSection,PETSc.PetscIS)
     int ISGetIndices(PETSc.PetscIS,PetscInt*[])
     int ISRestoreIndices(PETSc.PetscIS,PetscInt*[])
@@ -4,6 +4,7 @@ import ufl
 import ctypes
 from collections import OrderedDict
 from ctypes import POINTER, c_int, c_double, c_void_p
+from decorator import decorator
 
 from pyop2 import op2
 from pyop2.datatypes import ScalarType, IntType, as_ctypes
@@ -194,6 +195,23 @@ class CoordinatelessFunction(ufl.Coefficient):
             return super(Function, self).__str__()
 
 
+def _modifies_values(f):
+    """Decorator for :class:`Function` methods that change its values.
+
+    If the :class:`Function` is the coordinate field of a mesh, the
+    mesh is notified after the call, so that caches depending on the
+    coordinate values are refreshed (see
+    :attr:`.MeshGeometry.coordinates_version`)."""
+    def wrapper(f, self, *args, **kwargs):
+        result = f(self, *args, **kwargs)
+        mesh = getattr(self.topological, "_as_mesh_geometry", None)
+        mesh = mesh and mesh()
+        if mesh is not None:
+            mesh.notify_coordinates_changed()
+        return result
+    return decorator(wrapper, f)
+
+
 class Function(ufl.Coefficient):
     """A :class:`Function` represents a discretised field over the
     domain defined by the underlying :func:`.Mesh`. Functions are
@@ -304,6 +322,7 @@ class Function(ufl.Coefficient):
                             name="view[%d](%s)" % (i, self.name()))
         return self.split()[i]
 
+    @_modifies_values
     def project(self, b, *args, **kwargs):
         """Project ``b`` onto ``self``. ``b`` must be a :class:`Function` or an
         :class:`.Expression`.
@@ -325,6 +344,7 @@ class Function(ufl.Coefficient):
         """Return a :class:`.Vector` wrapping the data in this :class:`Function`"""
         return vector.Vector(self)
 
+    @_modifies_values
     def interpolate(self, expression, subset=None):
         """Interpolate an expression onto this :class:`Function`.
 
@@ -333,6 +353,7 @@ class Function(ufl.Coefficient):
         from firedrake import interpolation
         return interpolation.interpolate(expression, self, subset=subset)
 
+    @_modifies_values
     @utils.known_pyop2_safe
     def assign(self, expr, subset=None):
         """Set the :class:`Function` value to the pointwise value of
@@ -362,6 +383,7 @@ class Function(ufl.Coefficient):
             assemble_expressions.Assign(self, expr), subset)
         return self
 
+    @_modifies_values
     @utils.known_pyop2_safe
     def __iadd__(self, expr):
 
@@ -379,6 +401,7 @@ class Function(ufl.Coefficient):
 
         return self
 
+    @_modifies_values
     @utils.known_pyop2_safe
     def __isub__(self, expr):
 
@@ -396,6 +419,7 @@ class Function(ufl.Coefficient):
 
         return self
 
+    @_modifies_values
     @utils.known_pyop2_safe
     def __imul__(self, expr):
 
@@ -413,6 +437,7 @@ class Function(ufl.Coefficient):
 
         return self
 
+    @_modifies_values
     @utils.known_pyop2_safe
     def __idiv__(self, expr):
 
@@ -443,8 +468,8 @@ class Function(ufl.Coefficient):
         # Store data into ``C struct''
         c_function = _CFunction()
         c_function.n_cols = mesh.num_cells()
-        if mesh.layers is not None:
-            c_function.n_layers = mesh.layers - 1
+        if mesh.cell_set._extruded:
+            c_function.n_layers = mesh.max_cell_layers
         else:
             c_function.n_layers = 1
         c_function.coords = coordinates.dat.data.ctypes.data_as(POINTER(c_double))
@@ -505,8 +530,6 @@ class Function(ufl.Coefficient):
             arg = arg.reshape(-1)
 
         mesh = self.function_space().mesh()
-        if mesh.variable_layers:
-            raise NotImplementedError("Point evaluation not implemented for variable layers")
         # Immersed not supported
         tdim = mesh.ufl_cell().topological_dimension()
         gdim = mesh.ufl_cell().geometric_dimension()
@@ -621,15 +644,15 @@ def make_c_evaluate(function, c_name="evaluate", ldargs=None, tolerance=None):
 
     args = []
 
-    arg = mesh.coordinates.dat(op2.READ, mesh.coordinates.cell_node_map())
+    arg = mesh.coordinates.dat(op2.READ, pq_utils.cell_node_map(mesh.coordinates))
     arg.position = 0
     args.append(arg)
 
-    arg = function.dat(op2.READ, function.cell_node_map())
+    arg = function.dat(op2.READ, pq_utils.cell_node_map(function))
     arg.position = 1
     args.append(arg)
 
-    src += generate_cell_wrapper(build_itspace(args, mesh.cell_set), args,
+    src += generate_cell_wrapper(build_itspace(args, pq_utils.cell_set(mesh)), args,
                                  forward_args=["double*", "double*"],
                                  kernel_name="evaluate_kernel",
                                  wrapper_name="wrap_evaluate")
@@ -16,6 +16,7 @@ vs VectorElement) can share the PyOP2 Set and Map data.
 
 import numpy
 import finat
+import weakref
 from decorator import decorator
 from functools import reduce, partial
 
@@ -46,13 +47,17 @@ def cached(f, mesh, key, *args, **kwargs):
     :args args: Additional arguments to ``f``.
     :kwargs kwargs:  Additional keyword arguments to ``f``."""
     assert hasattr(mesh, "_shared_data_cache")
-    cache = mesh._shared_data_cache[f.__name__]
+    shared_data_cache = mesh._shared_data_cache
+    cache = shared_data_cache[f.__name__]
     try:
-        return cache[key]
+        result = cache[key]
     except KeyError:
+        shared_data_cache.misses[f.__name__] += 1
         result = f(mesh, key, *args, **kwargs)
         cache[key] = result
         return result
+    shared_data_cache.hits[f.__name__] += 1
+    return result
 
 
 @cached
@@ -167,7 +172,8 @@ def get_map_caches(mesh, entity_dofs):
     return {mesh.cell_set: {},
             mesh.interior_facets.set: {},
             mesh.exterior_facets.set: {},
-            "boundary_node": {}}
+            "boundary_node": {},
+            "column_node": {}}
 
 
 @cached
@@ -383,7 +389,8 @@ class FunctionSpaceData(object):
     __slots__ = ("map_caches", "entity_node_lists",
                  "node_set", "cell_boundary_masks",
                  "interior_facet_boundary_masks", "offset",
-                 "extruded", "mesh", "global_numbering")
+                 "extruded", "mesh", "global_numbering",
+                 "_cache_entries", "__weakref__")
 
     def __init__(self, mesh, finat_element):
         entity_dofs = finat_element.entity_dofs()
@@ -412,11 +419,33 @@ class FunctionSpaceData(object):
         self.mesh = mesh
         self.global_numbering = global_numbering
 
+        # Record the shared data in use, so that the mesh does not
+        # evict it while we are alive.
+        self._cache_entries = {("get_global_numbering", nodes_per_entity),
+                               ("get_node_set", nodes_per_entity),
+                               ("get_map_caches", edofs_key),
+                               ("get_dof_offset", edofs_key),
+                               ("get_entity_node_lists", edofs_key),
+                               ("get_boundary_masks", (edofs_key, "cell")),
+                               ("get_boundary_masks", (edofs_key, "interior_facet"))}
+        mesh._shared_data_cache.acquire(self._cache_entries)
+        weakref.finalize(self, mesh._shared_data_cache.release, self._cache_entries)
+
+    def _use_cache_entry(self, kind, key):
+        """Record that this object uses a shared data cache entry.
+
+        :arg kind: the kind of cache.
+        :arg key: the key of the entry."""
+        entry = (kind, key)
+        if entry not in self._cache_entries:
+            self._cache_entries.add(entry)
+            self.mesh._shared_data_cache.acquire([entry])
+
     def __eq__(self, other):
         if type(self) is not type(other):
             return False
         return all(getattr(self, s) is getattr(other, s) for s in
-                   FunctionSpaceData.__slots__)
+                   FunctionSpaceData.__slots__ if not s.startswith("_"))
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -436,6 +465,7 @@ class FunctionSpaceData(object):
                                  sub_domain)
             entity_dofs = eutils.flat_entity_dofs(V.finat_element.entity_dofs())
             key = (entity_dofs_key(entity_dofs), sub_domain, method)
+            self._use_cache_entry("get_top_bottom_boundary_nodes", key)
             return get_top_bottom_boundary_nodes(V.mesh(), key, V)
         else:
             if sub_domain == "on_boundary":
@@ -443,6 +473,7 @@ class FunctionSpaceData(object):
             else:
                 sdkey = as_tuple(sub_domain)
             key = (entity_dofs_key(V.finat_element.entity_dofs()), sdkey, method)
+            self._use_cache_entry("get_boundary_nodes", key)
             return get_boundary_nodes(V.mesh(), key, V)
 
     def get_map(self, V, entity_set, map_arity, bcs, name, offset, parent,
@@ -577,6 +608,38 @@ class FunctionSpaceData(object):
                 return op2.DecoratedMap(val, implicit_bcs=implicit_bcs)
             return val
 
+    def get_column_map(self, V):
+        """Return a :class:`pyop2.Map` from the cells of the base mesh
+        of an extruded mesh to the nodes of all the cells in the
+        column above them.
+
+        :arg V: The :class:`FunctionSpace` to create the map for.
+
+        The nodes of each column are ordered by layer, starting at the
+        bottom, and within each layer in the order of the cell node
+        map.  Nodes shared between vertically adjacent cells appear
+        once for each cell."""
+        assert len(V) == 1, "get_column_map should not be called on MixedFunctionSpace"
+        if not self.extruded:
+            raise ValueError("Column maps are only defined on extruded meshes")
+        if self.mesh.variable_layers:
+            raise NotImplementedError("Column maps not implemented for variable layers")
+        cache = self.map_caches["column_node"]
+        try:
+            return cache[()]
+        except KeyError:
+            pass
+        cell_node_list = self.entity_node_lists[self.mesh.cell_set]
+        layers = numpy.arange(self.mesh.layers - 1, dtype=IntType)
+        values = cell_node_list[:, numpy.newaxis, :] + \
+            layers[numpy.newaxis, :, numpy.newaxis]*self.offset
+        values = values.reshape(cell_node_list.shape[0], -1)
+        val = op2.Map(self.mesh.cell_set.parent, self.node_set,
+                      values.shape[1], values,
+                      "%s_column_node" % V.name)
+        cache[()] = val
+        return val
+
 
 def get_shared_data(mesh, finat_element):
     """Return the :class:`FunctionSpaceData` for the given
@@ -501,6 +501,16 @@ class FunctionSpace(object):
                              self.offset,
                              parent)
 
+    def column_node_map(self):
+        """Return the :class:`pyop2.Map` from the cells of the base
+        mesh of an extruded mesh to the function space nodes in the
+        whole column of cells above them.
+
+        The nodes are ordered by layer, from the bottom, and within a
+        layer as in the :meth:`cell_node_map`.  This is the map used
+        by column :func:`~.par_loop`\s."""
+        return self._shared_data.get_column_map(self)
+
     def boundary_nodes(self, sub_domain, method):
         """Return the boundary nodes for this :class:`~.FunctionSpace`.
 
@@ -1,3 +1,5 @@
+import time
+
 from pyop2 import op2
 from pyop2 import utils
 from mpi4py import MPI
@@ -9,6 +11,11 @@ import firedrake.dmplex as dmplex
 _MPI_types = {}
 
 
+exchange_stats = {"time": 0.0, "bytes": 0}
+"""The total time spent in halo exchanges on this process, and the
+number of bytes sent or received by them."""
+
+
 def _get_mtype(dat):
     """Get an MPI datatype corresponding to a Dat.
 
@@ -69,6 +76,17 @@ class Halo(op2.Halo):
             raise RuntimeError("Windowed SFs expose bugs in OpenMPI (use -sf_type basic)")
         return sf
 
+    @utils.cached_property
+    def nleaves(self):
+        """The number of halo points exchanged."""
+        _, _, remote = self.sf.getGraph()
+        return len(remote)
+
+    def _record(self, dat, start, count_bytes):
+        exchange_stats["time"] += time.perf_counter() - start
+        if count_bytes:
+            exchange_stats["bytes"] += self.nleaves * dat.cdim * dat.dtype.itemsize
+
     @utils.cached_property
     def comm(self):
         return self.dm.comm.tompi4py()
@@ -83,32 +101,40 @@ class Halo(op2.Halo):
         assert insert_mode is op2.WRITE, "Only WRITE GtoL supported"
         if self.comm.size == 1:
             return
+        start = time.perf_counter()
         mtype = _get_mtype(dat)
         dmplex.halo_begin(self.sf, dat, mtype, False)
+        self._record(dat, start, True)
 
     def global_to_local_end(self, dat, insert_mode):
         assert insert_mode is op2.WRITE, "Only WRITE GtoL supported"
         if self.comm.size == 1:
             return
+        start = time.perf_counter()
         mtype = _get_mtype(dat)
         dmplex.halo_end(self.sf, dat, mtype, False)
+        self._record(dat, start, False)
 
     def local_to_global_begin(self, dat, insert_mode):
         assert insert_mode in {op2.INC, op2.MIN, op2.MAX}, "%s LtoG not supported" % insert_mode
         if self.comm.size == 1:
             return
+        start = time.perf_counter()
         mtype = _get_mtype(dat)
         op = {op2.INC: MPI.SUM,
               op2.MIN: MPI.MIN,
               op2.MAX: MPI.MAX}[insert_mode]
         dmplex.halo_begin(self.sf, dat, mtype, True, op=op)
+        self._record(dat, start, True)
 
     def local_to_global_end(self, dat, insert_mode):
         assert insert_mode in {op2.INC, op2.MIN, op2.MAX}, "%s LtoG not supported" % insert_mode
         if self.comm.size == 1:
             return
+        start = time.perf_counter()
         mtype = _get_mtype(dat)
         op = {op2.INC: MPI.SUM,
               op2.MIN: MPI.MIN,
               op2.MAX: MPI.MAX}[insert_mode]
         dmplex.halo_end(self.sf, dat, mtype, True, op=op)
+        self._record(dat, start, False)
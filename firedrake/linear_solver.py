@@ -1,3 +1,6 @@
+import weakref
+from contextlib import contextmanager
+
 import ufl
 
 from firedrake.exceptions import ConvergenceError
@@ -38,6 +41,16 @@ class LinearSolver(solving_utils.ParametersMixin):
                to the solver from the command line in addition to
                through the ``solver_parameters`` dict.
 
+        Setting ``"share_pc"`` to ``True`` in the solver parameters
+        shares the preconditioner with the other solvers, also
+        created with ``"share_pc"``, on the same matrices and with
+        the same preconditioner parameters, so that its setup is only
+        done once (see :class:`~.SharedPreconditioner`).  The PETSc
+        PC returned by ``solver.ksp.getPC()`` is then the same object
+        for all of them: changing it (its type, fieldsplits, python
+        context, ...) changes it for all these solvers.  Sharing is
+        not possible with an ``options_prefix``.
+
         .. note::
 
           Any boundary conditions for this solve *must* have been
@@ -98,7 +111,32 @@ class LinearSolver(solving_utils.ParametersMixin):
         self.ksp.setOperators(A=self.A.petscmat, P=self.P.petscmat)
         # Set from options now (we're not allowed to change parameters
         # anyway).
+        self._shared_pc = None
         self.set_from_options(self.ksp)
+        # Solvers with the same operators and preconditioner options
+        # may share the preconditioner, and hence its setup.  Not with
+        # a user-supplied options prefix, since options from the
+        # command line could then differ between them.
+        if self.parameters.get("share_pc", False):
+            if options_prefix is not None:
+                raise ValueError("Cannot share the preconditioner of a solver with an options_prefix")
+            key, self._shared_pc = solving_utils.SharedPreconditioner.acquire(
+                self.A.petscmat, self.P.petscmat, W.dm, self.parameters)
+            weakref.finalize(self, solving_utils.SharedPreconditioner.release, key)
+            self.ksp.setPC(self._shared_pc.pc)
+            self.ksp.setOperators(A=self.A.petscmat, P=self.P.petscmat)
+
+    @contextmanager
+    def inserted_options(self):
+        """Context manager inside which the petsc options database
+        contains the parameters of this solver and of its shared
+        preconditioner."""
+        with super(LinearSolver, self).inserted_options():
+            if self._shared_pc is None:
+                yield
+            else:
+                with self._shared_pc.inserted_options():
+                    yield
 
     @cached_property
     def _b(self):
@@ -123,20 +161,44 @@ class LinearSolver(solving_utils.ParametersMixin):
         else:
             return _assemble(ufl.action(self.A.a, b))
 
-    def solve(self, x, b):
-        if not isinstance(x, (function.Function, vector.Vector)):
-            raise TypeError("Provided solution is a '%s', not a Function or Vector" % type(x).__name__)
-        if isinstance(b, vector.Vector):
-            b = b.function
-        if not isinstance(b, function.Function):
-            raise TypeError("Provided RHS is a '%s', not a Function" % type(b).__name__)
+    @cached_property
+    def _bc_mask(self):
+        """An array that is zero at the boundary condition nodes and one
+        elsewhere, on the locally owned entries of the global vector.
+
+        Used to apply the BCs to many right hand sides at once."""
+        mask = function.Function(self._W).assign(1)
+        for bc in self.A.bcs:
+            bc.zero(mask)
+        with mask.dat.vec_ro as v:
+            return v.array_r.copy()
 
+    def _apply_field_nullspaces(self):
         if len(self._W) > 1 and self.nullspace is not None:
             self.nullspace._apply(self._W.dof_dset.field_ises)
         if len(self._W) > 1 and self.transpose_nullspace is not None:
             self.transpose_nullspace._apply(self._W.dof_dset.field_ises, transpose=True)
         if len(self._W) > 1 and self.near_nullspace is not None:
             self.near_nullspace._apply(self._W.dof_dset.field_ises, near=True)
+
+    def _check_convergence(self):
+        r = self.ksp.getConvergedReason()
+        if r < 0:
+            raise ConvergenceError("LinearSolver failed to converge after %d iterations with reason: %s", self.ksp.getIterationNumber(), solving_utils.KSPReasons[r])
+
+    @staticmethod
+    def _check_arguments(x, b):
+        if not isinstance(x, (function.Function, vector.Vector)):
+            raise TypeError("Provided solution is a '%s', not a Function or Vector" % type(x).__name__)
+        if isinstance(b, vector.Vector):
+            b = b.function
+        if not isinstance(b, function.Function):
+            raise TypeError("Provided RHS is a '%s', not a Function" % type(b).__name__)
+        return b
+
+    def solve(self, x, b):
+        b = self._check_arguments(x, b)
+        self._apply_field_nullspaces()
         if self.A.has_bcs:
             b_bc = self._b
             # rhs = b - action(A, zero_function_with_bcs_applied)
@@ -155,6 +217,76 @@ class LinearSolver(solving_utils.ParametersMixin):
                 with acc as solution:
                     self.ksp.solve(rhs, solution)
 
-        r = self.ksp.getConvergedReason()
-        if r < 0:
-            raise ConvergenceError("LinearSolver failed to converge after %d iterations with reason: %s", self.ksp.getIterationNumber(), solving_utils.KSPReasons[r])
+        self._check_convergence()
+
+    def solve_many(self, xs, bs):
+        """Solve the system for several right hand sides.
+
+        :arg xs: a sequence of :class:`~.Function` or :class:`~.Vector`
+             objects to place the solutions in.
+        :arg bs: a sequence of the same length of right hand sides,
+             also :class:`~.Function` or :class:`~.Vector` objects.
+
+        The right hand sides are gathered into a dense multi-vector,
+        to which the boundary conditions are applied in one
+        operation.  If PETSc provides ``KSPMatSolve`` (PETSc 3.14 and
+        later) the systems are then solved together, so that a direct
+        solver can apply its factorisation to all of them at once, and
+        block Krylov methods (such as ``"ksp_type": "hpddm"``) can be
+        used.  Otherwise, or if the operator has a null space, the
+        systems are solved in turn, reusing the preconditioner.
+        """
+        xs = list(xs)
+        bs = list(bs)
+        if len(xs) != len(bs):
+            raise ValueError("Provided %d solutions but %d right hand sides" % (len(xs), len(bs)))
+        bs = [self._check_arguments(x, b) for x, b in zip(xs, bs)]
+        if not xs:
+            return
+        self._apply_field_nullspaces()
+
+        sizes = self._W.dof_dset.layout_vec.getSizes()
+        B = PETSc.Mat().createDense((sizes, (PETSc.DECIDE, len(bs))), comm=self.comm)
+        B.setUp()
+        rhs = B.getDenseArray()
+        for j, b in enumerate(bs):
+            with b.dat.vec_ro as v:
+                rhs[:, j] = v.array_r
+        if self.A.has_bcs:
+            # As in solve, rhs = b - action(A, zero_function_with_bcs_applied)
+            # with the boundary values at the BC nodes, for every column.
+            values = function.Function(self._W)
+            for bc in self.A.bcs:
+                bc.apply(values)
+            with values.dat.vec_ro as v, self._Abcs.dat.vec_ro as a:
+                offset = v.array_r - self._bc_mask * a.array_r
+            rhs *= self._bc_mask[:, None]
+            rhs += offset[:, None]
+        B.assemble()
+
+        nonzero_guess = self.ksp.getInitialGuessNonzero()
+        block = (hasattr(self.ksp, "matSolve")
+                 and self.nullspace is None and self.transpose_nullspace is None)
+        with self.inserted_options():
+            if block:
+                X = B.duplicate()
+                solution = X.getDenseArray()
+                if nonzero_guess:
+                    for j, x in enumerate(xs):
+                        with x.dat.vec_ro as v:
+                            solution[:, j] = v.array_r
+                X.assemble()
+                self.ksp.matSolve(B, X)
+                self._check_convergence()
+                solution = X.getDenseArray()
+                for j, x in enumerate(xs):
+                    with x.dat.vec_wo as v:
+                        v.array[:] = solution[:, j]
+            else:
+                b = B.createVecLeft()
+                for j, x in enumerate(xs):
+                    b.array[:] = rhs[:, j]
+                    acc = x.dat.vec if nonzero_guess else x.dat.vec_wo
+                    with acc as v:
+                        self.ksp.solve(b, v)
+                    self._check_convergence()
@@ -273,12 +273,11 @@ class ImplicitMatrix(MatrixBase):
 
         appctx = kwargs.get("appctx", {})
 
-        from firedrake.matrix_free.operators import ImplicitMatrixContext
-        ctx = ImplicitMatrixContext(a,
-                                    row_bcs=self.bcs,
-                                    col_bcs=self.bcs,
-                                    fc_params=kwargs["fc_params"],
-                                    appctx=appctx)
+        ctx = self._make_context(a,
+                                 row_bcs=self.bcs,
+                                 col_bcs=self.bcs,
+                                 fc_params=kwargs["fc_params"],
+                                 appctx=appctx)
         self.petscmat = PETSc.Mat().create(comm=self.comm)
         self.petscmat.setType("python")
         self.petscmat.setSizes((ctx.row_sizes, ctx.col_sizes),
@@ -287,6 +286,10 @@ class ImplicitMatrix(MatrixBase):
         self.petscmat.setUp()
         self.petscmat.assemble()
 
+    def _make_context(self, a, **kwargs):
+        from firedrake.matrix_free.operators import ImplicitMatrixContext
+        return ImplicitMatrixContext(a, **kwargs)
+
     def assemble(self):
         # Bump petsc matrix state by assembling it.
         # Ensures that if the matrix changed, the preconditioner is
@@ -299,3 +302,83 @@ class ImplicitMatrix(MatrixBase):
     def assembled(self):
         self.assemble()
         return True
+
+
+class PartiallyAssembledMatrix(ImplicitMatrix):
+    """A representation of a bilinear form storing its element
+    matrices, rather than the assembled global matrix.
+
+    :arg a: the bilinear form this :class:`Matrix` represents.
+
+    :arg bcs: an iterable of boundary conditions to apply to this
+        :class:`Matrix`.  May be `None` if there are no boundary
+        conditions to apply.
+
+    The element matrices are evaluated on construction and by
+    :meth:`assemble`, the action of the matrix then only gathers,
+    multiplies by the element matrices and scatters.  Only cell
+    integrals on meshes that are not extruded, and test and trial
+    spaces that are not mixed, are supported.
+    """
+    def _make_context(self, a, **kwargs):
+        from firedrake.matrix_free.operators import PartialAssemblyContext
+        ctx = PartialAssemblyContext(a, **kwargs)
+        ctx.assemble()
+        return ctx
+
+    def assemble(self):
+        # Recompute the element matrices, since the coefficients or
+        # mesh may have changed, and bump the petsc matrix state.
+        self.petscmat.getPythonContext().assemble()
+        self.petscmat.assemble()
+
+    def force_evaluation(self):
+        self.petscmat.assemble()
+
+    @property
+    def assembled(self):
+        return True
+
+
+class FiniteDifferenceJacobian(MatrixBase):
+    """A Jacobian applied by finite differences of the residual,
+    without assembling (or compiling) the Jacobian form.
+
+    :arg a: the Jacobian form, only used for its arguments.
+    :arg bcs: an iterable of boundary conditions of the problem.
+    :arg F: the residual form.
+    :arg state: the :class:`.Function` the residual is linearised
+        about.
+
+    :meth:`assemble` linearises the operator about the current value
+    of ``state``, see
+    :class:`~.FiniteDifferenceJacobianContext`.
+    """
+    def __init__(self, a, bcs, F, state, *args, **kwargs):
+        super(FiniteDifferenceJacobian, self).__init__(a, bcs)
+
+        from firedrake.matrix_free.operators import FiniteDifferenceJacobianContext
+        ctx = FiniteDifferenceJacobianContext(F, state,
+                                              bcs=self.bcs,
+                                              fc_params=kwargs.get("fc_params"),
+                                              pre_function_callback=kwargs.get("pre_function_callback"))
+        self.context = ctx
+        self.petscmat = PETSc.Mat().create(comm=self.comm)
+        self.petscmat.setType("python")
+        self.petscmat.setSizes((ctx.row_sizes, ctx.col_sizes),
+                               bsize=ctx.block_size)
+        self.petscmat.setPythonContext(ctx)
+        self.petscmat.setUp()
+        self.petscmat.assemble()
+
+    def assemble(self):
+        self.context.update()
+        # Bump petsc matrix state.
+        self.petscmat.assemble()
+
+    def force_evaluation(self):
+        pass
+
+    @property
+    def assembled(self):
+        return True
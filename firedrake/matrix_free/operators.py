@@ -1,4 +1,8 @@
+import math
 
+import numpy
+from pyop2 import op2
+import ufl
 from ufl import action
 
 from firedrake.ufl_expr import adjoint
@@ -7,7 +11,8 @@ from firedrake.formmanipulation import ExtractSubBlock
 from firedrake.petsc import PETSc
 
 
-__all__ = ("ImplicitMatrixContext", )
+__all__ = ("ImplicitMatrixContext", "FiniteDifferenceJacobianContext",
+           "PartialAssemblyContext")
 
 
 def find_sub_block(iset, ises):
@@ -49,6 +54,40 @@ def find_sub_block(iset, ises):
     return found
 
 
+def is_tensor_product_form(form):
+    """Is a form defined on tensor-product cells?
+
+    :arg form: the form.
+
+    True on quadrilateral meshes and extruded meshes, where the
+    elements of the arguments are tensor products of interval (and
+    base cell) elements.
+    """
+    cell = form.ufl_domain().ufl_cell()
+    return isinstance(cell, ufl.TensorProductCell) or cell.cellname() == "quadrilateral"
+
+
+def action_parameters(form, fc_params=None):
+    """Form compiler parameters for the action of a matrix-free operator.
+
+    :arg form: the bilinear form.
+    :arg fc_params: the form compiler parameters given by the user,
+        or ``None``.
+
+    On tensor-product cells, the action is compiled in TSFC's
+    ``"spectral"`` mode, which sum-factorises the contractions with
+    the basis functions, reducing the cost per cell from
+    :math:`O(p^{2d})` to :math:`O(p^{d+1})` at degree :math:`p` in
+    :math:`d` dimensions.  A ``"mode"`` given in ``fc_params`` is
+    always respected.
+    """
+    if (fc_params or {}).get("mode") is not None or not is_tensor_product_form(form):
+        return fc_params
+    params = dict(fc_params or {})
+    params["mode"] = "spectral"
+    return params
+
+
 class ImplicitMatrixContext(object):
     # By default, these matrices will represent diagonal blocks (the
     # (0,0) block of a 1x1 block matrix is on the diagonal).
@@ -112,12 +151,14 @@ class ImplicitMatrixContext(object):
         self.action = action(self.a, self._x)
         self.actionT = action(self.aT, self._y)
 
+        # Sum-factorised on tensor-product cells.
+        action_fc_params = action_parameters(self.a, self.fc_params)
         from firedrake.assemble import create_assembly_callable
         self._assemble_action = create_assembly_callable(self.action, tensor=self._y,
-                                                         form_compiler_parameters=self.fc_params)
+                                                         form_compiler_parameters=action_fc_params)
 
         self._assemble_actionT = create_assembly_callable(self.actionT, tensor=self._x,
-                                                          form_compiler_parameters=self.fc_params)
+                                                          form_compiler_parameters=action_fc_params)
 
     def mult(self, mat, X, Y):
         with self._x.dat.vec_wo as v:
@@ -271,3 +312,351 @@ class ImplicitMatrixContext(object):
         submat.setUp()
 
         return submat
+
+
+class FiniteDifferenceJacobianContext(object):
+    """Python context for a PETSc matrix applying the Jacobian of a
+    residual by finite differences.
+
+    :arg F: the residual form.
+    :arg state: the :class:`.Function` the residual is linearised
+        about.
+    :arg bcs: an iterable of the :class:`.DirichletBC`\\s of the
+        problem.  The operator is the identity on their nodes.
+    :arg fc_params: A dictionary of parameters to pass on to the form
+        compiler.
+    :arg pre_function_callback: an optional function called with the
+        (perturbed) state before each residual evaluation.
+
+    The action on a vector :math:`v` is
+
+    .. math::
+
+       J v \\approx \\frac{F(u_0 + h v) - F(u_0)}{h},
+
+    where :math:`u_0` is the state at the last call to :meth:`update`
+    and the step is chosen as in PETSc's ``MatMFFD`` (Walker and
+    Pernice), :math:`h = \\sqrt{\\epsilon} \\sqrt{1 + \\|u_0\\|} / \\|v\\|`.
+    Each application therefore costs one residual evaluation, and
+    only the residual needs to be compiled.
+    """
+    def __init__(self, F, state, bcs=(), fc_params=None, pre_function_callback=None):
+        from firedrake import function
+        from firedrake.assemble import create_assembly_callable
+
+        self.F = F
+        self.bcs = tuple(bcs)
+        self.fc_params = fc_params
+        self.pre_function_callback = pre_function_callback
+        self._state = state
+
+        test_space = F.arguments()[0].function_space()
+        trial_space = state.function_space()
+        self._u0 = function.Function(trial_space)
+        self._current = function.Function(trial_space)
+        self._x = function.Function(trial_space)
+        self._F0 = function.Function(test_space)
+        self._Fh = function.Function(test_space)
+        if len(self.bcs) > 0:
+            self._xbc = function.Function(trial_space)
+
+        trial_vec = trial_space.dof_dset.layout_vec
+        test_vec = test_space.dof_dset.layout_vec
+        self.col_sizes = trial_vec.getSizes()
+        self.row_sizes = test_vec.getSizes()
+        self.block_size = (test_vec.getBlockSize(), trial_vec.getBlockSize())
+
+        self._assemble_residual = create_assembly_callable(F, tensor=self._Fh,
+                                                           form_compiler_parameters=fc_params)
+        self.error_rel = math.sqrt(numpy.finfo(PETSc.ScalarType).eps)
+        self._u0_norm = 0
+        self.residual_evaluations = 0
+
+    def _residual(self):
+        """Evaluate the residual at the state into ``self._Fh``."""
+        if self.pre_function_callback is not None:
+            with self._state.dat.vec_ro as u:
+                self.pre_function_callback(u)
+        self._assemble_residual()
+        self.residual_evaluations += 1
+        for bc in self.bcs:
+            bc.zero(self._Fh)
+
+    def update(self):
+        """Linearise about the current state."""
+        self._u0.assign(self._state)
+        with self._u0.dat.vec_ro as u0:
+            self._u0_norm = u0.norm()
+        self._residual()
+        self._F0.assign(self._Fh)
+
+    def mult(self, mat, X, Y):
+        with self._x.dat.vec_wo as v:
+            X.copy(v)
+        # The columns of the boundary condition nodes are zero, as for
+        # an assembled Jacobian.
+        for bc in self.bcs:
+            bc.zero(self._x)
+        with self._x.dat.vec_ro as x:
+            norm = x.norm()
+
+        if norm == 0:
+            self._Fh.dat.zero()
+        else:
+            h = self.error_rel * math.sqrt(1 + self._u0_norm) / norm
+            # The state may have changed since the last update (it is
+            # the solution vector of the SNES), so restore it after.
+            self._current.assign(self._state)
+            with self._state.dat.vec_wo as u, self._u0.dat.vec_ro as u0, \
+                    self._x.dat.vec_ro as x:
+                u.waxpy(h, x, u0)
+            self._residual()
+            self._state.assign(self._current)
+            with self._Fh.dat.vec as fh, self._F0.dat.vec_ro as f0:
+                fh.axpy(-1, f0)
+                fh.scale(1 / h)
+
+        # Identity on the boundary condition nodes
+        if len(self.bcs) > 0:
+            with self._xbc.dat.vec_wo as v:
+                X.copy(v)
+        for bc in self.bcs:
+            bc.set(self._Fh, self._xbc)
+
+        with self._Fh.dat.vec_ro as v:
+            v.copy(Y)
+
+    def view(self, mat, viewer=None):
+        if viewer is None:
+            return
+        typ = viewer.getType()
+        if typ != PETSc.Viewer.Type.ASCII:
+            return
+        viewer.printfASCII("Firedrake finite difference Jacobian %s\n" %
+                           type(self).__name__)
+        viewer.printfASCII("%d residual evaluations\n" % self.residual_evaluations)
+
+
+class PartialAssemblyContext(object):
+    """Python context for a PETSc matrix storing the element matrices
+    of a bilinear form.
+
+    :arg a: The bilinear form defining the matrix.
+    :arg row_bcs: An iterable of the :class:`.DirichletBC`\\s that are
+      imposed on the test space.
+    :arg col_bcs: An iterable of the :class:`.DirichletBC`\\s that are
+      imposed on the trial space.
+    :arg fc_params: A dictionary of parameters to pass on to the form
+      compiler.
+    :arg appctx: Any extra user-supplied context, available to
+      preconditioners and the like.
+
+    :meth:`assemble` evaluates the local tensors of the cell integrals
+    of the form, and stores them for each cell.  The action of the
+    matrix then only multiplies the stored element matrices with the
+    local values of the input, rather than evaluating the geometry
+    and coefficients at every quadrature point, as the
+    :class:`ImplicitMatrixContext` does.  The boundary conditions are
+    applied as for an :class:`ImplicitMatrixContext`.  Only cell
+    integrals over meshes that are not extruded, with test and trial
+    spaces that are not mixed, are supported.
+    """
+    # Like the ImplicitMatrixContext of a whole form, never a
+    # sub-block.
+    on_diag = True
+
+    def __init__(self, a, row_bcs=[], col_bcs=[],
+                 fc_params=None, appctx=None):
+        from firedrake import function
+
+        self.a = a
+        self.fc_params = fc_params
+        self.appctx = appctx
+        self.row_bcs = row_bcs
+        self.col_bcs = col_bcs
+
+        test_space, trial_space = [
+            a.arguments()[i].function_space() for i in (0, 1)
+        ]
+        if len(test_space) > 1 or len(trial_space) > 1:
+            raise NotImplementedError("Partial assembly of mixed spaces not implemented")
+        mesh = a.ufl_domain()
+        if mesh.cell_set._extruded:
+            raise NotImplementedError("Partial assembly on extruded meshes not implemented")
+        for integral in a.integrals():
+            if integral.integral_type() != "cell":
+                raise NotImplementedError("Partial assembly of '%s' integrals not implemented" %
+                                          integral.integral_type())
+
+        self._y = function.Function(test_space)
+        self._x = function.Function(trial_space)
+        if len(self.row_bcs) > 0:
+            self._xbc = function.Function(trial_space)
+        if len(self.col_bcs) > 0:
+            self._ybc = function.Function(test_space)
+
+        trial_vec = trial_space.dof_dset.layout_vec
+        test_vec = test_space.dof_dset.layout_vec
+        self.col_sizes = trial_vec.getSizes()
+        self.row_sizes = test_vec.getSizes()
+        self.block_size = (test_vec.getBlockSize(), trial_vec.getBlockSize())
+
+        self._test_map = test_space.cell_node_map()
+        self._trial_map = trial_space.cell_node_map()
+        nrows = self._test_map.arity * test_space.value_size
+        ncols = self._trial_map.arity * trial_space.value_size
+        self.element_shape = (nrows, ncols)
+        self.element_matrices = op2.Dat(op2.DataSet(mesh.cell_set, nrows * ncols),
+                                        dtype=PETSc.ScalarType)
+
+        args = {"nnodes_row": self._test_map.arity,
+                "rdim": test_space.value_size,
+                "nnodes_col": self._trial_map.arity,
+                "cdim": trial_space.value_size}
+        self._apply_kernel = op2.Kernel("""
+        void partial_assembly_apply(double *A, double **x, double **y) {
+            for (int i = 0; i < %(nnodes_row)d; i++) {
+                for (int ci = 0; ci < %(rdim)d; ci++) {
+                    const double *row = A + (i*%(rdim)d + ci)*%(nnodes_col)d*%(cdim)d;
+                    double acc = 0.0;
+                    for (int j = 0; j < %(nnodes_col)d; j++) {
+                        for (int cj = 0; cj < %(cdim)d; cj++) {
+                            acc += row[j*%(cdim)d + cj] * x[j][cj];
+                        }
+                    }
+                    y[i][ci] += acc;
+                }
+            }
+        }""" % args, "partial_assembly_apply")
+        self._apply_transpose_kernel = op2.Kernel("""
+        void partial_assembly_apply_transpose(double *A, double **y, double **x) {
+            for (int i = 0; i < %(nnodes_row)d; i++) {
+                for (int ci = 0; ci < %(rdim)d; ci++) {
+                    const double *row = A + (i*%(rdim)d + ci)*%(nnodes_col)d*%(cdim)d;
+                    const double yi = y[i][ci];
+                    for (int j = 0; j < %(nnodes_col)d; j++) {
+                        for (int cj = 0; cj < %(cdim)d; cj++) {
+                            x[j][cj] += row[j*%(cdim)d + cj] * yi;
+                        }
+                    }
+                }
+            }
+        }""" % args, "partial_assembly_apply_transpose")
+
+    def assemble(self):
+        """Evaluate and store the element matrices."""
+        from firedrake import tsfc_interface
+        from firedrake.assemble import substitute_geometric_quantities
+
+        a = substitute_geometric_quantities(self.a)
+        fc_params = dict(self.fc_params or {})
+        fc_params["assemble_inverse"] = False
+        kernels = tsfc_interface.compile_form(a, "form", parameters=fc_params)
+        mesh = a.ufl_domain()
+        coefficients = a.coefficients()
+        integer_subdomain_ids = {"cell": tuple(sorted(k.kinfo.subdomain_id for k in kernels
+                                                      if k.kinfo.subdomain_id != "otherwise"))}
+
+        self.element_matrices.zero()
+        for _, (kernel, integral_type, needs_orientations, subdomain_id, domain_number,
+                coeff_map, needs_cell_facets, pass_layer_arg) in kernels:
+            itspace = a.subdomain_data()[mesh].get("cell", None) or \
+                mesh.measure_set(integral_type, subdomain_id, integer_subdomain_ids)
+            coords = mesh.coordinates
+            args = [kernel, itspace, self.element_matrices(op2.INC),
+                    coords.dat(op2.READ, coords.cell_node_map())]
+            if needs_orientations:
+                o = mesh.cell_orientations()
+                args.append(o.dat(op2.READ, o.cell_node_map()))
+            for n in coeff_map:
+                for c in coefficients[n].split():
+                    args.append(c.dat(op2.READ, c.cell_node_map()))
+            if needs_cell_facets:
+                args.append(mesh.cell_to_facets(op2.READ))
+            op2.par_loop(*args)
+
+        # The loops above only compute the owned cells, but the action
+        # also runs over the halo cells, so that dofs on the partition
+        # boundary receive all their contributions.
+        self.element_matrices._force_evaluation(read=True, write=False)
+        self.element_matrices.global_to_local_begin(op2.READ)
+        self.element_matrices.global_to_local_end(op2.READ)
+
+    @property
+    def nbytes(self):
+        """The memory used by the element matrices."""
+        return self.element_matrices.nbytes
+
+    def mult(self, mat, X, Y):
+        with self._x.dat.vec_wo as v:
+            X.copy(v)
+
+        # As for ImplicitMatrixContext, compute the action with the
+        # boundary condition columns zeroed, then set the values on
+        # the boundary condition rows.
+        for bc in self.col_bcs:
+            bc.zero(self._x)
+
+        self._y.dat.zero()
+        op2.par_loop(self._apply_kernel, self.a.ufl_domain().cell_set,
+                     self.element_matrices(op2.READ),
+                     self._x.dat(op2.READ, self._trial_map),
+                     self._y.dat(op2.INC, self._test_map))
+
+        if len(self.row_bcs) > 0:
+            with self._xbc.dat.vec_wo as v:
+                X.copy(v)
+        for bc in self.row_bcs:
+            bc.set(self._y, self._xbc)
+
+        with self._y.dat.vec_ro as v:
+            v.copy(Y)
+
+    def multTranspose(self, mat, Y, X):
+        # As for mult, just everything swapped round.
+        with self._y.dat.vec_wo as v:
+            Y.copy(v)
+
+        for bc in self.row_bcs:
+            bc.zero(self._y)
+
+        self._x.dat.zero()
+        op2.par_loop(self._apply_transpose_kernel, self.a.ufl_domain().cell_set,
+                     self.element_matrices(op2.READ),
+                     self._y.dat(op2.READ, self._test_map),
+                     self._x.dat(op2.INC, self._trial_map))
+
+        if len(self.col_bcs) > 0:
+            with self._ybc.dat.vec_wo as v:
+                Y.copy(v)
+        for bc in self.col_bcs:
+            bc.set(self._x, self._ybc)
+
+        with self._x.dat.vec_ro as v:
+            v.copy(X)
+
+    def view(self, mat, viewer=None):
+        if viewer is None:
+            return
+        typ = viewer.getType()
+        if typ != PETSc.Viewer.Type.ASCII:
+            return
+        viewer.printfASCII("Firedrake partially assembled operator %s\n" %
+                           type(self).__name__)
+        viewer.printfASCII("Element matrices of shape %d x %d\n" % self.element_shape)
+
+    def getInfo(self, mat, info=None):
+        from mpi4py import MPI
+        memory = self.nbytes + self._x.dat.nbytes + self._y.dat.nbytes
+        if info is None:
+            info = PETSc.Mat.InfoType.GLOBAL_SUM
+        if info == PETSc.Mat.InfoType.LOCAL:
+            return {"memory": memory}
+        elif info == PETSc.Mat.InfoType.GLOBAL_SUM:
+            gmem = mat.comm.tompi4py().allreduce(memory, op=MPI.SUM)
+            return {"memory": gmem}
+        elif info == PETSc.Mat.InfoType.GLOBAL_MAX:
+            gmem = mat.comm.tompi4py().allreduce(memory, op=MPI.MAX)
+            return {"memory": gmem}
+        else:
+            raise ValueError("Unknown info type %s" % info)
@@ -1,9 +1,11 @@
 import abc
 
+import numpy
+
 from firedrake.citations import Citations
 from firedrake.petsc import PETSc
 
-__all__ = ("AssembledPC", "MassInvPC", "PCDPC", "PCBase")
+__all__ = ("AssembledPC", "MassInvPC", "PCDPC", "LineSmootherPC", "PCBase")
 
 
 class PCBase(object, metaclass=abc.ABCMeta):
@@ -354,3 +356,222 @@ class PCDPC(PCBase):
         self.Mksp.view(viewer)
         viewer.popASCIITab()
         viewer.popASCIITab()
+
+
+def _factor_block_tridiagonal(lower, diag, upper):
+    """Factor a batch of block tridiagonal matrices.
+
+    :arg lower: the blocks below the diagonal, an array of shape
+        ``(nmatrices, nblocks, bsize, bsize)``, ``lower[:, j]``
+        couples block row ``j`` to block column ``j - 1``
+        (``lower[:, 0]`` is ignored).
+    :arg diag: the diagonal blocks.
+    :arg upper: the blocks above the diagonal, ``upper[:, j]``
+        couples block row ``j`` to block column ``j + 1``.
+    :returns: the factorisation, to pass to
+        :func:`_solve_block_tridiagonal`.
+    """
+    multipliers = numpy.zeros_like(lower)
+    inverses = numpy.empty_like(diag)
+    inverses[:, 0] = numpy.linalg.inv(diag[:, 0])
+    for j in range(1, diag.shape[1]):
+        multipliers[:, j] = numpy.matmul(lower[:, j], inverses[:, j-1])
+        inverses[:, j] = numpy.linalg.inv(diag[:, j] - numpy.matmul(multipliers[:, j], upper[:, j-1]))
+    return multipliers, inverses, upper
+
+
+def _solve_block_tridiagonal(factors, b):
+    """Solve a batch of factored block tridiagonal systems.
+
+    :arg factors: the factorisation from
+        :func:`_factor_block_tridiagonal`.
+    :arg b: the right hand sides, shape ``(nmatrices, nblocks, bsize)``.
+    """
+    multipliers, inverses, upper = factors
+    z = b.copy()
+    for j in range(1, z.shape[1]):
+        z[:, j] -= numpy.einsum("lij,lj->li", multipliers[:, j], z[:, j-1])
+    x = numpy.empty_like(z)
+    x[:, -1] = numpy.einsum("lij,lj->li", inverses[:, -1], z[:, -1])
+    for j in reversed(range(z.shape[1] - 1)):
+        x[:, j] = numpy.einsum("lij,lj->li", inverses[:, j],
+                               z[:, j] - numpy.einsum("lij,lj->li", upper[:, j], x[:, j+1]))
+    return x
+
+
+class LineSmootherPC(PCBase):
+    """A block Jacobi preconditioner whose blocks are the vertical
+    lines of an extruded mesh.
+
+    A line is made of the degrees of freedom on one entity of the
+    base mesh in every layer.  The operator restricted to a line is
+    block tridiagonal, with a block per layer.  These systems are
+    extracted from the assembled operator and factored, batched over
+    all lines of the same shape, and each application of the
+    preconditioner solves them all in a single sweep up and down the
+    columns.  The coupling between lines is ignored, so this is
+    exact for purely vertical operators, and otherwise best used as a
+    smoother or inside a Krylov method.
+
+    Matrix-free operators are assembled first, with the matrix type
+    controlled by the option ``line_mat_type`` (default ``"aij"``).
+    Only extruded meshes with constant layers and non-mixed function
+    spaces are supported.
+    """
+    def initialize(self, pc):
+        from firedrake.assemble import allocate_matrix, create_assembly_callable
+        from firedrake.dmhooks import get_function_space
+
+        _, P = pc.getOperators()
+        prefix = pc.getOptionsPrefix()
+
+        if P.getType() == "python":
+            context = P.getPythonContext()
+            if not context.on_diag:
+                raise ValueError("Only makes sense to invert diagonal block")
+            mat_type = PETSc.Options().getString(prefix + "line_mat_type", "aij")
+            self.P = allocate_matrix(context.a, bcs=context.row_bcs,
+                                     form_compiler_parameters=context.fc_params,
+                                     mat_type=mat_type)
+            self._assemble_P = create_assembly_callable(context.a, tensor=self.P,
+                                                        bcs=context.row_bcs,
+                                                        form_compiler_parameters=context.fc_params,
+                                                        mat_type=mat_type)
+            self._assemble_P()
+            self.P.force_evaluation()
+            self.Pmat = self.P.petscmat
+            V = context.a.arguments()[0].function_space()
+        else:
+            self._assemble_P = None
+            self.Pmat = P
+            V = get_function_space(pc.getDM())
+
+        self._build_lines(V)
+        self._factor()
+
+    def _build_lines(self, V):
+        """Find the lines of degrees of freedom of a function space.
+
+        :arg V: the function space.
+
+        Sets ``self.groups``, a list of ``(indices, bsize)`` pairs
+        for the lines of each shape.  ``indices`` is an array of
+        shape ``(nlines, nblocks*bsize)`` of the local degrees of
+        freedom of each line, in vertical order, padded with -1.
+        """
+        mesh = V.mesh()
+        if len(V) > 1:
+            raise NotImplementedError("LineSmootherPC not implemented for mixed spaces")
+        if not mesh.cell_set._extruded:
+            raise ValueError("LineSmootherPC requires an extruded mesh")
+        if mesh.variable_layers:
+            raise NotImplementedError("LineSmootherPC not implemented for variable layers")
+
+        cdim = V.dof_dset.cdim
+        nowned = V.dof_dset.size
+        section = V._shared_data.global_numbering
+        nodes = numpy.asarray(mesh.make_dofs_per_plex_entity(V.finat_element.entity_dofs()))
+        plex = mesh._plex
+        # Lines of the same length and block size, keyed on those
+        shapes = {}
+        for depth in range(plex.getDimension() + 1):
+            # Nodes of an entity in each layer
+            bsize = nodes[depth].sum()
+            if bsize == 0:
+                continue
+            for p in range(*plex.getDepthStratum(depth)):
+                start = section.getOffset(p)
+                if start >= nowned:
+                    continue
+                shapes.setdefault((section.getDof(p), bsize), []).append(start)
+
+        self.groups = []
+        self._positions = numpy.full((nowned*cdim, 3), -1, dtype=numpy.int64)
+        for g, ((n, bsize), starts) in enumerate(sorted(shapes.items())):
+            nblocks = -(-n // bsize)
+            offsets = numpy.arange(nblocks*bsize*cdim)
+            indices = numpy.asarray(starts)[:, numpy.newaxis]*cdim + offsets
+            indices[:, n*cdim:] = -1
+            owned = indices >= 0
+            line, position = numpy.nonzero(owned)
+            self._positions[indices[owned]] = numpy.stack([numpy.full_like(line, g), line, position], axis=1)
+            self.groups.append((indices, bsize*cdim))
+        order = numpy.concatenate([indices[indices >= 0] for indices, _ in self.groups])
+        self._order = order
+        rows = V.dof_dset.lgmap.apply(order.astype(PETSc.IntType))
+        self._iset = PETSc.IS().createGeneral(rows, comm=PETSc.COMM_SELF)
+
+    def _factor(self):
+        """Extract the line systems from the operator and factor them."""
+        A, = self.Pmat.createSubMatrices([self._iset], [self._iset])
+        if A.getType() != PETSc.Mat.Type.SEQAIJ:
+            A = A.convert(PETSc.Mat.Type.SEQAIJ)
+        indptr, columns, values = A.getValuesCSR()
+        A.destroy()
+        rows = numpy.repeat(numpy.arange(len(indptr) - 1), numpy.diff(indptr))
+        row = self._positions[self._order[rows]]
+        col = self._positions[self._order[columns]]
+
+        self.factors = []
+        self._transpose_factors = None
+        self._systems = []
+        for g, (indices, bsize) in enumerate(self.groups):
+            nlines, n = indices.shape
+            nblocks = n // bsize
+            keep = (row[:, 0] == g) & (col[:, 0] == g) & (row[:, 1] == col[:, 1])
+            line = row[keep, 1]
+            r = row[keep, 2]
+            c = col[keep, 2]
+            # 0: below, 1: on and 2: above the diagonal
+            which = c // bsize - r // bsize + 1
+            near = (which >= 0) & (which <= 2)
+            blocks = numpy.zeros((3, nlines, nblocks, bsize, bsize), dtype=values.dtype)
+            blocks[which[near], line[near], r[near] // bsize,
+                   r[near] % bsize, c[near] % bsize] = values[keep][near]
+            # Identity on the padding
+            pl, pb, pi = numpy.nonzero(indices.reshape(nlines, nblocks, bsize) < 0)
+            blocks[1, pl, pb, pi, pi] = 1
+            self._systems.append(blocks)
+            self.factors.append(_factor_block_tridiagonal(*blocks))
+
+    def update(self, pc):
+        if self._assemble_P is not None:
+            self._assemble_P()
+            self.P.force_evaluation()
+        self._factor()
+
+    def _apply(self, factors, x, y):
+        xa = x.array_r
+        ya = numpy.zeros_like(xa)
+        for (indices, bsize), factor in zip(self.groups, factors):
+            nlines, n = indices.shape
+            owned = indices >= 0
+            b = numpy.where(owned, xa[indices], 0).reshape(nlines, n // bsize, bsize)
+            ya[indices[owned]] = _solve_block_tridiagonal(factor, b).reshape(nlines, n)[owned]
+        y.setArray(ya)
+
+    def apply(self, pc, x, y):
+        self._apply(self.factors, x, y)
+
+    def applyTranspose(self, pc, x, y):
+        if self._transpose_factors is None:
+            self._transpose_factors = []
+            for lower, diag, upper in self._systems:
+                # Transpose the blocks, and swap those above and below
+                # the diagonal
+                lowerT = numpy.zeros_like(lower)
+                upperT = numpy.zeros_like(upper)
+                lowerT[:, 1:] = numpy.swapaxes(upper[:, :-1], -1, -2)
+                upperT[:, :-1] = numpy.swapaxes(lower[:, 1:], -1, -2)
+                diagT = numpy.swapaxes(diag, -1, -2)
+                self._transpose_factors.append(_factor_block_tridiagonal(lowerT, diagT, upperT))
+        self._apply(self._transpose_factors, x, y)
+
+    def view(self, pc, viewer=None):
+        super(LineSmootherPC, self).view(pc, viewer)
+        if hasattr(self, "groups"):
+            viewer.pushASCIITab()
+            for indices, bsize in self.groups:
+                viewer.printfASCII("%d lines of %d blocks of size %d\n" %
+                                   (indices.shape[0], indices.shape[1] // bsize, bsize))
+            viewer.popASCIITab()
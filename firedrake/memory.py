@@ -0,0 +1,339 @@
+"""Accounting for the memory used by Firedrake objects.
+
+:func:`memory_report` estimates the memory held by live meshes, the
+data shared between function spaces, functions, matrices, sparsity
+patterns and compiled kernels.  The estimates count the array data of
+these objects, not the Python objects wrapping them, so they are a
+lower bound on the memory used.
+
+:func:`set_memory_logging` turns on logging of the change in resident
+memory across calls to :func:`~.assemble` and :func:`~.solve`.
+"""
+import gc
+import os
+import resource
+import sys
+from collections import defaultdict
+
+import numpy
+from decorator import decorator
+
+from pyop2 import op2
+from pyop2.datatypes import IntType, ScalarType
+from pyop2.mpi import COMM_WORLD
+
+from firedrake.logging import log, INFO
+from firedrake.petsc import PETSc
+
+
+__all__ = ("memory_report", "set_memory_logging")
+
+
+categories = ("mesh", "maps", "shared_data", "functions", "matrices", "sparsities", "kernels")
+"""The categories of memory reported by :func:`memory_report`."""
+
+
+def _nbytes(obj, seen):
+    """Estimate the bytes of array data held by an object.
+
+    :arg obj: the object.
+    :arg seen: a set of the ids of objects already counted, updated
+        in place.
+
+    Containers are traversed, other unknown objects count as zero.
+    """
+    from firedrake.function import CoordinatelessFunction, Function
+
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, numpy.ndarray):
+        return obj.nbytes
+    elif isinstance(obj, (str, bytes)):
+        return len(obj)
+    elif isinstance(obj, dict):
+        return sum(_nbytes(k, seen) + _nbytes(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(_nbytes(v, seen) for v in obj)
+    elif isinstance(obj, (Function, CoordinatelessFunction)):
+        return _nbytes(obj.dat, seen)
+    elif isinstance(obj, op2.DatView):
+        # Shares the data of its parent
+        return 0
+    elif isinstance(obj, op2.MixedDat):
+        return sum(_nbytes(d, seen) for d in obj)
+    elif isinstance(obj, op2.Dat):
+        return obj.nbytes if getattr(obj, "_is_allocated", True) else 0
+    elif isinstance(obj, op2.DecoratedMap):
+        return _nbytes(obj.map, seen)
+    elif isinstance(obj, op2.Map):
+        return obj.values_with_halo.nbytes
+    elif isinstance(obj, PETSc.IS):
+        return obj.getLocalSize() * IntType.itemsize
+    elif isinstance(obj, PETSc.Section):
+        # Dof and offset for every point in the chart
+        pStart, pEnd = obj.getChart()
+        return 2 * (pEnd - pStart) * IntType.itemsize
+    return 0
+
+
+def _maps_nbytes(obj, seen):
+    """Estimate the bytes of the index maps held in containers.
+
+    :arg obj: the object.
+    :arg seen: a set of the ids of objects already counted, updated
+        in place.
+
+    Only :class:`pyop2.Map` objects are counted, so that they can
+    be reported separately from the rest of a container.
+    """
+    if isinstance(obj, (op2.Map, op2.DecoratedMap)):
+        return _nbytes(obj, seen)
+    elif isinstance(obj, dict):
+        return sum(_maps_nbytes(v, seen) for v in obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        return sum(_maps_nbytes(v, seen) for v in obj)
+    return 0
+
+
+def _plex_nbytes(plex, seen):
+    """Estimate the memory used by a DMPlex.
+
+    :arg plex: the DMPlex.
+    :arg seen: a set of the ids of objects already counted, updated
+        in place.
+
+    Counts the cone and support sections, the cones, orientations and
+    supports, the local coordinates and the labels.
+    """
+    if plex.handle in seen:
+        return 0
+    seen.add(plex.handle)
+    pStart, pEnd = plex.getChart()
+    nconnections = 0
+    for height in range(plex.getDimension() + 1):
+        start, end = plex.getHeightStratum(height)
+        if end > start:
+            nconnections += (end - start) * plex.getConeSize(start)
+    nbytes = IntType.itemsize * (4 * (pEnd - pStart) + 3 * nconnections)
+    coordinates = plex.getCoordinatesLocal()
+    if coordinates is not None:
+        nbytes += coordinates.getLocalSize() * ScalarType.itemsize
+    for i in range(plex.getNumLabels()):
+        name = plex.getLabelName(i)
+        for value in plex.getLabelIdIS(name).indices:
+            nbytes += plex.getStratumSize(name, value) * IntType.itemsize
+    return nbytes
+
+
+def _mat_nbytes(mat):
+    """Estimate the memory used by the values and indices of a PETSc Mat.
+
+    :arg mat: the Mat.
+    """
+    if mat.getType() == "python":
+        return 0
+    info = mat.getInfo()
+    nrows, _ = mat.getLocalSize()
+    return int(info["nz_allocated"]) * (ScalarType.itemsize + IntType.itemsize) + \
+        nrows * IntType.itemsize
+
+
+def _kernel_nbytes(seen):
+    """Estimate the memory used by the in-memory kernel caches.
+
+    :arg seen: a set of the ids of objects already counted, updated
+        in place.
+
+    Counts the generated code of the cached TSFC kernels.
+    """
+    from firedrake.tsfc_interface import TSFCKernel
+
+    nbytes = 0
+    for tsfc_kernel in list(TSFCKernel._cache.values()):
+        for info in getattr(tsfc_kernel, "kernels", ()):
+            kernel = info.kernel
+            if id(kernel) in seen:
+                continue
+            seen.add(id(kernel))
+            nbytes += sys.getsizeof(getattr(kernel, "_code", None) or "")
+    return nbytes
+
+
+def _local_usage():
+    """Return the memory held by live objects on this process.
+
+    :returns: a dict mapping mesh names (and ``None`` for objects not
+        associated with a mesh) to dicts mapping categories to bytes.
+    """
+    from firedrake.function import CoordinatelessFunction
+    from firedrake.matrix import MatrixBase
+    from firedrake.mesh import MeshTopology
+
+    usage = defaultdict(lambda: dict.fromkeys(categories, 0))
+    seen = set()
+    objects = gc.get_objects()
+    meshes = [o for o in objects if isinstance(o, MeshTopology)]
+    functions = [o for o in objects if isinstance(o, CoordinatelessFunction)]
+    matrices = [o for o in objects if isinstance(o, MatrixBase)]
+    sparsities = [o for o in objects if isinstance(o, op2.Sparsity)]
+    del objects
+
+    for mesh in meshes:
+        # Mesh data first, so that work functions and the like are
+        # counted as shared data, not functions.
+        usage[mesh.name]["mesh"] += _plex_nbytes(mesh._plex, seen)
+        numbering = [v for k, v in vars(mesh).items()
+                     if k not in {"_shared_data_cache", "_plex"}]
+        usage[mesh.name]["mesh"] += _nbytes(numbering, seen)
+        for facets in ("exterior_facets", "interior_facets"):
+            if facets in vars(mesh):
+                usage[mesh.name]["mesh"] += _nbytes(vars(vars(mesh)[facets]), seen)
+        usage[mesh.name]["maps"] += _maps_nbytes(mesh._shared_data_cache, seen)
+        usage[mesh.name]["shared_data"] += _nbytes(mesh._shared_data_cache, seen)
+
+    for f in functions:
+        usage[f.function_space().mesh().name]["functions"] += _nbytes(f.dat, seen)
+
+    for A in matrices:
+        mat = A.petscmat
+        if mat.handle in seen:
+            continue
+        seen.add(mat.handle)
+        mesh = A.a.ufl_domain()
+        usage[mesh.name if mesh is not None else None]["matrices"] += _mat_nbytes(mat)
+
+    for sparsity in sparsities:
+        usage[None]["sparsities"] += _nbytes([v for v in vars(sparsity).values()
+                                              if isinstance(v, numpy.ndarray)], seen)
+
+    usage[None]["kernels"] += _kernel_nbytes(seen)
+    return usage
+
+
+def memory_report(comm=COMM_WORLD, verbose=False):
+    """Report the memory held by live Firedrake objects.
+
+    :arg comm: the communicator to reduce the report over, all
+        processes in it must call this function.
+    :arg verbose: print the report (on rank 0).
+    :returns: a dict with keys ``"total"``, ``"categories"`` and
+        ``"meshes"``.  ``"total"`` maps to the statistics of the total
+        memory, ``"categories"`` maps each category to its
+        statistics, and ``"meshes"`` maps each mesh name to a dict of
+        statistics by category.  The statistics are a dict with keys
+        ``"min"``, ``"max"`` and ``"mean"``, giving the number of
+        bytes across the processes in ``comm``.
+
+    The categories are:
+
+    ``"mesh"``
+        The DMPlex and Firedrake's numbering of the mesh.
+    ``"maps"``
+        The maps from mesh entities to function space nodes, shared
+        between function spaces on a mesh.  Their entries have the
+        PETSc integer type, so take twice the memory with 64-bit
+        PETSc indices.
+    ``"shared_data"``
+        Other data shared between function spaces on a mesh (node
+        sets, boundary masks, work functions, ...).
+    ``"functions"``
+        The data of live :class:`~.Function` objects.
+    ``"matrices"``
+        The values and indices of assembled matrices.
+    ``"sparsities"``
+        Sparsity patterns.
+    ``"kernels"``
+        The generated code of the cached kernels.
+
+    Meshes with the same name are reported together.  Matrices,
+    sparsities and kernels are reported under the mesh they are
+    defined on if known, and otherwise with the mesh name ``None``.
+    The estimates count the array data held by these objects, not
+    the Python objects, nor memory released to but not returned by
+    the allocator.
+    """
+    gc.collect()
+    usage = _local_usage()
+    local = {str(name): usage[name] for name in usage}
+    everyone = comm.allgather(local)
+    names = sorted(set().union(*everyone))
+
+    def stats(values):
+        values = numpy.asarray(values, dtype=float)
+        return {"min": values.min(), "max": values.max(), "mean": values.mean()}
+
+    report = {"meshes": {}, "categories": {}}
+    for name in names:
+        report["meshes"][name] = {c: stats([u.get(name, {}).get(c, 0) for u in everyone])
+                                  for c in categories}
+    for c in categories:
+        report["categories"][c] = stats([sum(u[name][c] for name in u) for u in everyone])
+    report["total"] = stats([sum(sum(v.values()) for v in u.values()) for u in everyone])
+
+    if verbose:
+        row = "%-24s %12s %12s %12s\n"
+        mib = 1024.0**2
+        lines = [row % ("", "min (MiB)", "max (MiB)", "mean (MiB)")]
+
+        def add(label, s):
+            lines.append(row % (label, "%.2f" % (s["min"]/mib),
+                                "%.2f" % (s["max"]/mib), "%.2f" % (s["mean"]/mib)))
+        for c in categories:
+            add(c, report["categories"][c])
+        add("total", report["total"])
+        for name in names:
+            lines.append("Mesh %s\n" % name)
+            for c in categories:
+                if report["meshes"][name][c]["max"] > 0:
+                    add("  " + c, report["meshes"][name][c])
+        PETSc.Sys.Print("".join(lines), comm=comm)
+    return report
+
+
+_memory_logging_level = None
+
+
+def set_memory_logging(level=INFO):
+    """Log the change in resident memory across assembly and solves.
+
+    :arg level: the logging level to log at, or ``None`` to turn the
+        logging off.
+
+    When turned on, every call to :func:`~.assemble` and
+    :func:`~.solve` logs the change in the resident set size of the
+    process across the call, and the resident set size after it.
+    Messages are logged with the ``firedrake`` logger, so may need
+    :func:`~.set_log_level` to be visible.
+    """
+    global _memory_logging_level
+    _memory_logging_level = level
+
+
+def _resident_bytes():
+    """Return the resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError):
+        # Peak, rather than current, usage.  Bytes on Mac OS, KiB
+        # elsewhere.
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
+
+def memory_hook(f):
+    """Decorator to log the change in memory across a function call.
+
+    See :func:`set_memory_logging`."""
+    def wrapper(f, *args, **kwargs):
+        if _memory_logging_level is None:
+            return f(*args, **kwargs)
+        before = _resident_bytes()
+        try:
+            return f(*args, **kwargs)
+        finally:
+            after = _resident_bytes()
+            log(_memory_logging_level, "%s: resident memory %+.2f MiB (now %.2f MiB)",
+                f.__name__, (after - before) / 1024.0**2, after / 1024.0**2)
+    return decorator(wrapper, f)
@@ -9,7 +9,7 @@ from ufl.classes import ReferenceGrad
 
 from pyop2.datatypes import IntType
 from pyop2 import op2
-from pyop2.mpi import COMM_WORLD, dup_comm, free_comm
+from pyop2.mpi import COMM_WORLD, COMM_SELF, dup_comm, free_comm
 from pyop2.profiling import timed_function, timed_region
 from pyop2.utils import as_tuple, tuplify
 
@@ -25,7 +25,8 @@ from firedrake.parameters import parameters
 from firedrake.petsc import PETSc
 
 
-__all__ = ['Mesh', 'ExtrudedMesh', 'SubDomainData', 'unmarked']
+__all__ = ['Mesh', 'ExtrudedMesh', 'SubDomainData', 'unmarked',
+           'write_partitioned_mesh']
 
 
 _cells = {
@@ -286,6 +287,241 @@ def _from_triangle(filename, dim, comm):
     return plex
 
 
+def _from_h5(filename, comm):
+    """Read a mesh saved with :meth:`MeshGeometry.save` from `filename`.
+
+    :arg comm: communicator to build the mesh on, must have the same
+        size as the one the mesh was saved on.
+    :returns: a 3-tuple of the distributed plex, the numbering data
+        (see :meth:`MeshTopology.save`) and the file attributes.  The
+        coordinate field values are included in the numbering data
+        under the key ``"coordinates"``.
+
+    Files written by :func:`write_partitioned_mesh` are also
+    accepted, in which case they are read in parallel (see
+    :func:`_from_partitioned_h5`), and the numbering data are
+    ``None``.
+    """
+    from firedrake.checkpointing import _open_h5file, _read_ragged
+
+    comm = dup_comm(comm)
+    if not os.path.exists(filename):
+        raise IOError("File '%s' does not exist, cannot be opened for reading" % filename)
+    with _open_h5file(filename, "r", comm) as h5file:
+        attrs = dict(h5file.attrs)
+        if attrs.get("firedrake_mesh_format") == "partitioned":
+            plex = _from_partitioned_h5(h5file, comm)
+            free_comm(comm)
+            return plex, None, attrs
+        if attrs.get("firedrake_mesh_format") != "distributed":
+            raise ValueError("File '%s' does not contain a saved Firedrake mesh" % filename)
+        if attrs["nprocs"] != comm.size:
+            raise ValueError("Process mismatch: written on %d, have %d" %
+                             (attrs["nprocs"], comm.size))
+
+        def read(path):
+            return _read_ragged(h5file, path, comm)
+
+        with timed_region("Mesh: load"):
+            dim = int(h5file["numbering"].attrs["dimension"])
+            (pStart, pEnd), = read("topology/chart")
+            plex = PETSc.DMPlex().create(comm=comm)
+            plex.setDimension(dim)
+            dag = tuple(read("topology/%s" % name).astype(IntType)
+                        for name in ("cone_sizes", "cones", "orientations",
+                                     "support_sizes", "supports"))
+            dmplex.set_dag(plex, pStart, pEnd, *dag)
+            for name in h5file["labels"].attrs["names"]:
+                name = name.decode()
+                dmplex.set_label_values(plex, name,
+                                        read("labels/%s/points" % name).astype(IntType),
+                                        read("labels/%s/values" % name).astype(IntType))
+            dmplex.set_vertex_coordinates(plex, read("topology/vertex_coordinates").astype(np.double))
+
+            (nroots, ), = read("sf/nroots")
+            sf = PETSc.SF().create(comm=comm)
+            sf.setGraph(nroots, read("sf/ilocal").astype(IntType),
+                        read("sf/iremote").astype(IntType).reshape(-1))
+            plex.setPointSF(sf)
+
+            numbering = {"reordered": h5file["numbering"].attrs["reordered"],
+                         "coordinates": read("coordinates")}
+            for name in ("renumbering", "entity_classes",
+                         "facet_ordering", "cell_closure"):
+                numbering[name] = read("numbering/%s" % name)
+    free_comm(comm)
+    return plex, numbering, attrs
+
+
+def _block(n, rank, size):
+    """Return the contiguous block of ``n`` entities read by a process.
+
+    :arg n: The total number of entities.
+    :arg rank: The rank of the process.
+    :arg size: The number of processes.
+    :returns: a 2-tuple of the first and one past the last entity.
+    """
+    return (n*rank) // size, (n*(rank + 1)) // size
+
+
+def _bisect(dset, value):
+    """Return the first index of a sorted dataset not less than ``value``.
+
+    :arg dset: a sorted one-dimensional h5py dataset.
+    :arg value: the value to look for.
+
+    Only O(log n) entries of the dataset are read."""
+    lo, hi = 0, dset.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if dset[mid] < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _from_partitioned_h5(h5file, comm):
+    """Read a mesh written by :func:`write_partitioned_mesh` in parallel.
+
+    :arg h5file: the open (parallel) h5py File.
+    :arg comm: communicator to build the mesh on.
+
+    Each process reads a contiguous block of the cells and the
+    vertices, and the plex is built with this naive distribution.  It
+    is repartitioned with a parallel partitioner when the mesh
+    topology is created, so the whole mesh is never held by a single
+    process.
+    """
+    with timed_region("Mesh: parallel read"):
+        tdim = int(h5file.attrs["topological_dimension"])
+        ncells = h5file["cells"].shape[0]
+        nvertices = h5file["coordinates"].shape[0]
+        cstart, cend = _block(ncells, comm.rank, comm.size)
+        vstart, vend = _block(nvertices, comm.rank, comm.size)
+        cells = np.ascontiguousarray(h5file["cells"][cstart:cend], dtype=np.int32)
+        coords = np.ascontiguousarray(h5file["coordinates"][vstart:vend], dtype=np.double)
+
+        plex, vertex_sf = dmplex.create_from_cell_list_parallel(comm, tdim, cells, coords)
+        # Processes only see part of the mesh, so we can't use
+        # DMPlexMarkBoundaryFaces.
+        dmplex.mark_exterior_facets(plex)
+
+        if "cell_markers" in h5file:
+            cStart, _ = plex.getHeightStratum(0)
+            markers = h5file["cell_markers"][cstart:cend]
+            marked, = np.nonzero(markers != unmarked)
+            dmplex.set_label_values(plex, dmplex.CELL_SETS_LABEL,
+                                    (marked + cStart).astype(IntType),
+                                    markers[marked].astype(IntType))
+
+        if "facets" in h5file:
+            # Facets are sorted by the cell they belong to, read those
+            # of our cells.
+            grp = h5file["facets"]
+            start = _bisect(grp["cells"], cstart)
+            end = _bisect(grp["cells"], cend)
+            facet_vertices = grp["vertices"][start:end]
+            markers = grp["markers"][start:end].astype(IntType)
+
+            # Global vertex number of each local vertex
+            _, ilocal, iremote = vertex_sf.getGraph()
+            iremote = np.asarray(iremote, dtype=IntType).reshape(-1, 2)
+            if ilocal is None:
+                ilocal = np.arange(iremote.shape[0], dtype=IntType)
+            starts = np.asarray([_block(nvertices, rank, comm.size)[0]
+                                 for rank in range(comm.size)], dtype=IntType)
+            global_vertices = np.empty(iremote.shape[0], dtype=IntType)
+            global_vertices[ilocal] = starts[iremote[:, 0]] + iremote[:, 1]
+            order = np.argsort(global_vertices)
+
+            vStart, _ = plex.getDepthStratum(0)
+            facets = np.empty(markers.shape, dtype=IntType)
+            for i, vertices in enumerate(facet_vertices):
+                local = order[np.searchsorted(global_vertices, vertices, sorter=order)]
+                facets[i] = plex.getJoin(local + vStart)[0]
+            dmplex.set_label_values(plex, dmplex.FACE_SETS_LABEL, facets, markers)
+    return plex
+
+
+def write_partitioned_mesh(meshfile, outfile, dim=None):
+    """Convert a mesh file into a file that can be read in parallel.
+
+    :arg meshfile: the mesh file to convert, in any format supported
+         by :func:`Mesh`.
+    :arg outfile: the name of the file to write (with extension
+         ``.h5``).
+    :arg dim: optional geometric dimension of the mesh (see
+         :func:`Mesh`).
+
+    The mesh is read in serial, and its cells, vertex coordinates,
+    cell markers and facet markers are written as plain HDF5
+    datasets.  Passing the resulting file to :func:`Mesh` reads it in
+    parallel, with every process reading only a contiguous block of
+    cells and vertices, so the mesh size is not limited by the
+    memory of a single process.  The script
+    ``firedrake-convert-mesh`` provides a command line interface.
+    """
+    import h5py
+
+    plex = _from_file(meshfile, dim, COMM_SELF)
+    tdim = plex.getDimension()
+    cStart, cEnd = plex.getHeightStratum(0)
+    vStart, vEnd = plex.getDepthStratum(0)
+    coords = dmplex.get_vertex_coordinates(plex)
+    if dim is not None:
+        coords = coords[:, :dim]
+
+    with h5py.File(outfile, "w") as h5file:
+        attrs = h5file.attrs
+        attrs["firedrake_mesh_format"] = "partitioned"
+        attrs["topological_dimension"] = tdim
+        attrs["geometric_dimension"] = coords.shape[1]
+        h5file.create_dataset("cells", data=dmplex.get_cell_vertices(plex))
+        h5file.create_dataset("coordinates", data=coords)
+
+        if plex.hasLabel(dmplex.CELL_SETS_LABEL):
+            points, values = dmplex.get_label_values(plex, dmplex.CELL_SETS_LABEL)
+            markers = np.full(cEnd - cStart, unmarked, dtype=IntType)
+            markers[points - cStart] = values
+            h5file.create_dataset("cell_markers", data=markers)
+
+        if plex.hasLabel(dmplex.FACE_SETS_LABEL):
+            points, values = dmplex.get_label_values(plex, dmplex.FACE_SETS_LABEL)
+            cells = np.asarray([plex.getSupport(f)[0] - cStart for f in points],
+                               dtype=IntType)
+            vertices = np.asarray([[p - vStart for p in plex.getTransitiveClosure(f)[0]
+                                    if vStart <= p < vEnd]
+                                   for f in points], dtype=np.int32)
+            order = np.argsort(cells, kind="mergesort")
+            grp = h5file.create_group("facets")
+            grp.create_dataset("cells", data=cells[order])
+            grp.create_dataset("vertices", data=vertices[order].reshape(len(points), -1))
+            grp.create_dataset("markers", data=values[order])
+
+
+def _from_file(meshfile, dim, comm):
+    """Read a mesh file into a DMPlex, dispatching on the extension.
+
+    :arg meshfile: the mesh file name.
+    :arg dim: the geometric dimension (only used for triangle files).
+    :arg comm: communicator to build the mesh on.
+    """
+    basename, ext = os.path.splitext(meshfile)
+
+    if ext.lower() in ['.e', '.exo']:
+        return _from_exodus(meshfile, comm)
+    elif ext.lower() == '.cgns':
+        return _from_cgns(meshfile, comm)
+    elif ext.lower() == '.msh':
+        return _from_gmsh(meshfile, comm)
+    elif ext.lower() == '.node':
+        return _from_triangle(meshfile, dim, comm)
+    else:
+        raise RuntimeError("Mesh file %s has unknown format '%s'."
+                           % (meshfile, ext[1:]))
+
+
 def _from_cell_list(dim, cells, coords, comm):
     """
     Create a DMPlex from a list of cells and coords.
@@ -320,18 +556,465 @@ def _from_cell_list(dim, cells, coords, comm):
     return plex
 
 
+def _from_distributed_cell_list(dim, cells, coords, comm):
+    """
+    Create a distributed DMPlex from distributed lists of cells and coords.
+
+    :arg dim: The topological dimension of the mesh
+    :arg cells: The vertices of this process' cells, as global vertex
+        numbers
+    :arg coords: The coordinates of this process' block of vertices,
+        the blocks being numbered contiguously in rank order
+    :arg comm: communicator to build the mesh on.
+
+    Unlike :func:`_from_cell_list`, no process holds the whole mesh.
+    The exterior facets are labelled, since they can't be identified
+    after distribution.
+    """
+    comm = dup_comm(comm)
+    # These types are /correct/, DMPlexCreateFromCellListParallel
+    # wants int and double (not PetscInt, PetscReal).
+    plex, _ = dmplex.create_from_cell_list_parallel(comm, dim,
+                                                    np.ascontiguousarray(cells, dtype=np.int32),
+                                                    np.ascontiguousarray(coords, dtype=np.double))
+    dmplex.mark_exterior_facets(plex)
+    free_comm(comm)
+    return plex
+
+
+def _interleave(q, bits):
+    """Interleave the bits of integer coordinates.
+
+    :arg q: an array of shape ``(npoints, dim)`` of unsigned integer
+        coordinates.
+    :arg bits: the number of bits in each coordinate.
+    :returns: an array of ``npoints`` keys, the first coordinate
+        providing the most significant bit of each group.
+    """
+    npoints, dim = q.shape
+    keys = np.zeros(npoints, dtype=np.uint64)
+    one = np.uint64(1)
+    for b in reversed(range(bits)):
+        for d in range(dim):
+            keys = (keys << one) | ((q[:, d] >> np.uint64(b)) & one)
+    return keys
+
+
+def _quantise(points, bits, bounds=None):
+    """Map points onto an integer grid covering their bounding box.
+
+    :arg points: an array of shape ``(npoints, dim)``.
+    :arg bits: the number of bits of the grid in each direction.
+    :arg bounds: optional 2-tuple of the lower and upper corners of
+        the box covered by the grid, defaults to the bounding box of
+        ``points``.
+    """
+    if bounds is None:
+        bounds = points.min(axis=0), points.max(axis=0)
+    lo, hi = bounds
+    extent = hi - lo
+    extent[extent == 0] = 1
+    q = (points - lo) / extent * ((1 << bits) - 1)
+    return q.astype(np.uint64)
+
+
+def _morton_keys(points, bounds=None):
+    """Return the position of points along a Morton (Z-order) curve.
+
+    :arg points: an array of shape ``(npoints, dim)``.
+    :arg bounds: optional 2-tuple of the lower and upper corners of
+        the box covered by the curve, defaults to the bounding box of
+        ``points``.
+    """
+    bits = 63 // points.shape[1]
+    return _interleave(_quantise(points, bits, bounds), bits)
+
+
+def _hilbert_keys(points, bounds=None):
+    """Return the position of points along a Hilbert curve.
+
+    :arg points: an array of shape ``(npoints, dim)``.
+    :arg bounds: optional 2-tuple of the lower and upper corners of
+        the box covered by the curve, defaults to the bounding box of
+        ``points``.
+
+    Uses the algorithm of J. Skilling, "Programming the Hilbert
+    curve", AIP Conf. Proc. 707 (2004), vectorised over points.
+    """
+    dim = points.shape[1]
+    bits = 63 // dim
+    X = _quantise(points, bits, bounds)
+    M = 1 << (bits - 1)
+    # Inverse undo excess work
+    Q = M
+    while Q > 1:
+        P = np.uint64(Q - 1)
+        for i in range(dim):
+            flip = (X[:, i] & np.uint64(Q)) != 0
+            X[flip, 0] ^= P
+            swap = ~flip
+            t = (X[swap, 0] ^ X[swap, i]) & P
+            X[swap, 0] ^= t
+            X[swap, i] ^= t
+        Q >>= 1
+    # Gray encode
+    for i in range(1, dim):
+        X[:, i] ^= X[:, i - 1]
+    t = np.zeros(X.shape[0], dtype=np.uint64)
+    Q = M
+    while Q > 1:
+        t[(X[:, dim - 1] & np.uint64(Q)) != 0] ^= np.uint64(Q - 1)
+        Q >>= 1
+    X ^= t[:, np.newaxis]
+    return _interleave(X, bits)
+
+
+def _cell_centroids(plex):
+    """Return the centroids of the cells of a plex, computed from the
+    plex vertex coordinates."""
+    coords = dmplex.get_vertex_coordinates(plex)
+    return coords[dmplex.get_cell_vertices(plex)].mean(axis=1)
+
+
+def _plex_reordering(plex, reorder):
+    """Compute a reordering of the plex points.
+
+    :arg plex: the (distributed) DMPlex.
+    :arg reorder: the reordering to apply, one of ``True`` or
+        ``"rcm"`` (reverse Cuthill-McKee), ``"hilbert"`` or
+        ``"morton"`` (sort cells along a space-filling curve through
+        their centroids), or a callable taking the plex and returning
+        an array giving the new order of the cells (numbered from
+        zero).
+    :returns: a reordering from reordered to original plex points, as
+        expected by :func:`dmplex.plex_renumbering`.
+
+    Only the order of the cells matters, since the remaining points
+    are numbered in the order they are first seen in a traversal of
+    the cells.
+    """
+    if reorder is True or reorder == "rcm":
+        old_to_new = plex.getOrdering(PETSc.Mat.OrderingType.RCM).indices
+        reordering = np.empty_like(old_to_new)
+        reordering[old_to_new] = np.arange(old_to_new.size, dtype=old_to_new.dtype)
+        return reordering
+
+    cStart, cEnd = plex.getHeightStratum(0)
+    if reorder == "hilbert":
+        cell_order = np.argsort(_hilbert_keys(_cell_centroids(plex)), kind="mergesort")
+    elif reorder == "morton":
+        cell_order = np.argsort(_morton_keys(_cell_centroids(plex)), kind="mergesort")
+    elif callable(reorder):
+        cell_order = np.asarray(reorder(plex))
+        if cell_order.shape != (cEnd - cStart, ):
+            raise ValueError("Cell reordering must have shape (%d, ), not %s"
+                             % (cEnd - cStart, cell_order.shape))
+    else:
+        raise ValueError("Unknown mesh reordering '%s'" % (reorder, ))
+    pStart, pEnd = plex.getChart()
+    reordering = np.arange(pStart, pEnd, dtype=IntType)
+    reordering[cStart:cEnd] = cStart + cell_order
+    return reordering
+
+
+def _cell_weights(plex, weights):
+    """Evaluate the partitioning weights of the cells of a plex.
+
+    :arg plex: the DMPlex.
+    :arg weights: the weights, see :func:`Mesh`.
+    :returns: an array with the weight of each cell.
+    """
+    cStart, cEnd = plex.getHeightStratum(0)
+    if callable(weights):
+        weights = weights(plex)
+    elif isinstance(weights, dict):
+        # Weights by cell subdomain
+        markers = weights
+        weights = np.ones(cEnd - cStart, dtype=np.double)
+        if plex.hasLabel(dmplex.CELL_SETS_LABEL):
+            points, values = dmplex.get_label_values(plex, dmplex.CELL_SETS_LABEL)
+            for marker, weight in markers.items():
+                weights[points[values == marker] - cStart] = weight
+    weights = np.asarray(weights, dtype=np.double)
+    if weights.shape != (cEnd - cStart, ):
+        raise ValueError("Partition weights must have shape (%d, ), not %s"
+                         % (cEnd - cStart, weights.shape))
+    return weights
+
+
+def _select_items(items, cumulative, targets, comm, nsamples=32):
+    """Find, for each target, the first item whose cumulative value
+    over all processes reaches it.
+
+    :arg items: this process' items, sorted (see
+        :func:`_curve_partition`).
+    :arg cumulative: the cumulative (non-decreasing) value of this
+        process' items, in the same order.
+    :arg targets: the values to reach, each at most the total value.
+    :arg comm: the communicator.
+    :arg nsamples: the number of items each process samples from
+        the interval bracketing each target in each round.
+    :returns: an array of the selected items (the same on every
+        process).
+
+    Each target is bracketed by an interval ``(lo, hi]`` of items,
+    with the value up to ``lo`` less than the target and the value up
+    to ``hi`` reaching it.  Every round, the processes sample their
+    items inside each interval, the samples are allgathered and their
+    cumulative values allreduced, and the intervals shrink to the
+    neighbouring samples.  This stops once every interval holds a
+    single item, after O(log(ncells) / log(nsamples * nprocs)) rounds.
+    """
+    from mpi4py import MPI
+
+    targets = np.asarray(targets, dtype=np.double)
+    ntargets = len(targets)
+    cumulative = np.concatenate(([0], cumulative)).astype(np.double)
+    # The last item reaches every target
+    hi = np.repeat(np.sort(np.concatenate(comm.allgather(items[-1:])))[-1:], ntargets)
+    lo = np.empty_like(hi)
+    has_lo = np.zeros(ntargets, dtype=bool)
+    while True:
+        start = np.where(has_lo, np.searchsorted(items, lo, side="right"), 0)
+        end = np.searchsorted(items, hi, side="right")
+        counts = np.empty_like(end)
+        comm.Allreduce(end - start, counts, op=MPI.SUM)
+        active = np.flatnonzero(counts > 1)
+        if len(active) == 0:
+            return hi
+        # Sample the items strictly inside the intervals
+        inside = np.searchsorted(items, hi, side="left")
+        samples = []
+        for i in active:
+            n = inside[i] - start[i]
+            k = min(n, nsamples)
+            samples.append(items[start[i] + (np.arange(k) * n) // max(k, 1)])
+        candidates = np.unique(np.concatenate(comm.allgather(np.concatenate(samples))))
+        values = np.empty(len(candidates), dtype=np.double)
+        comm.Allreduce(cumulative[np.searchsorted(items, candidates, side="right")],
+                       values, op=MPI.SUM)
+        # Items only compare through searchsorted
+        below_hi = np.searchsorted(candidates, hi, side="left")
+        above_lo = np.where(has_lo, np.searchsorted(candidates, lo, side="right"), 0)
+        for i in active:
+            j = np.searchsorted(values, targets[i], side="left")
+            if j < below_hi[i]:
+                hi[i] = candidates[j]
+            if j > above_lo[i]:
+                lo[i] = candidates[j - 1]
+                has_lo[i] = True
+
+
+def _curve_partition(keys, weights, nparts, comm):
+    """Cut a space-filling curve into pieces of equal weight.
+
+    :arg keys: the positions of this process' cells along the curve.
+    :arg weights: the weights of this process' cells.
+    :arg nparts: the number of pieces.
+    :arg comm: the communicator the cells are distributed over.
+    :returns: the piece of each of this process' cells.
+
+    Cells are ordered by their key, with ties broken by the global
+    cell number (in rank order), so that every cell has a distinct
+    position along the curve.  The splitters between the pieces are
+    found in parallel by :func:`_select_items`, so no process holds
+    more than its own cells.  Every piece gets at least one cell, as
+    long as there are at least ``nparts`` cells.
+    """
+    from mpi4py import MPI
+
+    ncells = len(keys)
+    offset = comm.exscan(ncells) or 0
+    items = np.empty(ncells, dtype=[("key", np.uint64), ("gid", np.int64)])
+    items["key"] = keys
+    items["gid"] = offset + np.arange(ncells)
+    order = np.argsort(items)
+    ordered = items[order]
+
+    total = comm.allreduce(float(np.sum(weights)))
+    targets = total * np.arange(1, nparts) / nparts
+    splitters = _select_items(ordered, np.cumsum(weights[order]), targets, comm)
+
+    # Every part gets at least one cell: move the splitters apart if
+    # heavy cells put several at the same position.
+    nglobal = comm.allreduce(ncells)
+    positions = np.empty(nparts - 1, dtype=np.int64)
+    comm.Allreduce(np.searchsorted(ordered, splitters, side="right").astype(np.int64),
+                   positions, op=MPI.SUM)
+    positions -= 1
+    adjusted = positions.copy()
+    for i in range(nparts - 1):
+        lower = adjusted[i - 1] + 1 if i > 0 else 0
+        adjusted[i] = min(max(adjusted[i], lower), nglobal - nparts + i)
+    moved = np.flatnonzero(adjusted != positions)
+    if len(moved):
+        splitters[moved] = _select_items(ordered, np.arange(1, ncells + 1),
+                                         adjusted[moved] + 1, comm)
+    return np.searchsorted(splitters, items, side="left")
+
+
+def _weighted_partition(plex, weights, comm):
+    """Partition the cells of a plex with given weights.
+
+    :arg plex: the DMPlex to partition (possibly already distributed).
+    :arg weights: the weights, see :func:`Mesh`.
+    :arg comm: the communicator of the plex.
+    :returns: a 2-tuple of the number of local cells sent to each
+        process and the cells to send, suitable for a shell
+        partitioner.
+
+    The cells are sorted along a Hilbert curve through their
+    centroids, and the curve is cut into pieces of equal total
+    weight (see :func:`_curve_partition`).  This produces compact
+    parts that balance the weights, at the cost of a somewhat larger
+    edge cut than a graph partitioner.
+    """
+    from mpi4py import MPI
+
+    cStart, cEnd = plex.getHeightStratum(0)
+    weights = _cell_weights(plex, weights)
+    if cEnd > cStart:
+        centroids = _cell_centroids(plex)
+    else:
+        centroids = np.empty((0, plex.getCoordinateDim()), dtype=np.double)
+    lo = np.full(centroids.shape[1], np.inf)
+    hi = np.full(centroids.shape[1], -np.inf)
+    comm.Allreduce(centroids.min(axis=0, initial=np.inf), lo, op=MPI.MIN)
+    comm.Allreduce(centroids.max(axis=0, initial=-np.inf), hi, op=MPI.MAX)
+    keys = _hilbert_keys(centroids, bounds=(lo, hi))
+
+    nparts = comm.size
+    parts = _curve_partition(keys, weights, nparts, comm)
+    sizes = np.bincount(parts, minlength=nparts).astype(IntType)
+    points = (cStart + np.argsort(parts, kind="mergesort")).astype(IntType)
+    return sizes, points
+
+
+class SharedDataCache(defaultdict):
+    """The cache of data shared between function spaces on a mesh.
+
+    Maps the kind of data (the name of the function computing it, see
+    :mod:`firedrake.functionspacedata`) to a dict of cached values.
+    Also records the hits and misses of each kind of cache, and how
+    many live :class:`~.FunctionSpaceData` objects use each entry, so
+    that unused entries can be evicted.
+    """
+    def __init__(self):
+        super(SharedDataCache, self).__init__(dict)
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+        self.users = defaultdict(int)
+
+    def acquire(self, entries):
+        """Record that entries are in use.
+
+        :arg entries: an iterable of ``(kind, key)`` pairs.
+        """
+        for entry in entries:
+            self.users[entry] += 1
+
+    def release(self, entries):
+        """Record that entries are no longer in use.
+
+        :arg entries: an iterable of ``(kind, key)`` pairs.
+        """
+        for entry in entries:
+            self.users[entry] -= 1
+            if self.users[entry] == 0:
+                del self.users[entry]
+
+    def in_use(self, kind, key):
+        """Is a cache entry in use?
+
+        :arg kind: the kind of cache.
+        :arg key: the key of the entry.
+
+        Entries are in use if a live :class:`~.FunctionSpaceData`
+        refers to them, or if they are work function caches with
+        checked out work functions.
+        """
+        if self.users.get((kind, key), 0) > 0:
+            return True
+        if kind == "get_work_function_cache":
+            return any(self[kind][key].values())
+        return False
+
+    @property
+    def kinds(self):
+        """The kinds of cache with statistics, which are the ones that
+        can be evicted."""
+        return sorted(set(self.hits) | set(self.misses))
+
+    def info(self):
+        """Return the statistics of the caches.
+
+        :returns: a dict mapping each kind of cache to a dict with
+            keys ``"hits"``, ``"misses"``, ``"entries"``,
+            ``"in_use"`` (the number of entries in use) and
+            ``"nbytes"`` (an estimate of the array data held by the
+            entries, see :func:`~.memory_report`).
+        """
+        from firedrake.memory import _nbytes
+        info = {}
+        for kind in self.kinds:
+            cache = self.get(kind, {})
+            info[kind] = {"hits": self.hits[kind],
+                          "misses": self.misses[kind],
+                          "entries": len(cache),
+                          "in_use": sum(self.in_use(kind, key) for key in cache),
+                          "nbytes": _nbytes(cache, set())}
+        return info
+
+    def evict(self, kind=None):
+        """Evict the entries which are not in use.
+
+        :arg kind: the kind of cache to evict entries from, an
+            iterable of kinds, or ``None`` for all of them.
+        :returns: the number of entries evicted.
+        :raises ValueError: if a kind of cache is unknown.
+        """
+        if kind is None:
+            kinds = self.kinds
+        else:
+            kinds = as_tuple(kind)
+            unknown = set(kinds) - set(self.kinds)
+            if unknown:
+                raise ValueError("Unknown shared data caches %s, not one of %s" %
+                                 (sorted(unknown), self.kinds))
+        nevicted = 0
+        for kind in kinds:
+            cache = self.get(kind, {})
+            for key in list(cache):
+                if not self.in_use(kind, key):
+                    del cache[key]
+                    nevicted += 1
+        return nevicted
+
+
 class MeshTopology(object):
     """A representation of mesh topology."""
 
     @timed_function("CreateMesh")
-    def __init__(self, plex, name, reorder, distribute):
+    def __init__(self, plex, name, reorder, distribute, numbering=None,
+                 partition_weights=None):
         """Half-initialise a mesh topology.
 
         :arg plex: :class:`DMPlex` representing the mesh topology
         :arg name: name of the mesh
-        :arg reorder: whether to reorder the mesh (bool)
+        :arg reorder: whether to reorder the mesh, either a bool or
+             a reordering accepted by :func:`_plex_reordering`
         :arg distribute: whether to distribute the mesh to parallel processes
+        :arg numbering: (optional) the numbering data of a mesh
+             topology previously saved with :meth:`save`, in which
+             case ``plex`` must be the saved plex (already
+             distributed, with grown halos, and labelled).  Partitioning,
+             reordering and renumbering are then skipped, and
+             ``reorder`` and ``distribute`` are ignored.
+        :arg partition_weights: (optional) cell weights used to
+             partition the mesh, see :func:`Mesh`.
         """
+        if partition_weights is not None and not isinstance(distribute, bool):
+            raise ValueError("Cannot give both partition weights and an explicit partition")
         # Do some validation of the input mesh
         dmplex.validate_mesh(plex)
         utils._init()
@@ -341,7 +1024,7 @@ class MeshTopology(object):
         self.comm = dup_comm(plex.comm.tompi4py())
 
         # A cache of shared function space data on this mesh
-        self._shared_data_cache = defaultdict(dict)
+        self._shared_data_cache = SharedDataCache()
 
         # Cell subsets for integration over subregions
         self._subsets = {}
@@ -349,8 +1032,14 @@ class MeshTopology(object):
         # Note.  This must come before distribution, because otherwise
         # DMPlex will consider facets on the domain boundary to be
         # exterior, which is wrong.
-        label_boundary = (self.comm.size == 1) or distribute
-        dmplex.label_facets(plex, label_boundary=label_boundary)
+        if numbering is not None:
+            # Facets are already labelled and the plex distributed.
+            distribute = False
+        else:
+            # Parallel readers label the exterior facets themselves
+            label_boundary = ((self.comm.size == 1) or distribute) and \
+                not plex.hasLabel("exterior_facets")
+            dmplex.label_facets(plex, label_boundary=label_boundary)
 
         # Distribute the dm to all ranks
         if self.comm.size > 1 and distribute:
@@ -358,9 +1047,16 @@ class MeshTopology(object):
             # refine this mesh in parallel.  Later, when we actually use
             # it, we grow the halo.
             partitioner = plex.getPartitioner()
-            if IntType.itemsize == 8:
-                # Default to Parmetis on 64bit ints (Chaco is 32 bit int only)
+            cStart, cEnd = plex.getHeightStratum(0)
+            already_distributed = self.comm.allreduce(int(cEnd > cStart)) > 1
+            if IntType.itemsize == 8 or already_distributed:
+                # Default to Parmetis on 64bit ints (Chaco is 32 bit
+                # int only), and for meshes read in parallel (Chaco is
+                # serial only)
                 partitioner.setType(partitioner.Type.PARMETIS)
+            if partition_weights is not None:
+                with timed_region("Mesh: weighted partition"):
+                    distribute = _weighted_partition(plex, partition_weights, self.comm)
             try:
                 sizes, points = distribute
                 partitioner.setType(partitioner.Type.SHELL)
@@ -383,6 +1079,10 @@ class MeshTopology(object):
         def callback(self):
             """Finish initialisation."""
             del self._callback
+            if numbering is not None:
+                self._grown_halos = True
+                self._load_numbering(numbering)
+                return
             if self.comm.size > 1 and distribute:
                 dmplex.set_adjacency_callback(self._plex)
                 self._plex.distributeOverlap(1)
@@ -391,9 +1091,7 @@ class MeshTopology(object):
 
             if reorder:
                 with timed_region("Mesh: reorder"):
-                    old_to_new = self._plex.getOrdering(PETSc.Mat.OrderingType.RCM).indices
-                    reordering = np.empty_like(old_to_new)
-                    reordering[old_to_new] = np.arange(old_to_new.size, dtype=old_to_new.dtype)
+                    reordering = _plex_reordering(self._plex, reorder)
             else:
                 # No reordering
                 reordering = None
@@ -406,22 +1104,93 @@ class MeshTopology(object):
                 self._plex_renumbering = dmplex.plex_renumbering(self._plex,
                                                                  self._entity_classes,
                                                                  reordering)
-
-                # Derive a cell numbering from the Plex renumbering
+                self._create_numberings()
                 entity_dofs = np.zeros(dim+1, dtype=IntType)
-                entity_dofs[-1] = 1
-
-                self._cell_numbering = self.create_section(entity_dofs)
-                entity_dofs[:] = 0
-                entity_dofs[0] = 1
-                self._vertex_numbering = self.create_section(entity_dofs)
-
-                entity_dofs[:] = 0
                 entity_dofs[-2] = 1
                 facet_numbering = self.create_section(entity_dofs)
                 self._facet_ordering = dmplex.get_facet_ordering(self._plex, facet_numbering)
         self._callback = callback
 
+    def _create_numberings(self):
+        """Derive cell and vertex numberings from the Plex renumbering."""
+        entity_dofs = np.zeros(self._plex.getDimension()+1, dtype=IntType)
+        entity_dofs[-1] = 1
+        self._cell_numbering = self.create_section(entity_dofs)
+        entity_dofs[:] = 0
+        entity_dofs[0] = 1
+        self._vertex_numbering = self.create_section(entity_dofs)
+
+    def _load_numbering(self, numbering):
+        """Set the Firedrake numbering from saved data.
+
+        :arg numbering: a dict of numbering data, see :meth:`save`.
+        """
+        with timed_region("Mesh: numbering"):
+            self._did_reordering = bool(numbering["reordered"])
+            self._entity_classes = numbering["entity_classes"].astype(int)
+            self._plex_renumbering = PETSc.IS().createGeneral(numbering["renumbering"].astype(IntType),
+                                                              comm=self._plex.comm)
+            self._create_numberings()
+            self._facet_ordering = numbering["facet_ordering"].astype(IntType)
+            # Cached property, computing it is expensive.
+            self.__dict__["cell_closure"] = numbering["cell_closure"].astype(IntType)
+
+    def save(self, h5file):
+        """Save the distributed mesh topology.
+
+        :arg h5file: an open (parallel) h5py File to write to.
+
+        This stores the local plex (including the halo), the point SF,
+        the labels, and the derived Firedrake numberings (cell
+        closures, facet ordering, entity classes), such that a mesh
+        topology loaded from it on the same number of processes is
+        identical, without partitioning or renumbering.  Must be
+        called collectively.  Use :meth:`MeshGeometry.save` to save a
+        complete mesh.
+        """
+        from firedrake.checkpointing import _write_ragged
+        self.init()
+        plex = self._plex
+        comm = self.comm
+        pStart, pEnd = plex.getChart()
+        _write_ragged(h5file, "topology/chart", np.asarray([[pStart, pEnd]], dtype=IntType), comm)
+        dag = dmplex.get_dag(plex)
+        for name, data in zip(("cone_sizes", "cones", "orientations",
+                               "support_sizes", "supports"), dag):
+            _write_ragged(h5file, "topology/%s" % name, data, comm)
+
+        nroots, ilocal, iremote = plex.getPointSF().getGraph()
+        iremote = np.asarray(iremote, dtype=IntType).reshape(-1, 2)
+        if ilocal is None:
+            ilocal = np.arange(iremote.shape[0], dtype=IntType)
+        _write_ragged(h5file, "sf/nroots", np.asarray([nroots], dtype=IntType), comm)
+        _write_ragged(h5file, "sf/ilocal", np.asarray(ilocal, dtype=IntType), comm)
+        _write_ragged(h5file, "sf/iremote", iremote, comm)
+
+        names = sorted(set().union(*comm.allgather(set(plex.getLabelName(i)
+                                                       for i in range(plex.getNumLabels())))))
+        names = [name for name in names if name not in ("depth", "celltype")]
+        h5file.require_group("labels").attrs["names"] = np.asarray(names, dtype="S")
+        for name in names:
+            if plex.hasLabel(name):
+                points, values = dmplex.get_label_values(plex, name)
+            else:
+                points = values = np.empty(0, dtype=IntType)
+            _write_ragged(h5file, "labels/%s/points" % name, points, comm)
+            _write_ragged(h5file, "labels/%s/values" % name, values, comm)
+
+        _write_ragged(h5file, "topology/vertex_coordinates",
+                      dmplex.get_vertex_coordinates(plex), comm)
+
+        _write_ragged(h5file, "numbering/renumbering", self._plex_renumbering.indices, comm)
+        _write_ragged(h5file, "numbering/entity_classes",
+                      np.asarray(self._entity_classes, dtype=IntType), comm)
+        _write_ragged(h5file, "numbering/facet_ordering", self._facet_ordering, comm)
+        _write_ragged(h5file, "numbering/cell_closure", self.cell_closure, comm)
+        attrs = h5file["numbering"].attrs
+        attrs["reordered"] = self._did_reordering
+        attrs["dimension"] = plex.getDimension()
+
     layers = None
     """No layers on unstructured mesh"""
 
@@ -653,6 +1422,27 @@ class MeshTopology(object):
         size = list(self._entity_classes[self.cell_dimension(), :])
         return op2.Set(size, "Cells", comm=self.comm)
 
+    def cache_info(self):
+        """Return the statistics of the caches of data shared between
+        function spaces on this mesh.
+
+        See :meth:`SharedDataCache.info`."""
+        return self._shared_data_cache.info()
+
+    def clear_caches(self, kind=None):
+        """Evict unused data shared between function spaces on this mesh.
+
+        :arg kind: the kind of cache to evict entries from (see
+            :meth:`cache_info`), an iterable of kinds, or ``None`` for
+            all of them.
+        :returns: the number of entries evicted.
+
+        Only entries not used by any live :class:`~.FunctionSpace`
+        are evicted.  They are recomputed if a function space needing
+        them is created again.
+        """
+        return self._shared_data_cache.evict(kind)
+
     def cell_subset(self, subdomain_id, all_integer_subdomain_ids=None):
         """Return a subset over cells with the given subdomain_id.
 
@@ -745,7 +1535,7 @@ class ExtrudedMeshTopology(MeshTopology):
         Citations().register("McRae2016")
         Citations().register("Bercea2016")
         # A cache of shared function space data on this mesh
-        self._shared_data_cache = defaultdict(dict)
+        self._shared_data_cache = SharedDataCache()
 
         mesh.init()
         self._base_mesh = mesh
@@ -901,13 +1691,79 @@ class ExtrudedMeshTopology(MeshTopology):
         """
         return (self._base_mesh.facet_dimension(), 1)
 
+    @utils.cached_property
+    def max_cell_layers(self):
+        """The maximum number of cell layers in any column on this process.
+
+        Point location numbers the cells of an extruded mesh as
+        ``column*max_cell_layers + layer``, where ``layer`` counts
+        from the bottom of the column."""
+        if self.variable_layers:
+            layers = self.cell_set.layers_array
+            if len(layers) == 0:
+                return 1
+            return int((layers[:, 1] - layers[:, 0]).max()) - 1
+        else:
+            return self.layers - 1
+
+    @utils.cached_property
+    def _uniform_cell_set(self):
+        """An extruded set over the base mesh cells with
+        :attr:`max_cell_layers` cells in every column."""
+        return op2.ExtrudedSet(self.cell_set.parent, layers=self.max_cell_layers + 1)
+
     def _order_data_by_cell_index(self, column_list, cell_data):
+        if self.variable_layers:
+            # Pad columns to max_cell_layers, with NaN in the missing cells
+            nlayers = self.max_cell_layers
+            layers = self.cell_set.layers_array
+            cell_layers = layers[:len(column_list), 1] - layers[:len(column_list), 0] - 1
+            cell_list = np.full((len(column_list), nlayers), -1, dtype=IntType)
+            for i, (col, n) in enumerate(zip(column_list, cell_layers)):
+                cell_list[i, :n] = np.arange(col, col + n)
+            cell_list = cell_list.reshape(-1)
+            data = cell_data[cell_list]
+            data[cell_list < 0] = np.nan
+            return data
         cell_list = []
         for col in column_list:
             cell_list += list(range(col, col + (self.layers - 1)))
         return cell_data[cell_list]
 
 
+class _geometry_cached_property(object):
+    """A cached property of a :class:`MeshGeometry` that depends on
+    the coordinate values.
+
+    The value is computed lazily, and recomputed on access if the
+    :attr:`~MeshGeometry.coordinates_version` of the mesh has changed
+    since it was computed.  Caches derived from the mesh topology
+    only should use :func:`~.utils.cached_property` instead."""
+
+    def __init__(self, fget):
+        self.fget = fget
+        self.__name__ = fget.__name__
+        self.__doc__ = fget.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        cache = obj.__dict__.setdefault("_geometry_cache", {})
+        version = obj.coordinates_version
+        try:
+            cached_version, value = cache[self.__name__]
+            if cached_version == version:
+                return value
+        except KeyError:
+            pass
+        value = self.fget(obj)
+        cache[self.__name__] = (version, value)
+        return value
+
+    def __delete__(self, obj):
+        obj.__dict__.get("_geometry_cache", {}).pop(self.__name__, None)
+
+
 class MeshGeometry(ufl.Mesh):
     """A representation of mesh topology and geometry."""
 
@@ -932,6 +1788,7 @@ class MeshGeometry(ufl.Mesh):
         coordinates._as_mesh_geometry = weakref.ref(self)
 
         self._coordinates = coordinates
+        self._coordinates_version = 0
 
     def init(self):
         """Finish the initialisation of the mesh.  Most of the time
@@ -970,6 +1827,36 @@ class MeshGeometry(ufl.Mesh):
         """The :class:`.Function` containing the coordinates of this mesh."""
         return self._coordinates_function
 
+    @property
+    def coordinates_version(self):
+        """A counter incremented whenever the coordinate values change.
+
+        Caches depending on the coordinate values (the
+        :attr:`spatial_index`, cell bounding boxes,
+        :meth:`cell_orientations` and :meth:`geometric_quantity`
+        fields) are recomputed when they are next
+        used after the counter changes, while caches depending only on
+        the mesh topology (maps, sparsities, ...) are unaffected.  The
+        counter is incremented by :meth:`~.Function.assign`,
+        :meth:`~.Function.interpolate`, :meth:`~.Function.project` and
+        the augmented assignment operators on the :attr:`coordinates`.
+        If the coordinate values are changed in another way, for
+        example by writing to ``mesh.coordinates.dat.data``, call
+        :meth:`notify_coordinates_changed`."""
+        self.init()
+        return self._coordinates_version
+
+    def notify_coordinates_changed(self):
+        """Record that the coordinate values of this mesh have changed.
+
+        See :attr:`coordinates_version`."""
+        self.init()
+        self._coordinates_version += 1
+        if hasattr(self, "_cell_orientations_expr"):
+            # Assembly callables hold the orientation Dat, so refresh
+            # it in place now rather than when it is next asked for.
+            self._oriented_cells
+
     @coordinates.setter
     def coordinates(self, value):
         message = """Cannot re-assign the coordinates.
@@ -981,28 +1868,84 @@ values from f.)"""
 
         raise AttributeError(message)
 
+    def save(self, filename):
+        """Save the distributed mesh to a file.
+
+        :arg filename: the name of the file to write, the extension
+             should be ``.h5``.
+
+        The already distributed and renumbered mesh is stored in
+        parallel HDF5, along with the coordinate field.  Reading the
+        file with :func:`Mesh` on the same number of processes then
+        restores the mesh without partitioning or renumbering it.
+        Must be called collectively.
+
+        .. note::
+
+           Extruded meshes cannot be saved, save the base mesh
+           instead and extrude it after loading.
+        """
+        from firedrake.checkpointing import _open_h5file, _write_ragged
+        if isinstance(self.topology, ExtrudedMeshTopology):
+            raise NotImplementedError("Saving extruded meshes not supported, save the base mesh instead")
+        self.init()
+        element = self.coordinates.ufl_element()
+        with _open_h5file(filename, "w", self.comm) as h5file:
+            attrs = h5file.attrs
+            attrs["firedrake_mesh_format"] = "distributed"
+            attrs["nprocs"] = self.comm.size
+            attrs["name"] = self.name
+            attrs["geometric_dimension"] = self.geometric_dimension()
+            attrs["coordinate_family"] = element.family()
+            attrs["coordinate_degree"] = element.degree()
+            self.topology.save(h5file)
+            _write_ragged(h5file, "coordinates", self.coordinates.dat.data_ro_with_halos, self.comm)
+
     def clear_spatial_index(self):
         """Reset the :attr:`spatial_index` on this mesh geometry.
 
-        Use this if you move the mesh (for example by reassigning to
-        the coordinate field)."""
-        try:
-            del self.spatial_index
-        except AttributeError:
-            pass
+        The spatial index is recomputed automatically when the
+        :attr:`coordinates_version` changes, so this is only needed
+        if the coordinate values were changed without notifying the
+        mesh (see :meth:`notify_coordinates_changed`)."""
+        del self.spatial_index
+        del self._cell_bounding_boxes
 
-    @utils.cached_property
+    @_geometry_cached_property
     def spatial_index(self):
         """Spatial index to quickly find which cell contains a given point."""
 
-        from firedrake import function, functionspace
-        from firedrake.parloops import par_loop, READ, RW
-
         gdim = self.ufl_cell().geometric_dimension()
         if gdim <= 1:
             info_red("libspatialindex does not support 1-dimension, falling back on brute force.")
             return None
 
+        coords_min, coords_max = self._cell_bounding_boxes
+
+        # Build spatial index, leaving out the missing cells of
+        # variable layer columns.
+        valid = np.isfinite(coords_min).all(axis=1)
+        if valid.all():
+            return spatialindex.from_regions(coords_min, coords_max)
+        return spatialindex.from_regions(np.ascontiguousarray(coords_min[valid]),
+                                         np.ascontiguousarray(coords_max[valid]),
+                                         ids=np.flatnonzero(valid))
+
+    @_geometry_cached_property
+    def _cell_bounding_boxes(self):
+        """The bounding boxes of the cells.
+
+        A 2-tuple of arrays of the lower and upper corners of the
+        bounding box of each cell, ordered by cell index.  On meshes
+        with variable layers, the rows for the cells missing from
+        columns with fewer than
+        :attr:`~ExtrudedMeshTopology.max_cell_layers` are NaN."""
+
+        from firedrake import function, functionspace
+        from firedrake.parloops import par_loop, READ, RW
+
+        gdim = self.ufl_cell().geometric_dimension()
+
         # Calculate the bounding boxes for all cells by running a kernel
         V = functionspace.VectorFunctionSpace(self, "DG", 0, dim=gdim)
         coords_min = function.Function(V)
@@ -1034,9 +1977,7 @@ values from f.)"""
         column_list = V.cell_node_list.reshape(-1)
         coords_min = self._order_data_by_cell_index(column_list, coords_min.dat.data_ro_with_halos)
         coords_max = self._order_data_by_cell_index(column_list, coords_max.dat.data_ro_with_halos)
-
-        # Build spatial index
-        return spatialindex.from_regions(coords_min, coords_max)
+        return coords_min, coords_max
 
     def locate_cell(self, x, tolerance=None):
         """Locate cell containg given point.
@@ -1044,9 +1985,11 @@ values from f.)"""
         :arg x: point coordinates
         :kwarg tolerance: for checking if a point is in a cell.
         :returns: cell number (int), or None (if the point is not in the domain)
+
+        On extruded meshes, the cell number is
+        ``column*max_cell_layers + layer`` (see
+        :attr:`~ExtrudedMeshTopology.max_cell_layers`).
         """
-        if self.variable_layers:
-            raise NotImplementedError("Cell location not implemented for variable layers")
         x = np.asarray(x, dtype=np.float)
         cell = self._c_locator(tolerance=tolerance)(self.coordinates._ctypes,
                                                     x.ctypes.data_as(ctypes.POINTER(ctypes.c_double)))
@@ -1109,8 +2052,6 @@ values from f.)"""
         if isinstance(expr, expression.Expression):
             if expr.value_shape()[0] != 3:
                 raise NotImplementedError('Only implemented for 3-vectors')
-
-            expr = interpolate(expr, functionspace.VectorFunctionSpace(self, 'DG', 0))
         elif isinstance(expr, ufl.classes.Expr):
             if expr.ufl_shape != (3,):
                 raise NotImplementedError('Only implemented for 3-vectors')
@@ -1118,13 +2059,131 @@ values from f.)"""
             raise TypeError("UFL expression or Expression object expected!")
 
         fs = functionspace.FunctionSpace(self, 'DG', 0)
+        self._cell_orientations_expr = expr
+        self.topology._cell_orientations = function.Function(fs, name="cell_orientations",
+                                                             dtype=np.int32)
+        # Compute them now
+        self._oriented_cells
+
+    def cell_orientations(self):
+        """Return the orientation of each cell in the mesh.
+
+        Use :meth:`init_cell_orientations` to initialise.  The
+        orientations are recomputed, in place, whenever the
+        coordinates change (see :attr:`coordinates_version`), so
+        assembly callables holding them stay valid."""
+        self.topology.cell_orientations()
+        return self._oriented_cells
+
+    @_geometry_cached_property
+    def _oriented_cells(self):
+        """The cell orientations, computed from the expression passed
+        to :meth:`init_cell_orientations`."""
+        import firedrake.function as function
+        import firedrake.functionspace as functionspace
+
+        expr = self._cell_orientations_expr
+        if isinstance(expr, expression.Expression):
+            expr = interpolate(expr, functionspace.VectorFunctionSpace(self, 'DG', 0))
+
+        cell_orientations = self.topology._cell_orientations
+        fs = cell_orientations.function_space()
         x = ufl.SpatialCoordinate(self)
         f = function.Function(fs)
         f.interpolate(ufl.dot(expr, ufl.cross(ReferenceGrad(x)[:, 0], ReferenceGrad(x)[:, 1])))
-
-        cell_orientations = function.Function(fs, name="cell_orientations", dtype=np.int32)
         cell_orientations.dat.data[:] = (f.dat.data_ro < 0)
-        self.topology._cell_orientations = cell_orientations
+        return cell_orientations
+
+    @property
+    def static_geometry(self):
+        """Is the geometry of this mesh static?
+
+        If ``True``, forms assembled on this mesh have the geometric
+        quantities supported by :meth:`geometric_quantity` replaced by
+        precomputed fields, rather than recomputing them in every
+        kernel.  The fields are recomputed when the coordinates change
+        (see :attr:`coordinates_version`), but forms that have
+        already been compiled, for example inside a solver, keep
+        using the values from when they were compiled.  Defaults to
+        ``False``."""
+        return self.__dict__.get("_static_geometry", False)
+
+    @static_geometry.setter
+    def static_geometry(self, value):
+        self._static_geometry = bool(value)
+
+    def has_geometric_quantity(self, name):
+        """Can :meth:`geometric_quantity` precompute a quantity on this mesh?
+
+        :arg name: the name of the quantity, see
+            :meth:`geometric_quantity`."""
+        if name == "cell_volume":
+            return True
+        elif name == "facet_area":
+            return self.ufl_cell().is_simplex()
+        elif name in {"circumradius", "jacobian", "jacobian_inverse",
+                      "jacobian_determinant"}:
+            return self.is_piecewise_linear_simplex_domain()
+        return False
+
+    def geometric_quantity(self, name):
+        """Return a field of precomputed values of a geometric quantity.
+
+        :arg name: the name of the quantity, one of ``"cell_volume"``,
+            ``"facet_area"``, ``"circumradius"``, ``"jacobian"``,
+            ``"jacobian_inverse"`` and ``"jacobian_determinant"`` (the
+            handler names of the corresponding UFL classes).
+        :returns: a :class:`.Function`.  The cell quantities are
+            piecewise constant, the facet area lives in the lowest
+            order ``"HDiv Trace"`` space.
+
+        The Jacobians and circumradius are only constant on affine
+        simplex meshes, and facet areas are only supported on simplex
+        meshes, see :meth:`has_geometric_quantity`.  The field is
+        computed the first time it is requested, and recomputed, in
+        place, when it is next requested after the coordinates change.
+        """
+        import firedrake.function as function
+        import firedrake.functionspace as functionspace
+        from firedrake.assemble import assemble
+
+        if not self.has_geometric_quantity(name):
+            raise NotImplementedError("Cannot precompute %s on this mesh" % name)
+
+        cache = self.__dict__.setdefault("_geometric_quantities", {})
+        version = self.coordinates_version
+        try:
+            cached_version, f = cache[name]
+            if cached_version == version:
+                return f
+        except KeyError:
+            f = None
+
+        if name == "cell_volume":
+            if f is None:
+                f = function.Function(functionspace.FunctionSpace(self, "DG", 0), name=name)
+            v = ufl.TestFunction(f.function_space())
+            assemble(v*ufl.dx(domain=self), tensor=f)
+        elif name == "facet_area":
+            if f is None:
+                f = function.Function(functionspace.FunctionSpace(self, "HDiv Trace", 0), name=name)
+            v = ufl.TestFunction(f.function_space())
+            assemble(v('+')*ufl.dS(domain=self) + v*ufl.ds(domain=self), tensor=f)
+        else:
+            expr = {"circumradius": ufl.Circumradius,
+                    "jacobian": ufl.Jacobian,
+                    "jacobian_inverse": ufl.JacobianInverse,
+                    "jacobian_determinant": ufl.JacobianDeterminant}[name](self)
+            if f is None:
+                if expr.ufl_shape:
+                    V = functionspace.TensorFunctionSpace(self, "DG", 0,
+                                                          shape=expr.ufl_shape)
+                else:
+                    V = functionspace.FunctionSpace(self, "DG", 0)
+                f = function.Function(V, name=name)
+            f.interpolate(expr)
+        cache[name] = (version, f)
+        return f
 
     def __getattr__(self, name):
         return getattr(self._topology, name)
@@ -1176,11 +2235,33 @@ def Mesh(meshfile, **kwargs):
     :param reorder: optional flag indicating whether to reorder
            meshes for better cache locality.  If not supplied the
            default value in ``parameters["reorder_meshes"]``
-           is used.
+           is used.  Besides ``True`` (equivalent to ``"rcm"``) and
+           ``False``, may be one of ``"rcm"`` (reverse
+           Cuthill-McKee ordering of the mesh graph), ``"hilbert"``
+           or ``"morton"`` (ordering the cells along a Hilbert or
+           Morton space-filling curve through their centroids), or a
+           callable taking the :class:`DMPlex` and returning the new
+           order of its cells, as an array of cell numbers counted
+           from zero.
     :param distribute: should the mesh be distributed.  May be
            ``None`` (use the default choice), ``False`` (do not)
            ``True`` (do), or a 2-tuple that specifies a partitioning
            of the cells (only really useful for debugging).
+    :param partition_weights: optional weights of the cells, used to
+           balance the cost of the cells between processes when the
+           mesh is distributed.  May be an array with the weight of
+           each cell of the (undistributed) input mesh on this
+           process, in plex order, a dict mapping cell subdomain ids
+           to weights (unmarked cells have weight 1), or a callable
+           taking the :class:`DMPlex` and returning the array of
+           weights.  For example, the cost of a cell of an extruded
+           mesh with variable layers is proportional to its number
+           of layers.  The cells are then partitioned by cutting a
+           Hilbert curve through the cell centroids into pieces of
+           equal weight.  If not supplied, the default (graph)
+           partitioner is used, with all cells weighted equally.
+           Cannot be combined with a partitioning given by
+           ``distribute``.
     :param comm: the communicator to use when creating the mesh.  If
            not supplied, then the mesh will be created on COMM_WORLD.
            Ignored if ``meshfile`` is a DMPlex object (in which case
@@ -1194,6 +2275,15 @@ def Mesh(meshfile, **kwargs):
     * Exodus: with extension `.e`, `.exo`
     * CGNS: with extension `.cgns`
     * Triangle: with extension `.node`
+    * Firedrake: with extension `.h5`, either
+
+      - a mesh previously written with :meth:`MeshGeometry.save`.
+        The mesh must be loaded on the same number of processes as
+        it was saved on, and is restored without partitioning or
+        renumbering (``reorder`` and ``distribute`` are ignored); or
+      - a mesh written with :func:`write_partitioned_mesh`, which is
+        read in parallel, each process reading a part of the file,
+        and then partitioned.
 
     .. note::
 
@@ -1224,7 +2314,9 @@ def Mesh(meshfile, **kwargs):
     distribute = kwargs.get("distribute", True)
     if distribute is None:
         distribute = True
+    partition_weights = kwargs.get("partition_weights", None)
 
+    numbering = None
     if isinstance(meshfile, PETSc.DMPlex):
         name = "plexmesh"
         plex = meshfile
@@ -1233,27 +2325,32 @@ def Mesh(meshfile, **kwargs):
         name = meshfile
         basename, ext = os.path.splitext(meshfile)
 
-        if ext.lower() in ['.e', '.exo']:
-            plex = _from_exodus(meshfile, comm)
-        elif ext.lower() == '.cgns':
-            plex = _from_cgns(meshfile, comm)
-        elif ext.lower() == '.msh':
-            plex = _from_gmsh(meshfile, comm)
-        elif ext.lower() == '.node':
-            plex = _from_triangle(meshfile, geometric_dim, comm)
+        if ext.lower() == '.h5':
+            plex, numbering, attrs = _from_h5(meshfile, comm)
+            if numbering is not None:
+                name = attrs["name"]
+                geometric_dim = int(attrs["geometric_dimension"])
+                coordinate_element = (attrs["coordinate_family"], int(attrs["coordinate_degree"]))
+            elif geometric_dim is None:
+                geometric_dim = int(attrs["geometric_dimension"])
         else:
-            raise RuntimeError("Mesh file %s has unknown format '%s'."
-                               % (meshfile, ext[1:]))
+            plex = _from_file(meshfile, geometric_dim, comm)
 
     # Create mesh topology
-    topology = MeshTopology(plex, name=name, reorder=reorder, distribute=distribute)
+    topology = MeshTopology(plex, name=name, reorder=reorder, distribute=distribute,
+                            numbering=numbering, partition_weights=partition_weights)
 
     tcell = topology.ufl_cell()
     if geometric_dim is None:
         geometric_dim = tcell.topological_dimension()
     cell = tcell.reconstruct(geometric_dimension=geometric_dim)
 
-    element = ufl.VectorElement("Lagrange", cell, 1)
+    if numbering is not None:
+        # A saved mesh keeps its coordinate element
+        family, degree = coordinate_element
+        element = ufl.VectorElement(family, cell, degree)
+    else:
+        element = ufl.VectorElement("Lagrange", cell, 1)
     # Create mesh object
     mesh = MeshGeometry.__new__(MeshGeometry, element)
     mesh._topology = topology
@@ -1264,11 +2361,17 @@ def Mesh(meshfile, **kwargs):
         # Finish the initialisation of mesh topology
         self.topology.init()
 
-        coordinates_fs = functionspace.VectorFunctionSpace(self.topology, "Lagrange", 1,
-                                                           dim=geometric_dim)
+        if numbering is not None:
+            family, degree = coordinate_element
+            coordinates_fs = functionspace.VectorFunctionSpace(self.topology, family, degree,
+                                                               dim=geometric_dim)
+            coordinates_data = numbering["coordinates"]
+        else:
+            coordinates_fs = functionspace.VectorFunctionSpace(self.topology, "Lagrange", 1,
+                                                               dim=geometric_dim)
 
-        coordinates_data = dmplex.reordered_coords(plex, coordinates_fs.dm.getDefaultSection(),
-                                                   (self.num_vertices(), geometric_dim))
+            coordinates_data = dmplex.reordered_coords(plex, coordinates_fs.dm.getDefaultSection(),
+                                                       (self.num_vertices(), geometric_dim))
 
         coordinates = function.CoordinatelessFunction(coordinates_fs,
                                                       val=coordinates_data,
@@ -235,6 +235,35 @@ def get_array(function):
     return array
 
 
+class OutputProjector(object):
+    """Projects a function into the space it is output in.
+
+    :arg function: the :class:`~.Function` to project.
+    :arg output: the :class:`~.Function` to place the result in.
+
+    The mass matrix, and hence the setup of the preconditioner, is
+    shared with every other projection into the same space.
+    """
+    def __init__(self, function, output):
+        from firedrake import Function, LinearSolver, TestFunction
+        from firedrake.projection import _mass_matrix
+
+        V = output.function_space()
+        self.output = output
+        self.rhs = Function(V)
+        self.L = ufl.inner(TestFunction(V), function)*ufl.dx
+        self.solver = LinearSolver(_mass_matrix(V, self),
+                                   solver_parameters={"ksp_type": "cg",
+                                                      "share_pc": True})
+
+    def project(self):
+        """Apply the projection."""
+        from firedrake.assemble import assemble
+
+        assemble(self.L, tensor=self.rhs)
+        self.solver.solve(self.output, self.rhs)
+
+
 class File(object):
     _header = (b'<?xml version="1.0" ?>\n'
                b'<VTKFile type="Collection" version="0.1" '
@@ -315,7 +344,7 @@ class File(object):
 
     def _prepare_output(self, function, cg):
         from firedrake import FunctionSpace, VectorFunctionSpace, \
-            TensorFunctionSpace, Function, Projector, Interpolator
+            TensorFunctionSpace, Function, Interpolator
 
         name = function.name()
 
@@ -359,7 +388,7 @@ class File(object):
         if self.project:
             projector = self._mappers.get(function)
             if projector is None:
-                projector = Projector(function, output)
+                projector = OutputProjector(function, output)
                 self._mappers[function] = projector
             projector.project()
         else:
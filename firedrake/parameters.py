@@ -84,6 +84,10 @@ parameters["default_sub_matrix_type"] = "baij"
 
 parameters["type_check_safe_par_loops"] = False
 
+# Number of solvers cached by solve() for variational problems, the
+# cache is off by default since it keeps the solved problems alive
+parameters["solve_cache_size"] = 0
+
 
 def disable_performance_optimisations():
     """Switches off performance optimisations in Firedrake.
@@ -14,7 +14,7 @@ import coffee.base as ast
 from firedrake import constant
 
 
-__all__ = ['par_loop', 'direct', 'READ', 'WRITE', 'RW', 'INC', 'MIN', 'MAX']
+__all__ = ['par_loop', 'direct', 'columns', 'READ', 'WRITE', 'RW', 'INC', 'MIN', 'MAX']
 
 
 class _DirectLoop(object):
@@ -36,6 +36,25 @@ of the measure in order to indicate that the loop is a direct loop
 over degrees of freedom."""
 
 
+class _ColumnLoop(object):
+    """A singleton object which can be used in a :func:`par_loop` in place
+    of the measure in order to indicate that the loop is over the
+    columns of cells of an extruded mesh."""
+
+    def integral_type(self):
+        return "column"
+
+    def __repr__(self):
+
+        return "columns"
+
+
+columns = _ColumnLoop()
+"""A singleton object which can be used in a :func:`par_loop` in place
+of the measure in order to indicate that the loop is over the
+columns of cells of an extruded mesh."""
+
+
 def indirect_measure(mesh, measure):
     return mesh.measure_set(measure.integral_type(),
                             measure.subdomain_id())
@@ -57,6 +76,10 @@ _maps = {
     'direct': {
         'nodes': lambda x: None,
         'itspace': lambda mesh, measure: mesh
+    },
+    'column': {
+        'nodes': lambda x: x.column_node_map(),
+        'itspace': lambda mesh, measure: mesh.cell_set.parent
     }
 }
 """Map a measure to the correct maps."""
@@ -90,6 +113,10 @@ def _form_kernel(kernel, measure, args, **kwargs):
                 ndof *= 2
             if measure is direct:
                 kargs.append(ast.Decl("double", ast.Symbol(var, (ndof,))))
+            elif measure is columns:
+                layers = func.ufl_domain().layers - 1
+                kargs.append(ast.Decl("double *", ast.Symbol(var, (layers*ndof,))))
+                lkernel = lkernel.replace(var+".layers", str(layers))
             else:
                 kargs.append(ast.Decl("double *", ast.Symbol(var, (ndof,))))
         lkernel = lkernel.replace(var+".dofs", str(ndof))
@@ -184,6 +211,19 @@ def par_loop(kernel, measure, args, **kwargs):
     arguments must be :class:`.Function`\s in the same
     :class:`.FunctionSpace`.
 
+    On extruded meshes, a loop over the columns of cells can be
+    specified by passing :data:`columns` as the measure.  The kernel
+    is then called once per cell of the base mesh and sees the DoFs of
+    every cell in the column above it, ordered by layer from the
+    bottom and, within each layer, in the FInAT local DoFs order.  DoF
+    ``i`` of layer ``k`` of ``A`` is ``A[k*A.dofs + i]``, and the
+    number of layers is available as ``A.layers``.  DoFs shared between
+    vertically adjacent cells appear once for each cell, so kernels
+    should increment them only once, and write the same value to both
+    copies.  Column loops can not be used with :class:`.Function`\s on
+    meshes with variable layers, or with components of mixed
+    :class:`.Function`\s.
+
     **The kernel code**
 
     The kernel code is plain C in which the variables specified in the
@@ -248,6 +288,11 @@ def par_loop(kernel, measure, args, **kwargs):
         # Assume only one domain
         domain, = domains
         mesh = domain
+        if measure is columns:
+            if not mesh.cell_set._extruded:
+                raise ValueError("Column par_loops are only defined on extruded meshes")
+            if any(isinstance(func, Indexed) for func, _ in args.values()):
+                raise NotImplementedError("Column par_loops not implemented for mixed functions")
 
     op2args = [_form_kernel(kernel, measure, args, **kwargs)]
 
@@ -20,15 +20,47 @@ import tsfc.ufl_utils as ufl_utils
 from coffee.base import ArrayInit
 
 
+def cell_set(mesh):
+    """Return the cell set that point location iterates over.
+
+    :arg mesh: the mesh.
+
+    On meshes with variable layers, this is an extruded set in which
+    every column has :attr:`~.ExtrudedMeshTopology.max_cell_layers`
+    cells, so that the generated code can find a cell from its number
+    as for constant layers.  Only the cells which exist are put in
+    the spatial index, so the others are never visited."""
+    if not mesh.variable_layers:
+        return mesh.cell_set
+    return mesh.topology._uniform_cell_set
+
+
+def cell_node_map(function):
+    """Return the cell node map of a function over :func:`cell_set`.
+
+    :arg function: the :class:`.Function`."""
+    V = function.function_space()
+    mesh = V.mesh()
+    if not mesh.variable_layers:
+        return function.cell_node_map()
+    # The cell node list and offsets count from the bottom of each
+    # column, which is also where the cells of cell_set(mesh) start.
+    return op2.Map(cell_set(mesh), V.node_set,
+                   V.finat_element.space_dimension(),
+                   V.cell_node_list,
+                   "%s_point_location_cell_node" % V.name,
+                   offset=V.offset)
+
+
 def make_args(function):
-    arg = function.dat(op2.READ, function.cell_node_map())
+    arg = function.dat(op2.READ, cell_node_map(function))
     arg.position = 0
     return (arg,)
 
 
 def make_wrapper(function, **kwargs):
     args = make_args(function)
-    return generate_cell_wrapper(build_itspace(args, function.cell_set), args, **kwargs)
+    return generate_cell_wrapper(build_itspace(args, cell_set(function.ufl_domain())), args, **kwargs)
 
 
 def src_locate_cell(mesh, tolerance=None):
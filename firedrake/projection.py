@@ -1,3 +1,5 @@
+import weakref
+
 import ufl
 
 from firedrake import expression
@@ -100,6 +102,40 @@ def project(v, V, bcs=None, mesh=None,
     return ret
 
 
+def _mass_matrix(V, user):
+    """Return the assembled mass matrix of a function space.
+
+    :arg V: the :class:`.FunctionSpace`.
+    :arg user: the object using the matrix.
+
+    The matrix is cached on the mesh, so that users of the same
+    function space share it, and with it the setup of the
+    preconditioners of the :class:`.LinearSolver`\\s using it (see
+    :class:`~.SharedPreconditioner`).  It is reassembled if the mesh
+    has moved.  The cache entry is in use, and so not evicted by
+    :meth:`~.MeshTopology.clear_caches`, while ``user`` is alive.
+    """
+    from firedrake.assemble import assemble
+
+    mesh = V.mesh()
+    shared_data_cache = mesh.topology._shared_data_cache
+    kind = "mass_matrix"
+    key = V
+    entries = [(kind, key)]
+    shared_data_cache.acquire(entries)
+    weakref.finalize(user, shared_data_cache.release, entries)
+    version, A = shared_data_cache[kind].get(key, (None, None))
+    if version == mesh.coordinates_version:
+        shared_data_cache.hits[kind] += 1
+        return A
+    shared_data_cache.misses[kind] += 1
+    p = ufl_expr.TestFunction(V)
+    q = ufl_expr.TrialFunction(V)
+    A = assemble(ufl.inner(p, q)*ufl.dx)
+    shared_data_cache[kind][key] = (mesh.coordinates_version, A)
+    return A
+
+
 class Projector(object):
     """
     A projector projects a UFL expression into a function space
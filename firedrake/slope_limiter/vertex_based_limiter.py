@@ -1,8 +1,9 @@
 from firedrake import dx, assemble, LinearSolver
+from firedrake.projection import _mass_matrix
 from firedrake.function import Function
 from firedrake.functionspace import FunctionSpace
 from firedrake.parloops import par_loop, READ, RW, MIN, MAX
-from firedrake.ufl_expr import TrialFunction, TestFunction
+from firedrake.ufl_expr import TestFunction
 from firedrake.slope_limiter.limiter import Limiter
 __all__ = ("VertexBasedLimiter",)
 
@@ -62,14 +63,16 @@ for (int i=0; i<q.dofs; i++) {
         """
         Constructs a linear problem for computing the centroids
 
+        The mass matrix, and so the preconditioner, is shared with the
+        other limiters on the same mesh.
+
         :return: LinearSolver instance
         """
-        u = TrialFunction(self.P0)
-        v = TestFunction(self.P0)
-        a = assemble(u * v * dx)
-        return LinearSolver(a, solver_parameters={'ksp_type': 'preonly',
-                                                  'pc_type': 'bjacobi',
-                                                  'sub_pc_type': 'ilu'})
+        return LinearSolver(_mass_matrix(self.P0, self),
+                            solver_parameters={'ksp_type': 'preonly',
+                                               'pc_type': 'bjacobi',
+                                               'sub_pc_type': 'ilu',
+                                               'share_pc': True})
 
     def _update_centroids(self, field):
         """
@@ -20,11 +20,16 @@
 __all__ = ["solve"]
 
 import ufl
+from collections import OrderedDict
 
 import firedrake.linear_solver as ls
 import firedrake.variational_solver as vs
+from firedrake import solving_utils
+from firedrake.memory import memory_hook
+from firedrake.parameters import parameters
 
 
+@memory_hook
 def solve(*args, **kwargs):
     """Solve linear system Ax = b or variational problem a == L or F == 0.
 
@@ -112,6 +117,16 @@ def solve(*args, **kwargs):
 
     In the same fashion you can add the near nullspace using the
     ``near_nullspace`` keyword argument.
+
+    If ``parameters["solve_cache_size"]`` is positive, the solvers
+    built to solve variational problems are cached, so that calling
+    :func:`solve` repeatedly (for example in a time loop) with the
+    same forms, solution, boundary conditions and parameters reuses
+    the solver.  For linear problems the assembled operator is
+    also reused, as long as the bilinear form only depends on
+    :class:`~.Constant` coefficients whose values have not changed
+    and the mesh has not moved.  The cache keeps the problems it
+    solved alive, so it is off (a size of zero) by default.
     """
 
     assert(len(args) > 0)
@@ -124,6 +139,82 @@ def solve(*args, **kwargs):
         return _la_solve(*args, **kwargs)
 
 
+_solver_cache = OrderedDict()
+"""The solvers built by :func:`solve` for variational problems, most
+recently used last."""
+
+
+def _form_key(form):
+    """Return a cache key for a form.
+
+    :arg form: the form.  Anything else is its own key.
+
+    Forms with the same key are the same up to the numbering of
+    indices, since the key contains the coefficients and domains the
+    form signature is computed relative to."""
+    if not isinstance(form, ufl.Form):
+        return form
+    return (form.signature(), tuple(form.coefficients()), tuple(form.ufl_domains()))
+
+
+def _parameters_key(params):
+    """Return a cache key for a (possibly nested) dict of parameters.
+
+    :arg params: the parameters, or ``None``."""
+    if params is None:
+        return None
+    return tuple(sorted((k, repr(v)) for k, v in
+                        solving_utils.flatten_parameters(params).items()))
+
+
+def _jacobian_state(problem):
+    """Return the state the assembled Jacobian of a problem depends on.
+
+    :arg problem: the :class:`.LinearVariationalProblem`.
+    :returns: the coordinate versions of the meshes and the values of
+        the :class:`~.Constant` coefficients of the Jacobian (and
+        preconditioning operator), or ``None`` if it depends on
+        other coefficients, so must always be reassembled.
+    """
+    from firedrake.constant import Constant
+
+    forms = [f for f in (problem.J, problem.Jp) if f is not None]
+    coefficients = sorted(set().union(*(f.coefficients() for f in forms)),
+                          key=lambda c: c.count())
+    if not all(isinstance(c, Constant) for c in coefficients):
+        return None
+    domains = sorted(set().union(*(f.ufl_domains() for f in forms)),
+                     key=lambda m: m.ufl_id())
+    return (tuple(m.coordinates_version for m in domains),
+            tuple(tuple(c.values()) for c in coefficients))
+
+
+def _cached_solver(key, make_solver):
+    """Return the cached solver for a variational problem.
+
+    :arg key: the cache key.
+    :arg make_solver: a callable returning a new solver, used if
+        there is no solver for this key.
+    :returns: a tuple of the solver and whether it was cached.
+    """
+    size = parameters["solve_cache_size"]
+    try:
+        solver = _solver_cache.pop(key)
+        cached = True
+    except (KeyError, TypeError):
+        # TypeError: something unhashable in the key
+        solver = make_solver()
+        cached = False
+    if size > 0:
+        try:
+            _solver_cache[key] = solver
+        except TypeError:
+            pass
+    while len(_solver_cache) > max(size, 0):
+        _solver_cache.popitem(last=False)
+    return solver, cached
+
+
 def _solve_varproblem(*args, **kwargs):
     "Solve variational problem a == L or F == 0"
 
@@ -134,38 +225,59 @@ def _solve_varproblem(*args, **kwargs):
         options_prefix = _extract_args(*args, **kwargs)
 
     appctx = kwargs.get("appctx", {})
+    linear = isinstance(eq.lhs, ufl.Form) and isinstance(eq.rhs, ufl.Form)
+    if not linear and eq.rhs != 0:
+        raise TypeError("Only '0' support on RHS of nonlinear Equation, not %r" % eq.rhs)
+
+    key = (linear, _form_key(eq.lhs), _form_key(eq.rhs) if linear else None,
+           u, bcs, _form_key(J), _form_key(Jp),
+           _parameters_key(form_compiler_parameters),
+           _parameters_key(solver_parameters),
+           nullspace, nullspace_T, near_nullspace, options_prefix,
+           tuple(sorted((k, id(v)) for k, v in appctx.items())))
+
     # Solve linear variational problem
-    if isinstance(eq.lhs, ufl.Form) and isinstance(eq.rhs, ufl.Form):
-
-        # Create problem
-        problem = vs.LinearVariationalProblem(eq.lhs, eq.rhs, u, bcs, Jp,
-                                              form_compiler_parameters=form_compiler_parameters)
-
-        # Create solver and call solve
-        solver = vs.LinearVariationalSolver(problem, solver_parameters=solver_parameters,
-                                            nullspace=nullspace,
-                                            transpose_nullspace=nullspace_T,
-                                            near_nullspace=near_nullspace,
-                                            options_prefix=options_prefix,
-                                            appctx=appctx)
+    if linear:
+
+        def make_solver():
+            # Create problem
+            problem = vs.LinearVariationalProblem(eq.lhs, eq.rhs, u, bcs, Jp,
+                                                  form_compiler_parameters=form_compiler_parameters)
+
+            # Create solver
+            return vs.LinearVariationalSolver(problem, solver_parameters=solver_parameters,
+                                              nullspace=nullspace,
+                                              transpose_nullspace=nullspace_T,
+                                              near_nullspace=near_nullspace,
+                                              options_prefix=options_prefix,
+                                              appctx=appctx)
+
+        solver, cached = _cached_solver(key, make_solver)
+        # Reuse the assembled operator only if nothing it depends on
+        # can have changed.
+        state = _jacobian_state(solver._problem)
+        if cached and (state is None or state != solver._jacobian_state):
+            solver.invalidate_jacobian()
+        solver._jacobian_state = state
         solver.solve()
 
     # Solve nonlinear variational problem
     else:
 
-        if eq.rhs != 0:
-            raise TypeError("Only '0' support on RHS of nonlinear Equation, not %r" % eq.rhs)
-        # Create problem
-        problem = vs.NonlinearVariationalProblem(eq.lhs, u, bcs, J, Jp,
-                                                 form_compiler_parameters=form_compiler_parameters)
-
-        # Create solver and call solve
-        solver = vs.NonlinearVariationalSolver(problem, solver_parameters=solver_parameters,
-                                               nullspace=nullspace,
-                                               transpose_nullspace=nullspace_T,
-                                               near_nullspace=near_nullspace,
-                                               options_prefix=options_prefix,
-                                               appctx=appctx)
+        def make_solver():
+            # Create problem
+            problem = vs.NonlinearVariationalProblem(eq.lhs, u, bcs, J, Jp,
+                                                     form_compiler_parameters=form_compiler_parameters)
+
+            # Create solver
+            return vs.NonlinearVariationalSolver(problem, solver_parameters=solver_parameters,
+                                                 nullspace=nullspace,
+                                                 transpose_nullspace=nullspace_T,
+                                                 near_nullspace=near_nullspace,
+                                                 options_prefix=options_prefix,
+                                                 appctx=appctx)
+
+        solver, _ = _cached_solver(key, make_solver)
         solver.solve()
 
 
@@ -1,6 +1,10 @@
 import numpy
 import itertools
-from contextlib import contextmanager
+import json
+import time
+from contextlib import contextmanager, ExitStack
+from math import factorial
+from mpi4py import MPI
 
 from firedrake import function, dmhooks
 from firedrake.exceptions import ConvergenceError
@@ -197,6 +201,89 @@ class ParametersMixin(object):
                 del self.options_object[self.options_prefix + k]
 
 
+class SharedPreconditioner(ParametersMixin):
+    """A preconditioner shared between linear solvers.
+
+    :arg A: the PETSc Mat of the operator.
+    :arg P: the PETSc Mat to build the preconditioner from.
+    :arg dm: the DM of the function space of the operator.
+    :arg parameters: the (flattened) preconditioner parameters.
+
+    Linear solvers with the same operators and preconditioner
+    parameters, created with the ``"share_pc"`` parameter, use the
+    same PETSc PC, so that its setup (for example
+    an LU factorisation) is only done once.  PETSc redoes the setup
+    when the operator changes, so it stays valid for all the solvers
+    sharing it.  The PC has its own options prefix, so its options
+    must be inserted (see :meth:`inserted_options`) whenever a solver
+    using it is applied.
+
+    Use :meth:`acquire` and :meth:`release` rather than building these
+    directly.
+    """
+
+    _registry = {}
+    """Map from keys to the live shared preconditioners."""
+
+    def __init__(self, A, P, dm, parameters):
+        super(SharedPreconditioner, self).__init__(parameters, None)
+        self.refcount = 0
+        self.pc = PETSc.PC().create(comm=P.comm)
+        self.pc.setDM(dm)
+        self.pc.setOperators(A, P)
+        self.set_from_options(self.pc)
+
+    @staticmethod
+    def pc_parameters(parameters):
+        """Return the preconditioner parameters of a linear solver.
+
+        :arg parameters: the (flattened) solver parameters.
+
+        These are all the parameters not controlling the outer Krylov
+        method, or the sharing itself."""
+        return {k: v for k, v in parameters.items()
+                if not k.startswith("ksp_") and k != "share_pc"}
+
+    @classmethod
+    def acquire(cls, A, P, dm, parameters):
+        """Return a preconditioner, sharing it if possible.
+
+        :arg A: the PETSc Mat of the operator.
+        :arg P: the PETSc Mat to build the preconditioner from.
+        :arg dm: the DM of the function space of the operator.
+        :arg parameters: the (flattened) solver parameters.
+        :returns: a tuple of the key, to pass to :meth:`release`
+            once the preconditioner is no longer used, and the
+            :class:`SharedPreconditioner`.
+        """
+        parameters = cls.pc_parameters(parameters)
+        # The PC holds references to the Mats, so their handles are
+        # not reused while it lives.
+        key = (A.handle, P.handle, dm.handle,
+               tuple(sorted((k, repr(v)) for k, v in parameters.items())))
+        shared = cls._registry.get(key)
+        if shared is None:
+            shared = cls(A, P, dm, parameters)
+            cls._registry[key] = shared
+        shared.refcount += 1
+        return key, shared
+
+    @classmethod
+    def release(cls, key):
+        """Release a preconditioner returned by :meth:`acquire`.
+
+        :arg key: its key.
+
+        The preconditioner is dropped from the registry once it is not
+        used by any solver."""
+        shared = cls._registry.get(key)
+        if shared is None:
+            return
+        shared.refcount -= 1
+        if shared.refcount <= 0:
+            del cls._registry[key]
+
+
 def _make_reasons(reasons):
     return dict([(getattr(reasons, r), r)
                  for r in dir(reasons) if not r.startswith('_')])
@@ -231,17 +318,409 @@ Reason:
    %s""" % (snes.getIterationNumber(), msg))
 
 
+class JacobianLagging(object):
+    """A policy deciding when a Newton solver reassembles its Jacobian.
+
+    :arg lag_type: when to rebuild the Jacobian and preconditioner.
+        ``"fixed"`` rebuilds every ``max_age`` Newton iterations,
+        ``"residual"`` rebuilds when the last Newton step reduced the
+        residual norm by less than a factor ``residual_ratio`` and
+        ``"ksp_iterations"`` rebuilds when the last linear solve took
+        more than ``ksp_growth`` times as many iterations as the first
+        linear solve after the last rebuild.
+    :arg max_age: the maximum number of Newton iterations a Jacobian
+        is used for (defaults to 3 for ``"fixed"``, unlimited
+        otherwise).
+    :arg residual_ratio: see above.
+    :arg ksp_growth: see above.
+    :arg persists: keep the Jacobian across calls to the solver (for
+        example between time steps)?
+
+    The Jacobian is always rebuilt if the last linear solve failed to
+    converge.
+    """
+
+    types = ("fixed", "residual", "ksp_iterations")
+
+    def __init__(self, lag_type, max_age=None, residual_ratio=0.5,
+                 ksp_growth=2.0, persists=True):
+        if lag_type not in self.types:
+            raise ValueError("Unknown Jacobian lagging type '%s', not one of %s" %
+                             (lag_type, ", ".join(self.types)))
+        if max_age is None and lag_type == "fixed":
+            max_age = 3
+        if max_age is not None and max_age < 1:
+            raise ValueError("Jacobian maximum age must be at least 1, not %d" % max_age)
+        self.lag_type = lag_type
+        self.max_age = max_age
+        self.residual_ratio = residual_ratio
+        self.ksp_growth = ksp_growth
+        self.persists = persists
+        self.reused = False
+        self.invalidate()
+
+    def invalidate(self):
+        """Force a rebuild the next time the Jacobian is needed."""
+        self._age = None
+        self._base_its = None
+        self._last_norm = None
+
+    def start(self):
+        """Record the start of a nonlinear solve."""
+        if not self.persists:
+            self.invalidate()
+        self._last_norm = None
+        self.reused = False
+
+    def rebuild(self, snes):
+        """Decide whether to rebuild the Jacobian at the current Newton
+        iteration, updating the convergence history.
+
+        :arg snes: the PETSc SNES.
+        """
+        norm = snes.getFunctionNorm()
+        last_norm, self._last_norm = self._last_norm, norm
+        ksp = snes.getKSP()
+        its = ksp.getIterationNumber()
+        if self._age is not None and self._base_its is None:
+            # The first linear solve with the current Jacobian
+            self._base_its = its
+
+        if self._age is None or ksp.getConvergedReason() < 0:
+            rebuild = True
+        elif self.max_age is not None and self._age >= self.max_age:
+            rebuild = True
+        elif self.lag_type == "residual":
+            rebuild = last_norm is not None and norm > self.residual_ratio * last_norm
+        elif self.lag_type == "ksp_iterations":
+            rebuild = its > self.ksp_growth * max(self._base_its, 1)
+        else:
+            rebuild = False
+
+        if rebuild:
+            self._age = 0
+            self._base_its = None
+        else:
+            self.reused = True
+        self._age += 1
+        return rebuild
+
+
+class SolutionHistory(object):
+    """The recent solutions of a nonlinear problem, used to guess the
+    solution of the next solve.
+
+    :arg V: the function space of the solution.
+    :arg guess_type: how to compute the guess from the recent
+        solutions.  ``"extrapolate"`` extrapolates them with a
+        polynomial, assuming they are equally spaced in time, and
+        ``"projection"`` finds the Galerkin projection of the first
+        Newton update onto their span.
+    :arg size: the number of solutions to keep (defaults to 2 for
+        ``"extrapolate"``, giving linear extrapolation, and 5 for
+        ``"projection"``).
+
+    The guess is used as the nonzero initial guess of the first
+    linear solve of the next Newton solve, so that it reduces the
+    number of Krylov iterations without changing the initial
+    residual the nonlinear convergence is measured against.
+    """
+
+    types = ("extrapolate", "projection")
+
+    def __init__(self, V, guess_type, size=None):
+        if guess_type not in self.types:
+            raise ValueError("Unknown initial guess type '%s', not one of %s" %
+                             (guess_type, ", ".join(self.types)))
+        if size is None:
+            size = 2 if guess_type == "extrapolate" else 5
+        if size < 1:
+            raise ValueError("Must keep at least one solution, not %d" % size)
+        self.guess_type = guess_type
+        self.size = size
+        self.solutions = []
+        self._V = V
+        self._guess = function.Function(V)
+        self._pending = False
+        self._nonzero = False
+        self._previous_nonzero = False
+
+    def push(self, u):
+        """Record a solution.
+
+        :arg u: the solution, a :class:`.Function`.  The oldest
+            solution is forgotten if the history is full."""
+        if len(self.solutions) == self.size:
+            f = self.solutions.pop(0)
+        else:
+            f = function.Function(self._V)
+        f.assign(u)
+        self.solutions.append(f)
+
+    def start(self):
+        """Record the start of a nonlinear solve."""
+        self._pending = len(self.solutions) > 0
+
+    def finish(self, snes):
+        """Record the end of a nonlinear solve, restoring the KSP's
+        own nonzero initial guess setting if the guess was used.
+
+        :arg snes: the PETSc SNES."""
+        if self._nonzero:
+            snes.getKSP().setInitialGuessNonzero(self._previous_nonzero)
+            self._nonzero = False
+
+    def _extrapolate(self, guess):
+        # Lagrange extrapolation to the next equally spaced point,
+        # newest solution first.
+        m = len(self.solutions)
+        guess.set(0)
+        for j, f in enumerate(reversed(self.solutions)):
+            c = (-1)**j * factorial(m) // (factorial(j + 1) * factorial(m - j - 1))
+            with f.dat.vec_ro as v:
+                guess.axpy(c, v)
+
+    def _project(self, guess, X, ctx):
+        # Galerkin projection of the solution of J (X - u) = F onto
+        # the span of the recent solutions, with J the current
+        # Jacobian.
+        J = ctx._jac.petscmat
+        m = len(self.solutions)
+        with ExitStack() as stack:
+            us = [stack.enter_context(f.dat.vec_ro) for f in self.solutions]
+            F = stack.enter_context(ctx._F.dat.vec_ro)
+            b = X.duplicate()
+            J.mult(X, b)
+            b.axpy(-1, F)
+            Ju = X.duplicate()
+            M = numpy.empty((m, m))
+            r = numpy.empty(m)
+            for j, u in enumerate(us):
+                J.mult(u, Ju)
+                for i, v in enumerate(us):
+                    M[i, j] = v.dot(Ju)
+                r[j] = u.dot(b)
+            c = numpy.linalg.lstsq(M, r, rcond=1e-10)[0]
+            guess.set(0)
+            guess.maxpy(c, us)
+
+    def set_initial_guess(self, snes, X, ctx):
+        """Set the initial guess of the linear solve at the start of a
+        nonlinear solve.
+
+        :arg snes: the PETSc SNES.
+        :arg X: the current state (a Vec).
+        :arg ctx: the :class:`_SNESContext`.
+
+        Called after the Jacobian is formed, before the linear solve.
+        """
+        ksp = snes.getKSP()
+        if self._nonzero:
+            # Only the first linear solve starts from the guess, the
+            # later ones use the KSP's own setting.
+            ksp.setInitialGuessNonzero(self._previous_nonzero)
+            self._nonzero = False
+        if not self._pending or snes.getIterationNumber() != 0:
+            return
+        self._pending = False
+        if snes.getType() not in {"newtonls", "ksponly"} or ksp.getType() == "preonly":
+            # No Krylov solve of the Newton update to start
+            return
+        with self._guess.dat.vec_wo as guess:
+            if self.guess_type == "extrapolate":
+                self._extrapolate(guess)
+            else:
+                self._project(guess, X, ctx)
+        for bc in ctx._problem.bcs:
+            bc.apply(self._guess)
+        # The Newton update solves J Y = F(X), with X - Y the new
+        # state.
+        Y = snes.getSolutionUpdate()
+        with self._guess.dat.vec_ro as guess:
+            X.copy(Y)
+            Y.axpy(-1, guess)
+        self._previous_nonzero = ksp.getInitialGuessNonzero()
+        ksp.setInitialGuessNonzero(True)
+        self._nonzero = True
+
+
+class SolverProfile(object):
+    """Per-solve profiling records of a nonlinear solver.
+
+    :arg comm: the communicator the solver is defined on.
+
+    Profiling is off until :meth:`enable` is called.  Then every solve
+    appends a record to :attr:`records`, a dict with keys from
+    :attr:`fields`:
+
+    ``"solve_time"``
+        the time of the whole solve.
+    ``"residual_time"``, ``"residual_evaluations"``
+        the time spent assembling, and the number of, residuals.
+    ``"jacobian_time"``, ``"jacobian_assemblies"``
+        the time spent forming, and the number of assemblies of, the
+        Jacobian (and preconditioning operator).
+    ``"bc_time"``
+        the time spent applying boundary conditions to the solution
+        and residual.
+    ``"pc_setup_time"``, ``"pc_apply_time"``
+        the time spent setting up and applying preconditioners, from
+        the PETSc ``PCSetUp`` and ``PCApply`` events.
+    ``"snes_iterations"``, ``"ksp_iterations"``
+        the number of nonlinear and (total) linear iterations.
+    ``"halo_time"``, ``"halo_bytes"``
+        the time spent in, and the bytes exchanged by, halo
+        exchanges.
+    ``"compile_time"``
+        the time spent compiling forms to kernels during the solve.
+
+    Times are in seconds and local to each process, use the
+    ``reduce`` argument of :meth:`as_dict` and
+    :meth:`to_json_lines` to combine them across processes.
+    """
+
+    fields = ("solve_time", "residual_time", "residual_evaluations",
+              "jacobian_time", "jacobian_assemblies", "bc_time",
+              "pc_setup_time", "pc_apply_time", "snes_iterations",
+              "ksp_iterations", "halo_time", "halo_bytes", "compile_time")
+
+    reductions = {"min": MPI.MIN, "max": MPI.MAX, "sum": MPI.SUM, "mean": MPI.SUM}
+
+    def __init__(self, comm=None):
+        self.comm = comm
+        self.records = []
+        self.enabled = False
+        self._current = None
+
+    def enable(self):
+        """Start recording a profile of every solve.
+
+        This turns on PETSc logging, if it is not on already."""
+        PETSc.Log.begin()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording profiles."""
+        self.enabled = False
+
+    def clear(self):
+        """Forget the records."""
+        self.records = []
+
+    @contextmanager
+    def timed(self, field):
+        """Context manager adding the time spent inside it to a field
+        of the current record.
+
+        :arg field: the field."""
+        record = self._current
+        if record is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record[field] += time.perf_counter() - start
+
+    def count(self, field, n=1):
+        """Add to a counter in the current record.
+
+        :arg field: the field.
+        :arg n: the number to add."""
+        if self._current is not None:
+            self._current[field] += n
+
+    @staticmethod
+    def _counters():
+        from firedrake import halo, tsfc_interface
+        return {"pc_setup_time": PETSc.Log.Event("PCSetUp").getPerfInfo()["time"],
+                "pc_apply_time": PETSc.Log.Event("PCApply").getPerfInfo()["time"],
+                "halo_time": halo.exchange_stats["time"],
+                "halo_bytes": halo.exchange_stats["bytes"],
+                "compile_time": tsfc_interface.compile_stats["time"]}
+
+    @contextmanager
+    def solve(self, snes):
+        """Context manager recording the profile of a solve.
+
+        :arg snes: the PETSc SNES doing the solve."""
+        if not self.enabled:
+            yield
+            return
+        before = self._counters()
+        self._current = dict.fromkeys(self.fields, 0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record, self._current = self._current, None
+            record["solve_time"] = time.perf_counter() - start
+            after = self._counters()
+            for field in after:
+                record[field] = after[field] - before[field]
+            record["snes_iterations"] = snes.getIterationNumber()
+            record["ksp_iterations"] = snes.getLinearSolveIterations()
+            self.records.append(record)
+
+    def as_dict(self, reduce=None):
+        """Return the records as a dict of columns.
+
+        :arg reduce: ``None`` to return the values on this process,
+            or one of ``"min"``, ``"max"``, ``"sum"`` or ``"mean"`` to
+            reduce them across processes (in which case this is
+            collective).
+        :returns: a dict mapping ``"solve"`` to the number of each
+            solve, and each field to its values, suitable for
+            ``pandas.DataFrame``.
+        """
+        if reduce is not None and reduce not in self.reductions:
+            raise ValueError("Unknown reduction '%s', not one of %s" %
+                             (reduce, ", ".join(sorted(self.reductions))))
+        columns = {"solve": list(range(len(self.records)))}
+        for field in self.fields:
+            dtype = float if field.endswith("_time") else numpy.int64
+            values = numpy.array([r[field] for r in self.records], dtype=dtype)
+            if reduce is not None:
+                reduced = numpy.empty_like(values)
+                self.comm.Allreduce(values, reduced, op=self.reductions[reduce])
+                values = reduced / self.comm.size if reduce == "mean" else reduced
+            columns[field] = values.tolist()
+        return columns
+
+    def to_json_lines(self, filename, reduce="max"):
+        """Write the records to a file, one JSON object per line.
+
+        :arg filename: the file to write.
+        :arg reduce: how to reduce the values across processes, see
+            :meth:`as_dict`.  Only the first process writes the file
+            if they are reduced.
+
+        This is collective if ``reduce`` is not ``None``.
+        """
+        columns = self.as_dict(reduce=reduce)
+        if reduce is not None and self.comm.rank != 0:
+            return
+        keys = list(columns)
+        with open(filename, "w") as f:
+            for values in zip(*(columns[k] for k in keys)):
+                f.write(json.dumps(dict(zip(keys, values))) + "\n")
+
+
 class _SNESContext(object):
     """
     Context holding information for SNES callbacks.
 
     :arg problem: a :class:`NonlinearVariationalProblem`.
     :arg mat_type: Indicates whether the Jacobian is assembled
-        monolithically ('aij'), as a block sparse matrix ('nest') or
-        matrix-free (as :class:`~.ImplicitMatrix`\es, 'matfree').
+        monolithically ('aij'), as a block sparse matrix ('nest'),
+        matrix-free (as :class:`~.ImplicitMatrix`\es, 'matfree') or
+        as element matrices (as
+        :class:`~.PartiallyAssembledMatrix`\es, 'partial').
     :arg pmat_type: Indicates whether the preconditioner (if present) is assembled
-        monolithically ('aij'), as a block sparse matrix ('nest') or
-        matrix-free (as :class:`~.ImplicitMatrix`\es, 'matfree').
+        monolithically ('aij'), as a block sparse matrix ('nest'),
+        matrix-free (as :class:`~.ImplicitMatrix`\es, 'matfree') or
+        as element matrices ('partial').
     :arg appctx: Any extra information used in the assembler.  For the
         matrix-free case this will contain the Newton state in
         ``"state"``.
@@ -249,6 +728,11 @@ class _SNESContext(object):
         before Jacobian assembly
     :arg pre_function_callback: User-defined function called immediately
         before residual assembly
+    :arg jacobian: ``"assembled"`` to use the Jacobian of type
+        ``mat_type``, or ``"fd"`` to apply it by finite differences
+        of the residual (see :class:`~.FiniteDifferenceJacobian`),
+        with the preconditioner assembled from ``Jp`` (or the
+        Jacobian form) with ``pmat_type``.
 
     The idea here is that the SNES holds a shell DM which contains
     this object as "user context".  When the SNES calls back to the
@@ -256,10 +740,22 @@ class _SNESContext(object):
     get the context (which is one of these objects) to find the
     Firedrake level information.
     """
-    def __init__(self, problem, mat_type, pmat_type, appctx=None, pre_jacobian_callback=None, pre_function_callback=None):
+    def __init__(self, problem, mat_type, pmat_type, appctx=None, pre_jacobian_callback=None, pre_function_callback=None,
+                 jacobian="assembled"):
         from firedrake.assemble import allocate_matrix, create_assembly_callable
-        if pmat_type is None:
+        from firedrake.matrix import FiniteDifferenceJacobian
+        if jacobian not in {"assembled", "fd"}:
+            raise ValueError("jacobian must be 'assembled' or 'fd', not '%s'" % jacobian)
+        fd = jacobian == "fd"
+        if fd:
+            # The Jacobian is applied matrix-free, and only the
+            # preconditioner is assembled.
+            if pmat_type is None and mat_type != "matfree":
+                pmat_type = mat_type
+            mat_type = "matfree"
+        elif pmat_type is None:
             pmat_type = mat_type
+        self.jacobian = jacobian
         self.mat_type = mat_type
         self.pmat_type = pmat_type
 
@@ -291,19 +787,25 @@ class _SNESContext(object):
         self.F = problem.F
         self.J = problem.J
 
-        self._jac = allocate_matrix(self.J, bcs=problem.bcs,
-                                    form_compiler_parameters=fcp,
-                                    mat_type=mat_type,
-                                    appctx=appctx)
-        self._assemble_jac = create_assembly_callable(self.J,
-                                                      tensor=self._jac,
-                                                      bcs=problem.bcs,
-                                                      form_compiler_parameters=fcp,
-                                                      mat_type=mat_type)
+        if fd:
+            self._jac = FiniteDifferenceJacobian(self.J, problem.bcs, self.F, self._x,
+                                                 fc_params=fcp,
+                                                 pre_function_callback=pre_function_callback)
+            self._assemble_jac = self._jac.assemble
+        else:
+            self._jac = allocate_matrix(self.J, bcs=problem.bcs,
+                                        form_compiler_parameters=fcp,
+                                        mat_type=mat_type,
+                                        appctx=appctx)
+            self._assemble_jac = create_assembly_callable(self.J,
+                                                          tensor=self._jac,
+                                                          bcs=problem.bcs,
+                                                          form_compiler_parameters=fcp,
+                                                          mat_type=mat_type)
 
         self.is_mixed = self._jac.block_shape != (1, 1)
 
-        if mat_type != pmat_type or problem.Jp is not None:
+        if fd or mat_type != pmat_type or problem.Jp is not None:
             # Need separate pmat if either Jp is different or we want
             # a different pmat type to the mat type.
             if problem.Jp is None:
@@ -331,6 +833,17 @@ class _SNESContext(object):
                                                            form_compiler_parameters=fcp)
 
         self._jacobian_assembled = False
+        # A JacobianLagging policy, or None to assemble the Jacobian
+        # at every Newton iteration.
+        self._lagging = None
+        # A SolutionHistory providing the initial guess for the first
+        # linear solve, or None.
+        self._solution_history = None
+        # The profile of the solver using this context
+        self._profile = SolverProfile()
+        self._jacobian_assemblies = 0
+        self._jacobian_reuses = 0
+        self._pc_setups_avoided = 0
         self._splits = {}
         self._coarse = None
         self._fine = None
@@ -398,7 +911,7 @@ class _SNESContext(object):
                                form_compiler_parameters=problem.form_compiler_parameters)
             new_problem._constant_jacobian = problem._constant_jacobian
             splits.append(type(self)(new_problem, mat_type=self.mat_type, pmat_type=self.pmat_type,
-                                     appctx=self.appctx))
+                                     appctx=self.appctx, jacobian=self.jacobian))
         return self._splits.setdefault(tuple(fields), splits)
 
     @staticmethod
@@ -420,11 +933,15 @@ class _SNESContext(object):
         if ctx._pre_function_callback is not None:
             ctx._pre_function_callback(X)
 
-        ctx._assemble_residual()
+        profile = ctx._profile
+        with profile.timed("residual_time"):
+            ctx._assemble_residual()
+        profile.count("residual_evaluations")
 
         # no mat_type -- it's a vector!
-        for bc in problem.bcs:
-            bc.zero(ctx._F)
+        with profile.timed("bc_time"):
+            for bc in problem.bcs:
+                bc.zero(ctx._F)
 
         # F may not be the same vector as self._F, so copy
         # residual out to F.
@@ -442,29 +959,69 @@ class _SNESContext(object):
         """
         dm = snes.getDM()
         ctx = dmhooks.get_appctx(dm)
-        problem = ctx._problem
+        with ctx._profile.timed("jacobian_time"):
+            ctx._update_jacobian(snes, X, J, P)
+        if ctx._solution_history is not None:
+            ctx._solution_history.set_initial_guess(snes, X, ctx)
 
-        assert J.handle == ctx._jac.petscmat.handle
-        if problem._constant_jacobian and ctx._jacobian_assembled:
+    def _update_jacobian(self, snes, X, J, P):
+        """Assemble the Jacobian, unless it is constant or lagged.
+
+        :arg snes: a PETSc SNES object
+        :arg X: the current guess (a Vec)
+        :arg J: the Jacobian (a Mat)
+        :arg P: the preconditioner matrix (a Mat)
+        """
+        problem = self._problem
+
+        assert J.handle == self._jac.petscmat.handle
+        if problem._constant_jacobian and self._jacobian_assembled:
             # Don't need to do any work with a constant jacobian
             # that's already assembled
+            self._record_reuse()
             return
-        ctx._jacobian_assembled = True
+        if self._lagging is not None:
+            if not self._jacobian_assembled:
+                self._lagging.invalidate()
+            rebuild = self._lagging.rebuild(snes)
+        else:
+            rebuild = True
+        self._jacobian_assembled = True
 
         # X may not be the same vector as the vec behind self._x, so
         # copy guess in from X.
-        with ctx._x.dat.vec_wo as v:
+        with self._x.dat.vec_wo as v:
             X.copy(v)
 
-        if ctx._pre_jacobian_callback is not None:
-            ctx._pre_jacobian_callback(X)
+        if not rebuild:
+            # Matrix-free operators are cheap to update and always
+            # represent the current Jacobian, only lag assembled ones.
+            if self.matfree:
+                self._assemble_jac()
+            if self.Jp is not None and self.pmatfree:
+                self._assemble_pjac()
+            self._record_reuse()
+            return
 
-        ctx._assemble_jac()
-        ctx._jac.force_evaluation()
-        if ctx.Jp is not None:
-            assert P.handle == ctx._pjac.petscmat.handle
-            ctx._assemble_pjac()
-            ctx._pjac.force_evaluation()
+        if self._pre_jacobian_callback is not None:
+            self._pre_jacobian_callback(X)
+
+        self._jacobian_assemblies += 1
+        self._profile.count("jacobian_assemblies")
+        self._assemble_jac()
+        self._jac.force_evaluation()
+        if self.Jp is not None:
+            assert P.handle == self._pjac.petscmat.handle
+            self._assemble_pjac()
+            self._pjac.force_evaluation()
+
+    def _record_reuse(self):
+        """Record that the Jacobian was not reassembled."""
+        self._jacobian_reuses += 1
+        if not self.pmatfree:
+            # The preconditioning matrix is unchanged, so PETSc skips
+            # setting up the preconditioner.
+            self._pc_setups_avoided += 1
 
     @staticmethod
     def compute_operators(ksp, J, P):
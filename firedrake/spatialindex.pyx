@@ -1,4 +1,5 @@
 cimport numpy as np
+import numpy as np
 import ctypes
 import cython
 from libc.stdint cimport uintptr_t
@@ -54,26 +55,35 @@ cdef class SpatialIndex(object):
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def from_regions(np.ndarray[np.float64_t, ndim=2, mode="c"] regions_lo,
-                 np.ndarray[np.float64_t, ndim=2, mode="c"] regions_hi):
+                 np.ndarray[np.float64_t, ndim=2, mode="c"] regions_hi,
+                 ids=None):
     """Builds a spatial index from a set of maximum bounding regions (MBRs).
 
     regions_lo and regions_hi must have the same size.
     regions_lo[i] and regions_hi[i] contain the coordinates of the diagonally
     opposite lower and higher corners of the i-th MBR, respectively.
+    ids[i], if provided, is the identifier of the i-th MBR, which
+    otherwise is i.
     """
     cdef:
         SpatialIndex spatial_index
         int64_t i
         uint32_t dim
         RTError err
+        np.ndarray[np.int64_t, ndim=1, mode="c"] ids_
 
     assert regions_lo.shape[0] == regions_hi.shape[0]
     assert regions_lo.shape[1] == regions_hi.shape[1]
     dim = regions_lo.shape[1]
+    if ids is None:
+        ids_ = np.arange(len(regions_lo), dtype=np.int64)
+    else:
+        ids_ = np.ascontiguousarray(ids, dtype=np.int64)
+        assert ids_.shape[0] == regions_lo.shape[0]
 
     spatial_index = SpatialIndex(dim)
     for i in xrange(len(regions_lo)):
-        err = Index_InsertData(spatial_index.index, i, &regions_lo[i, 0], &regions_hi[i, 0], dim, NULL, 0)
+        err = Index_InsertData(spatial_index.index, ids_[i], &regions_lo[i, 0], &regions_hi[i, 0], dim, NULL, 0)
         if err != RT_None:
             raise RuntimeError("failed to insert data into spatial index")
     return spatial_index
@@ -8,6 +8,7 @@ import gzip
 import os
 import zlib
 import tempfile
+import time
 import collections
 
 import ufl
@@ -27,6 +28,12 @@ from firedrake.formmanipulation import split_form
 from firedrake.parameters import parameters as default_parameters
 
 
+compile_stats = {"time": 0.0, "count": 0}
+"""The total time spent compiling forms to kernels on this process,
+and the number of forms compiled.  This excludes the compilation of
+the generated C code, which happens when a kernel is first run."""
+
+
 KernelInfo = collections.namedtuple("KernelInfo",
                                     ["kernel",
                                      "integral_type",
@@ -110,6 +117,7 @@ class TSFCKernel(Cached):
         if self._initialized:
             return
 
+        start = time.perf_counter()
         tree = tsfc_compile_form(form, prefix=name, parameters=parameters)
         kernels = []
         for kernel in tree:
@@ -129,6 +137,8 @@ class TSFCKernel(Cached):
                                       pass_layer_arg=False))
         self.kernels = tuple(kernels)
         self._initialized = True
+        compile_stats["time"] += time.perf_counter() - start
+        compile_stats["count"] += 1
 
 
 SplitKernel = collections.namedtuple("SplitKernel", ["indices",
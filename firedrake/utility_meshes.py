@@ -28,6 +28,112 @@ __all__ = ['IntervalMesh', 'UnitIntervalMesh',
            'TorusMesh', 'CylinderMesh']
 
 
+def _generate_distributed(comm, distribute, ncells):
+    """Should a utility mesh be generated in distributed form?
+
+    :arg comm: the communicator of the mesh.
+    :arg distribute: the ``distribute`` argument of the mesh.
+    :arg ncells: the number of blocks of cells to share out.
+
+    Structured meshes are generated directly in distributed form,
+    each process building a contiguous block of the cells and
+    vertices, so that no process holds the whole mesh.  This is not
+    done if the mesh is not to be distributed, an explicit partition
+    is given, or some process would get no cells.
+    """
+    return comm.size > 1 and distribute in (None, True) and ncells >= comm.size
+
+
+def _mark_boundary_faces(plex, boundary, markers):
+    """Label boundary faces of a mesh by their position.
+
+    :arg plex: the DMPlex.
+    :arg boundary: the name of the label marking boundary faces.
+    :arg markers: an iterable of ``(marker, axis, value, tol)``
+        tuples.  Faces all of whose vertices have their ``axis``
+        coordinate within ``tol`` of ``value`` are marked with
+        ``marker``.
+    """
+    plex.createLabel(dmplex.FACE_SETS_LABEL)
+    coords = plex.getCoordinatesLocal()
+    coord_sec = plex.getCoordinateSection()
+    gdim = plex.getCoordinateDim()
+    if plex.getStratumSize(boundary, 1) > 0:
+        boundary_faces = plex.getStratumIS(boundary, 1).getIndices()
+        for face in boundary_faces:
+            face_coords = plex.vecGetClosure(coord_sec, coords, face).reshape(-1, gdim)
+            for marker, axis, value, tol in markers:
+                if all(abs(face_coords[:, axis] - value) < tol):
+                    plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, marker)
+
+
+def _rectangle_cells(nx, ny, start, end, quadrilateral, diagonal):
+    """Return the cells of a structured rectangle mesh.
+
+    :arg nx: The number of cells in the x direction
+    :arg ny: The number of cells in the y direction
+    :arg start: The first quadrilateral to generate
+    :arg end: One past the last quadrilateral to generate
+    :arg quadrilateral: Generate quadrilaterals (or split each
+        quadrilateral into two triangles)?
+    :arg diagonal: The direction of the diagonal for triangles, see
+        :func:`RectangleMesh`.
+    :returns: The vertices of each cell.
+
+    Quadrilaterals are numbered with y moving fastest, and vertex
+    ``i*(ny + 1) + j`` lies at the ``i``th x and ``j``th y coordinate.
+    """
+    q = np.arange(start, end, dtype=np.int64)
+    i, j = q // ny, q % ny
+    cells = np.stack([i*(ny+1) + j, i*(ny+1) + j+1, (i+1)*(ny+1) + j+1, (i+1)*(ny+1) + j],
+                     axis=1).astype(np.int32)
+    if not quadrilateral:
+        if diagonal == "left":
+            idx = [0, 1, 3, 1, 2, 3]
+        elif diagonal == "right":
+            idx = [0, 1, 2, 0, 2, 3]
+        else:
+            raise ValueError("Unrecognised value for diagonal '%r'", diagonal)
+        # two cells per cell above...
+        cells = cells[:, idx].reshape(-1, 3)
+    return cells
+
+
+def _box_cells(nx, ny, nz, start, end):
+    """Return the tetrahedra of a structured box mesh.
+
+    :arg nx: The number of cells in the x direction
+    :arg ny: The number of cells in the y direction
+    :arg nz: The number of cells in the z direction
+    :arg start: The first hexahedron to generate
+    :arg end: One past the last hexahedron to generate
+    :returns: The vertices of each cell, six per hexahedron.
+
+    Hexahedra and vertices are numbered with x moving fastest, then y,
+    then z.
+    """
+    h = np.arange(start, end, dtype=np.int64)
+    i = h % nx
+    j = (h // nx) % ny
+    k = h // (nx*ny)
+    v0 = k*(nx + 1)*(ny + 1) + j*(nx + 1) + i
+    v1 = v0 + 1
+    v2 = v0 + (nx + 1)
+    v3 = v1 + (nx + 1)
+    v4 = v0 + (nx + 1)*(ny + 1)
+    v5 = v1 + (nx + 1)*(ny + 1)
+    v6 = v2 + (nx + 1)*(ny + 1)
+    v7 = v3 + (nx + 1)*(ny + 1)
+
+    cells = [v0, v1, v3, v7,
+             v0, v1, v7, v5,
+             v0, v5, v7, v4,
+             v0, v3, v2, v7,
+             v0, v6, v4, v7,
+             v0, v2, v6, v7]
+    return np.stack(cells, axis=1).reshape(-1, 4).astype(np.int32)
+
+
 def IntervalMesh(ncells, length_or_left, right=None, distribute=None, comm=COMM_WORLD):
     """
     Generate a uniform mesh of an interval.
@@ -359,43 +465,27 @@ def RectangleMesh(nx, ny, Lx, Ly, quadrilateral=False, reorder=None,
 
     xcoords = np.linspace(0.0, Lx, nx + 1, dtype=np.double)
     ycoords = np.linspace(0.0, Ly, ny + 1, dtype=np.double)
-    coords = np.asarray(np.meshgrid(xcoords, ycoords)).swapaxes(0, 2).reshape(-1, 2)
-
-    # cell vertices
-    i, j = np.meshgrid(np.arange(nx, dtype=np.int32), np.arange(ny, dtype=np.int32))
-    cells = [i*(ny+1) + j, i*(ny+1) + j+1, (i+1)*(ny+1) + j+1, (i+1)*(ny+1) + j]
-    cells = np.asarray(cells).swapaxes(0, 2).reshape(-1, 4)
-    if not quadrilateral:
-        if diagonal == "left":
-            idx = [0, 1, 3, 1, 2, 3]
-        elif diagonal == "right":
-            idx = [0, 1, 2, 0, 2, 3]
-        else:
-            raise ValueError("Unrecognised value for diagonal '%r'", diagonal)
-        # two cells per cell above...
-        cells = cells[:, idx].reshape(-1, 3)
 
-    plex = mesh._from_cell_list(2, cells, coords, comm)
+    if _generate_distributed(comm, distribute, nx*ny):
+        # Each process generates a block of cells and vertices
+        cells = _rectangle_cells(nx, ny, *mesh._block(nx*ny, comm.rank, comm.size),
+                                 quadrilateral=quadrilateral, diagonal=diagonal)
+        v = np.arange(*mesh._block((nx + 1)*(ny + 1), comm.rank, comm.size))
+        coords = np.stack([xcoords[v // (ny + 1)], ycoords[v % (ny + 1)]], axis=1)
+        plex = mesh._from_distributed_cell_list(2, cells, coords, comm)
+        boundary = "exterior_facets"
+    else:
+        coords = np.asarray(np.meshgrid(xcoords, ycoords)).swapaxes(0, 2).reshape(-1, 2)
+        cells = _rectangle_cells(nx, ny, 0, nx*ny, quadrilateral, diagonal)
+        plex = mesh._from_cell_list(2, cells, coords, comm)
+        boundary = "boundary_faces"
+        plex.markBoundaryFaces(boundary)
 
     # mark boundary facets
-    plex.createLabel(dmplex.FACE_SETS_LABEL)
-    plex.markBoundaryFaces("boundary_faces")
-    coords = plex.getCoordinates()
-    coord_sec = plex.getCoordinateSection()
-    if plex.getStratumSize("boundary_faces", 1) > 0:
-        boundary_faces = plex.getStratumIS("boundary_faces", 1).getIndices()
-        xtol = Lx/(2*nx)
-        ytol = Ly/(2*ny)
-        for face in boundary_faces:
-            face_coords = plex.vecGetClosure(coord_sec, coords, face)
-            if abs(face_coords[0]) < xtol and abs(face_coords[2]) < xtol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 1)
-            if abs(face_coords[0] - Lx) < xtol and abs(face_coords[2] - Lx) < xtol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 2)
-            if abs(face_coords[1]) < ytol and abs(face_coords[3]) < ytol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 3)
-            if abs(face_coords[1] - Ly) < ytol and abs(face_coords[3] - Ly) < ytol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 4)
+    xtol = Lx/(2*nx)
+    ytol = Ly/(2*ny)
+    _mark_boundary_faces(plex, boundary, [(1, 0, 0, xtol), (2, 0, Lx, xtol),
+                                          (3, 1, 0, ytol), (4, 1, Ly, ytol)])
 
     return mesh.Mesh(plex, reorder=reorder, distribute=distribute)
 
@@ -673,54 +763,31 @@ def BoxMesh(nx, ny, nz, Lx, Ly, Lz, reorder=None, distribute=None, comm=COMM_WOR
     xcoords = np.linspace(0, Lx, nx + 1, dtype=np.double)
     ycoords = np.linspace(0, Ly, ny + 1, dtype=np.double)
     zcoords = np.linspace(0, Lz, nz + 1, dtype=np.double)
-    # X moves fastest, then Y, then Z
-    coords = np.asarray(np.meshgrid(xcoords, ycoords, zcoords)).swapaxes(0, 3).reshape(-1, 3)
-    i, j, k = np.meshgrid(np.arange(nx, dtype=np.int32),
-                          np.arange(ny, dtype=np.int32),
-                          np.arange(nz, dtype=np.int32))
-    v0 = k*(nx + 1)*(ny + 1) + j*(nx + 1) + i
-    v1 = v0 + 1
-    v2 = v0 + (nx + 1)
-    v3 = v1 + (nx + 1)
-    v4 = v0 + (nx + 1)*(ny + 1)
-    v5 = v1 + (nx + 1)*(ny + 1)
-    v6 = v2 + (nx + 1)*(ny + 1)
-    v7 = v3 + (nx + 1)*(ny + 1)
-
-    cells = [v0, v1, v3, v7,
-             v0, v1, v7, v5,
-             v0, v5, v7, v4,
-             v0, v3, v2, v7,
-             v0, v6, v4, v7,
-             v0, v2, v6, v7]
-    cells = np.asarray(cells).swapaxes(0, 3).reshape(-1, 4)
 
-    plex = mesh._from_cell_list(3, cells, coords, comm)
+    if _generate_distributed(comm, distribute, nx*ny*nz):
+        # Each process generates a block of cells and vertices
+        cells = _box_cells(nx, ny, nz, *mesh._block(nx*ny*nz, comm.rank, comm.size))
+        v = np.arange(*mesh._block((nx + 1)*(ny + 1)*(nz + 1), comm.rank, comm.size))
+        coords = np.stack([xcoords[v % (nx + 1)],
+                           ycoords[(v // (nx + 1)) % (ny + 1)],
+                           zcoords[v // ((nx + 1)*(ny + 1))]], axis=1)
+        plex = mesh._from_distributed_cell_list(3, cells, coords, comm)
+        boundary = "exterior_facets"
+    else:
+        # X moves fastest, then Y, then Z
+        coords = np.asarray(np.meshgrid(xcoords, ycoords, zcoords)).swapaxes(0, 3).reshape(-1, 3)
+        cells = _box_cells(nx, ny, nz, 0, nx*ny*nz)
+        plex = mesh._from_cell_list(3, cells, coords, comm)
+        boundary = "boundary_faces"
+        plex.markBoundaryFaces(boundary)
 
     # Apply boundary IDs
-    plex.createLabel(dmplex.FACE_SETS_LABEL)
-    plex.markBoundaryFaces("boundary_faces")
-    coords = plex.getCoordinates()
-    coord_sec = plex.getCoordinateSection()
-    if plex.getStratumSize("boundary_faces", 1) > 0:
-        boundary_faces = plex.getStratumIS("boundary_faces", 1).getIndices()
-        xtol = Lx/(2*nx)
-        ytol = Ly/(2*ny)
-        ztol = Lz/(2*nz)
-        for face in boundary_faces:
-            face_coords = plex.vecGetClosure(coord_sec, coords, face)
-            if abs(face_coords[0]) < xtol and abs(face_coords[3]) < xtol and abs(face_coords[6]) < xtol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 1)
-            if abs(face_coords[0] - Lx) < xtol and abs(face_coords[3] - Lx) < xtol and abs(face_coords[6] - Lx) < xtol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 2)
-            if abs(face_coords[1]) < ytol and abs(face_coords[4]) < ytol and abs(face_coords[7]) < ytol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 3)
-            if abs(face_coords[1] - Ly) < ytol and abs(face_coords[4] - Ly) < ytol and abs(face_coords[7] - Ly) < ytol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 4)
-            if abs(face_coords[2]) < ztol and abs(face_coords[5]) < ztol and abs(face_coords[8]) < ztol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 5)
-            if abs(face_coords[2] - Lz) < ztol and abs(face_coords[5] - Lz) < ztol and abs(face_coords[8] - Lz) < ztol:
-                plex.setLabelValue(dmplex.FACE_SETS_LABEL, face, 6)
+    xtol = Lx/(2*nx)
+    ytol = Ly/(2*ny)
+    ztol = Lz/(2*nz)
+    _mark_boundary_faces(plex, boundary, [(1, 0, 0, xtol), (2, 0, Lx, xtol),
+                                          (3, 1, 0, ytol), (4, 1, Ly, ytol),
+                                          (5, 2, 0, ztol), (6, 2, Lz, ztol)])
 
     return mesh.Mesh(plex, reorder=reorder, distribute=distribute)
 
@@ -124,6 +124,41 @@ class NonlinearVariationalSolver(solving_utils.ParametersMixin):
             solver = NonlinearVariationalSolver(problem,
                                                 pre_jacobian_callback=update_diffusivity)
 
+        The Jacobian (and preconditioner) may be reused across Newton
+        iterations and calls to :meth:`solve` by setting
+        ``"lag_jacobian_type"`` in the ``solver_parameters`` to one
+        of ``"fixed"``, ``"residual"`` or ``"ksp_iterations"``.  The
+        policy is tuned by ``"lag_jacobian_max_age"``,
+        ``"lag_jacobian_residual_ratio"``,
+        ``"lag_jacobian_ksp_growth"`` and
+        ``"lag_jacobian_persists"``, see
+        :class:`~.JacobianLagging`.  If a solve with a reused
+        Jacobian fails to converge, it is repeated once from the
+        initial guess, starting with a freshly assembled Jacobian.
+        The number of assemblies avoided is reported by
+        :attr:`jacobian_statistics`.
+
+        To start each solve from a guess computed from the previous
+        solutions, set ``"initial_guess_type"`` to ``"extrapolate"``
+        or ``"projection"``, and ``"initial_guess_history"`` to the
+        number of solutions to keep, see :class:`~.SolutionHistory`.
+
+        Calling ``solver.profile.enable()`` records the time spent in
+        each phase of every subsequent solve, see
+        :class:`~.SolverProfile`.
+
+        Setting ``"jacobian"`` to ``"fd"`` applies the Jacobian by
+        finite differences of the residual (Jacobian-free
+        Newton-Krylov), see :class:`~.FiniteDifferenceJacobian`.
+        Only the preconditioner is assembled, from the problem's
+        ``Jp`` if given (otherwise from its Jacobian), with matrix
+        type ``"pmat_type"``.  It may be lagged with
+        ``"lag_jacobian_type"`` while the operator stays exact.
+
+        Setting ``"mat_type"`` to ``"partial"`` stores the element
+        matrices of the Jacobian, and applies it without assembling
+        the global matrix, see :class:`~.PartiallyAssembledMatrix`.
+        As for ``"matfree"``, there is no preconditioner by default.
         """
         assert isinstance(problem, NonlinearVariationalProblem)
 
@@ -142,8 +177,13 @@ class NonlinearVariationalSolver(solving_utils.ParametersMixin):
         # Allow anything, interpret "matfree" as matrix_free.
         mat_type = self.parameters.get("mat_type")
         pmat_type = self.parameters.get("pmat_type")
-        matfree = mat_type == "matfree"
-        pmatfree = pmat_type == "matfree"
+        jacobian = self.parameters.get("jacobian", "assembled")
+        # Neither matrix-free nor partially assembled matrices can
+        # be used by most preconditioners.
+        unassembled = {"matfree", "partial"}
+        # With a finite difference Jacobian, the operator is always
+        # matrix-free, and mat_type only sets the default pmat_type.
+        matfree = mat_type in unassembled and jacobian != "fd"
 
         appctx = kwargs.get("appctx")
 
@@ -152,20 +192,45 @@ class NonlinearVariationalSolver(solving_utils.ParametersMixin):
                                          pmat_type=pmat_type,
                                          appctx=appctx,
                                          pre_jacobian_callback=pre_j_callback,
-                                         pre_function_callback=pre_f_callback)
+                                         pre_function_callback=pre_f_callback,
+                                         jacobian=jacobian)
 
         # No preconditioner by default for matrix-free
-        if (problem.Jp is not None and pmatfree) or matfree:
+        pmatfree = ctx.pmat_type in unassembled
+        pc_matfree = ((problem.Jp is not None or jacobian == "fd") and pmatfree) or matfree
+        if pc_matfree:
             self.set_default_parameter("pc_type", "none")
         elif ctx.is_mixed:
             # Mixed problem, use jacobi pc if user has not supplied
             # one.
             self.set_default_parameter("pc_type", "jacobi")
 
+        lag_type = self.parameters.get("lag_jacobian_type")
+        if lag_type is not None:
+            max_age = self.parameters.get("lag_jacobian_max_age")
+            persists = self.parameters.get("lag_jacobian_persists", True)
+            if isinstance(persists, str):
+                persists = persists.lower() not in {"0", "false", "no"}
+            ctx._lagging = solving_utils.JacobianLagging(
+                lag_type,
+                max_age=None if max_age is None else int(max_age),
+                residual_ratio=float(self.parameters.get("lag_jacobian_residual_ratio", 0.5)),
+                ksp_growth=float(self.parameters.get("lag_jacobian_ksp_growth", 2.0)),
+                persists=persists)
+
+        guess_type = self.parameters.get("initial_guess_type")
+        if guess_type is not None:
+            size = self.parameters.get("initial_guess_history")
+            ctx._solution_history = solving_utils.SolutionHistory(
+                problem.u.function_space(), guess_type,
+                size=None if size is None else int(size))
+
         self.snes = PETSc.SNES().create(comm=problem.dm.comm)
 
         self._problem = problem
 
+        self.profile = solving_utils.SolverProfile(problem.u.function_space().mesh().comm)
+        ctx._profile = self.profile
         self._ctx = ctx
         self._work = problem.u.dof_dset.layout_vec.duplicate()
         self.snes.setDM(problem.dm)
@@ -202,23 +267,65 @@ class NonlinearVariationalSolver(solving_utils.ParametersMixin):
         # Make sure appcontext is attached to the DM before we solve.
         dm = self.snes.getDM()
         dmhooks.set_appctx(dm, self._ctx)
+        with self.profile.solve(self.snes):
+            self._solve(bounds)
+        solving_utils.check_snes_convergence(self.snes)
+        history = self._ctx._solution_history
+        if history is not None:
+            history.push(self._problem.u)
+
+    def _solve(self, bounds):
+        """Apply the boundary conditions and run the SNES."""
         # Apply the boundary conditions to the initial guess.
-        for bc in self._problem.bcs:
-            bc.apply(self._problem.u)
+        with self.profile.timed("bc_time"):
+            for bc in self._problem.bcs:
+                bc.apply(self._problem.u)
 
         if bounds is not None:
             lower, upper = bounds
             with lower.dat.vec_ro as lb, upper.dat.vec_ro as ub:
                 self.snes.setVariableBounds(lb, ub)
         work = self._work
+        lagging = self._ctx._lagging
+        history = self._ctx._solution_history
+        if lagging is not None:
+            lagging.start()
+        if history is not None:
+            history.start()
         # Ensure options database has full set of options (so monitors work right)
         with self.inserted_options():
             with self._problem.u.dat.vec as u:
                 u.copy(work)
                 self.snes.solve(None, work)
+                if lagging is not None and lagging.reused and \
+                   self.snes.getConvergedReason() < 0:
+                    # Maybe the stale Jacobian was to blame, try again
+                    # from the initial guess with a fresh one.
+                    lagging.invalidate()
+                    lagging.start()
+                    if history is not None:
+                        history.start()
+                    u.copy(work)
+                    self.snes.solve(None, work)
+                if history is not None:
+                    history.finish(self.snes)
                 work.copy(u)
 
-        solving_utils.check_snes_convergence(self.snes)
+    @property
+    def jacobian_statistics(self):
+        """Counts of the Jacobian assemblies performed and avoided.
+
+        A dict with keys ``"assemblies"`` (the number of times the
+        Jacobian was assembled), ``"assemblies_avoided"`` (the number
+        of times an assembled Jacobian was reused instead, because it
+        is constant or lagged) and ``"pc_setups_avoided"`` (the
+        number of those for which the preconditioning matrix was
+        unchanged, so the preconditioner was not set up again).
+        """
+        ctx = self._ctx
+        return {"assemblies": ctx._jacobian_assemblies,
+                "assemblies_avoided": ctx._jacobian_reuses,
+                "pc_setups_avoided": ctx._pc_setups_avoided}
 
 
 class LinearVariationalProblem(NonlinearVariationalProblem):
@@ -0,0 +1,60 @@
+from firedrake import *
+import pytest
+
+
+benchmark = pytest.mark.benchmark(warmup=True, disable_gc=True, warmup_iterations=1)
+
+
+dataset_options = [dict(),
+                   dict(chunk_size=2**14),
+                   dict(chunk_size=2**14, compression="gzip", compression_opts=1),
+                   dict(chunk_size=2**14, compression="gzip", compression_opts=1, shuffle=True),
+                   dict(chunk_size=2**16, compression="gzip", compression_opts=4, shuffle=True)]
+
+
+dataset_ids = ["contiguous", "chunked", "gzip1", "gzip1-shuffle", "gzip4-shuffle"]
+
+
+@pytest.fixture(scope="module")
+def f():
+    m = UnitSquareMesh(64, 64)
+    V = FunctionSpace(m, "CG", 3)
+    f = Function(V, name="f")
+    x, y = SpatialCoordinate(m)
+    f.interpolate(sin(3*x)*cos(2*y))
+    return f
+
+
+@benchmark
+@pytest.mark.parametrize("options", dataset_options, ids=dataset_ids)
+def test_hdf5file_write(f, options, tmpdir, benchmark):
+    dumpfile = f.comm.bcast(str(tmpdir.join("dump.h5")), root=0)
+    with HDF5File(dumpfile, "w", comm=f.comm, **options) as h5:
+        timestamps = iter(range(10**6))
+        benchmark(lambda: h5.write(f, "/solution", timestamp=next(timestamps)))
+
+
+@benchmark
+@pytest.mark.parametrize("options", dataset_options, ids=dataset_ids)
+def test_dumb_checkpoint_store(f, options, tmpdir, benchmark):
+    dumpfile = f.comm.bcast(str(tmpdir.join("dump")), root=0)
+    with DumbCheckpoint(dumpfile, mode=FILE_CREATE, comm=f.comm, **options) as chk:
+        def store():
+            chk.set_timestep(0.0)
+            chk.store(f)
+        benchmark(store)
+
+
+@benchmark
+def test_nearest_timestamp(f, tmpdir, benchmark):
+    dumpfile = f.comm.bcast(str(tmpdir.join("dump.h5")), root=0)
+    with HDF5File(dumpfile, "w", comm=f.comm) as h5:
+        for t in range(10**5):
+            h5._set_timestamp(0.1*t)
+    with HDF5File(dumpfile, "r", comm=f.comm) as h5:
+        benchmark(lambda: h5.get_nearest_timestamp(1234.56))
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -0,0 +1,43 @@
+from firedrake import *
+import pytest
+
+
+benchmark = pytest.mark.benchmark(warmup=True, disable_gc=True, warmup_iterations=1)
+
+
+@benchmark
+@pytest.mark.parametrize("jacobian", ["aij", "matfree", "fd"])
+def test_nonlinear_solve(jacobian, benchmark):
+    """Compare a Newton solve with an assembled Jacobian, a
+    matrix-free Jacobian and a finite difference Jacobian, the
+    latter two preconditioned by the assembled Laplacian."""
+    mesh = UnitSquareMesh(64, 64)
+    V = FunctionSpace(mesh, "CG", 2)
+    u = Function(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+    F = inner((1 + u**2)*grad(u), grad(v))*dx + exp(u)*v*dx - sin(pi*x)*sin(pi*y)*v*dx
+    bcs = DirichletBC(V, 0, (1, 2, 3, 4))
+
+    parameters = {"snes_rtol": 1e-8,
+                  "ksp_type": "gmres",
+                  "ksp_rtol": 1e-6,
+                  "pc_type": "hypre"}
+    Jp = None
+    if jacobian == "aij":
+        parameters["mat_type"] = "aij"
+    else:
+        Jp = inner(grad(TrialFunction(V)), grad(v))*dx
+        if jacobian == "matfree":
+            parameters["mat_type"] = "matfree"
+            parameters["pmat_type"] = "aij"
+        else:
+            parameters["jacobian"] = "fd"
+    problem = NonlinearVariationalProblem(F, u, bcs=bcs, Jp=Jp)
+    solver = NonlinearVariationalSolver(problem, solver_parameters=parameters)
+
+    def run():
+        u.assign(0)
+        solver.solve()
+
+    benchmark(run)
@@ -0,0 +1,62 @@
+from firedrake import *
+import numpy as np
+import pytest
+
+
+benchmark = pytest.mark.benchmark(warmup=True, disable_gc=True, warmup_iterations=1)
+
+
+orderings = [False, "rcm", "hilbert", "morton"]
+
+
+ordering_ids = ["none", "rcm", "hilbert", "morton"]
+
+
+@pytest.fixture(params=[("square", False), ("square", True), ("cube", False)],
+                ids=["triangles", "quadrilaterals", "tetrahedra"])
+def make_mesh(request):
+    shape, quadrilateral = request.param
+
+    def make_mesh(reorder):
+        if shape == "square":
+            return UnitSquareMesh(128, 128, quadrilateral=quadrilateral, reorder=reorder)
+        else:
+            return UnitCubeMesh(24, 24, 24, reorder=reorder)
+    return make_mesh
+
+
+def map_spread(V):
+    """Mean spread of the node numbers of each cell, a proxy for the
+    number of cache lines touched per cell."""
+    cell_nodes = V.cell_node_list
+    return np.mean(cell_nodes.max(axis=1) - cell_nodes.min(axis=1))
+
+
+def jump_distance(V):
+    """Mean distance between the first node of consecutive cells, a
+    proxy for reuse of cache lines between cells."""
+    return np.mean(np.abs(np.diff(V.cell_node_list[:, 0])))
+
+
+@benchmark
+@pytest.mark.parametrize("reorder", orderings, ids=ordering_ids)
+def test_assemble_reordered(make_mesh, reorder, benchmark):
+    mesh = make_mesh(reorder)
+    V = FunctionSpace(mesh, "CG", 2)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    f = Function(V).assign(1)
+    A = assemble(inner(grad(u), grad(v))*dx)
+    b = assemble(f*v*dx)
+
+    benchmark.extra_info["map_spread"] = float(map_spread(V))
+    benchmark.extra_info["jump_distance"] = float(jump_distance(V))
+    # Bytes moved by a residual assembly: coefficient and residual
+    # dofs plus coordinates, once per cell.
+    nbytes = V.cell_node_list.size * 2 * 8 + mesh.coordinates.dat.data_ro.nbytes
+    benchmark.extra_info["bytes"] = nbytes
+
+    def run():
+        assemble(inner(grad(u), grad(v))*dx, tensor=A)
+        assemble(f*v*dx, tensor=b)
+    benchmark(run)
@@ -0,0 +1,44 @@
+from firedrake import *
+import pytest
+
+
+benchmark = pytest.mark.benchmark(warmup=True, disable_gc=True, warmup_iterations=1)
+
+
+@pytest.fixture(params=["quadrilateral", "extruded"])
+def mesh(request):
+    if request.param == "quadrilateral":
+        return UnitSquareMesh(32, 32, quadrilateral=True)
+    else:
+        return ExtrudedMesh(UnitSquareMesh(6, 6, quadrilateral=True), 6)
+
+
+@benchmark
+@pytest.mark.parametrize("degree", range(1, 9))
+@pytest.mark.parametrize("mat_type", ["aij", "matfree", "matfree-dense"])
+def test_operator_application(mesh, degree, mat_type, benchmark):
+    """Apply a variable coefficient Helmholtz operator as an assembled
+    matrix, matrix-free with sum-factorised kernels (the default on
+    tensor-product cells), and matrix-free with dense kernels."""
+    V = FunctionSpace(mesh, "CG", degree)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x = SpatialCoordinate(mesh)
+    a = (1 + x[0]*x[1])*inner(grad(u), grad(v))*dx + u*v*dx
+
+    if mat_type == "matfree-dense":
+        A = assemble(a, mat_type="matfree",
+                     form_compiler_parameters={"mode": "coffee"})
+    else:
+        A = assemble(a, mat_type=mat_type)
+    A.force_evaluation()
+
+    f = Function(V).assign(1)
+    y = Function(V)
+
+    def run():
+        with f.dat.vec_ro as xv, y.dat.vec as yv:
+            for _ in range(10):
+                A.petscmat.mult(xv, yv)
+
+    benchmark(run)
@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    return ExtrudedMesh(UnitSquareMesh(3, 3), 5)
+
+
+def test_column_cumulative_sum(mesh):
+    V = FunctionSpace(mesh, "DG", 0)
+    f = Function(V).interpolate(SpatialCoordinate(mesh)[2])
+    g = Function(V)
+    par_loop("""
+double s = 0;
+for (int k = 0; k < f.layers; k++) {
+    s += f[k*f.dofs][0];
+    g[k*g.dofs][0] = s;
+}""", columns, {"f": (f, READ), "g": (g, WRITE)})
+    z = (np.arange(5) + 0.5)/5
+    assert np.allclose(g.dat.data_ro.reshape(-1, 5), np.cumsum(z))
+
+
+def test_column_vertical_nodes(mesh):
+    # Nodes shared by vertically adjacent cells appear once per cell
+    element = TensorProductElement(FiniteElement("DG", triangle, 0),
+                                   FiniteElement("CG", interval, 1))
+    V = FunctionSpace(mesh, element)
+    f = Function(V)
+    par_loop("""
+for (int k = 0; k < f.layers; k++) {
+    for (int i = 0; i < f.dofs; i++) {
+        f[k*f.dofs + i][0] += 1;
+    }
+}""", columns, {"f": (f, INC)})
+    assert np.allclose(f.dat.data_ro.reshape(-1, 6), [1, 2, 2, 2, 2, 1])
+
+
+def test_column_map_shape(mesh):
+    V = FunctionSpace(mesh, "DG", 1)
+    m = V.column_node_map()
+    assert m.arity == 5*V.finat_element.space_dimension()
+    assert m.iterset is mesh.cell_set.parent
+    assert V.column_node_map() is m
+
+
+def test_column_loop_not_extruded():
+    mesh = UnitSquareMesh(1, 1)
+    f = Function(FunctionSpace(mesh, "DG", 0))
+    with pytest.raises(ValueError):
+        par_loop("", columns, {"f": (f, WRITE)})
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
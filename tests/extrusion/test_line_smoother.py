@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+@pytest.fixture
+def mesh():
+    return ExtrudedMesh(UnitSquareMesh(3, 3), 6)
+
+
+@pytest.fixture(params=["DG1", "DG0xCG2", "vector"])
+def V(request, mesh):
+    if request.param == "DG1":
+        return FunctionSpace(mesh, "DG", 1)
+    elif request.param == "DG0xCG2":
+        element = TensorProductElement(FiniteElement("DG", triangle, 0),
+                                       FiniteElement("CG", interval, 2))
+        return FunctionSpace(mesh, element)
+    else:
+        return VectorFunctionSpace(mesh, "DG", 1)
+
+
+def vertical_problem(V):
+    # Only couples degrees of freedom in the same column
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x = SpatialCoordinate(V.mesh())
+    a = (inner(u, v) + inner(u.dx(2), v.dx(2)))*dx + inner(jump(u), jump(v))*dS_h
+    if V.ufl_element().value_shape():
+        f = as_vector([x[0]*x[2], x[1] - x[2], sin(x[2])])
+    else:
+        f = x[0]*x[2] + sin(x[2])
+    L = inner(f, v)*dx
+    return a, L
+
+
+line_parameters = {"ksp_type": "preonly",
+                   "pc_type": "python",
+                   "pc_python_type": "firedrake.LineSmootherPC"}
+
+
+@pytest.mark.parametrize("mat_type", ["aij", "matfree"])
+def test_line_smoother_exact(V, mat_type):
+    a, L = vertical_problem(V)
+    expected = Function(V)
+    solve(a == L, expected, solver_parameters={"ksp_type": "preonly",
+                                               "pc_type": "lu"})
+    u = Function(V)
+    solve(a == L, u, solver_parameters=dict(line_parameters, mat_type=mat_type))
+    assert np.allclose(u.dat.data_ro, expected.dat.data_ro)
+
+
+@pytest.mark.parallel(nprocs=2)
+def test_line_smoother_exact_parallel():
+    mesh = ExtrudedMesh(UnitSquareMesh(4, 4), 6)
+    V = FunctionSpace(mesh, "DG", 1)
+    a, L = vertical_problem(V)
+    expected = Function(V)
+    solve(a == L, expected, solver_parameters={"ksp_type": "preonly",
+                                               "pc_type": "lu",
+                                               "pc_factor_mat_solver_package": "mumps"})
+    u = Function(V)
+    solve(a == L, u, solver_parameters=line_parameters)
+    assert np.allclose(u.dat.data_ro, expected.dat.data_ro)
+
+
+def test_line_smoother_anisotropic(mesh):
+    # Continuous space with weak horizontal coupling
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    a = (1e-3*inner(grad(u), grad(v)) + 1e3*u.dx(2)*v.dx(2) + u*v)*dx
+    L = v*dx
+    u = Function(V)
+    solver = LinearVariationalSolver(
+        LinearVariationalProblem(a, L, u),
+        solver_parameters={"ksp_type": "cg",
+                           "ksp_rtol": 1e-10,
+                           "pc_type": "python",
+                           "pc_python_type": "firedrake.LineSmootherPC"})
+    solver.solve()
+    assert solver.snes.ksp.getIterationNumber() < 10
+    assert np.allclose(u.dat.data_ro, 1)
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
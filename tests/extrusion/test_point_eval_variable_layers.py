@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from firedrake import *
+from pyop2.datatypes import IntType
+
+
+@pytest.fixture(scope="module")
+def mesh():
+    # Columns of 2 to 4 cells, starting at layer 0 or 1
+    base = UnitIntervalMesh(10)
+    layers = np.empty((10, 2), dtype=IntType)
+    for i in range(10):
+        layers[i] = [i % 2, i % 2 + 3 + i % 3]
+    return ExtrudedMesh(base, layers=layers, layer_height=0.25)
+
+
+def cell_midpoints():
+    points = []
+    for i in range(10):
+        start = i % 2
+        for j in range(2 + i % 3):
+            points.append((0.1*i + 0.05, 0.25*(start + j) + 0.125))
+    return np.array(points)
+
+
+@pytest.mark.parametrize(("family", "degree"), [("CG", 1), ("DG", 1), ("DG", 0)])
+def test_point_eval_variable_layers(mesh, family, degree):
+    V = FunctionSpace(mesh, family, degree)
+    x, y = SpatialCoordinate(mesh)
+    f = Function(V).interpolate(x + 2*y)
+    points = cell_midpoints()
+    values = f.at(points)
+    assert np.allclose(values, points[:, 0] + 2*points[:, 1])
+    if degree > 0:
+        # Just below the top of the first column
+        assert np.allclose(f.at((0.05, 0.5 - 1e-8)), 0.05 + 1.0)
+
+
+def test_point_eval_outside_columns(mesh):
+    V = FunctionSpace(mesh, "CG", 1)
+    f = Function(V).assign(1)
+    # Below the first column of the second cell, above the first column
+    assert f.at((0.15, 0.1), dont_raise=True) is None
+    assert f.at((0.05, 0.8), dont_raise=True) is None
+    assert np.allclose(f.at((0.15, 0.3)), 1)
+
+
+def test_locate_cell_variable_layers(mesh):
+    assert mesh.max_cell_layers == 4
+    # Second cell of the fourth column (which starts at layer 1)
+    cell = mesh.locate_cell((0.35, 0.6))
+    assert cell % mesh.max_cell_layers == 1
+    assert mesh.locate_cell((0.35, 0.1)) is None
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -80,6 +80,69 @@ def test_serial_checkpoint_parallel_load_fails(f, dumpfile):
             chk.load(f)
 
 
+@pytest.mark.parametrize("space", [FunctionSpace, VectorFunctionSpace],
+                         ids=["scalar", "vector"])
+def test_store_load_compressed(space, dumpfile):
+    mesh = UnitSquareMesh(2, 2)
+    V = space(mesh, "CG", 2)
+    f = Function(V, name="f")
+    f.dat.data[:] = np.arange(f.dat.data.size).reshape(f.dat.data.shape)
+    g = Function(V, name="f")
+    with DumbCheckpoint(dumpfile, mode=FILE_CREATE, chunk_size=8,
+                        compression="gzip", shuffle=True) as chk:
+        chk.store(f)
+        chk.load(g)
+        assert chk.h5file["/fields/f"].compression == "gzip"
+
+    assert np.allclose(f.dat.data_ro, g.dat.data_ro)
+
+
+def test_store_load_async(f, dumpfile):
+    g = Function(f.function_space(), name=f.name())
+    with DumbCheckpoint(dumpfile, mode=FILE_CREATE, async_write=True) as chk:
+        chk.set_timestep(0.1)
+        chk.store(f)
+        chk.set_timestep(0.2)
+        chk.store(f)
+
+    with DumbCheckpoint(dumpfile, mode=FILE_READ) as chk:
+        chk.set_timestep(0.2, idx=1)
+        chk.load(g)
+
+    assert np.allclose(f.dat.data_ro, g.dat.data_ro)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_store_load_async_parallel(dumpfile):
+    dumpfile = COMM_WORLD.bcast(dumpfile, root=0)
+    mesh = UnitSquareMesh(8, 8)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+    t = Constant(0)
+    uh = Function(V, name="u")
+    solver = LinearVariationalSolver(LinearVariationalProblem(u*v*dx, (1 + t)*x*y*v*dx, uh))
+    # Each solve runs while the previous store is in flight
+    with DumbCheckpoint(dumpfile, mode=FILE_CREATE, async_write=True) as chk:
+        for i in range(4):
+            t.assign(i)
+            solver.solve()
+            chk.set_timestep(float(i))
+            chk.store(uh)
+
+    g = Function(V, name="u")
+    with DumbCheckpoint(dumpfile, mode=FILE_READ) as chk:
+        steps, indices = chk.get_timesteps()
+        assert np.allclose(steps, range(4))
+        for i in indices:
+            chk.set_timestep(float(i), idx=i)
+            chk.load(g)
+            t.assign(i)
+            solver.solve()
+            assert np.allclose(g.dat.data_ro, uh.dat.data_ro)
+
+
 def test_checkpoint_fails_for_non_function(dumpfile):
     with DumbCheckpoint(dumpfile, mode=FILE_CREATE) as chk:
         with pytest.raises(ValueError):
@@ -133,6 +196,21 @@ def test_multiple_timesteps(f, dumpfile):
         assert np.allclose(indices, [0, 1])
 
 
+def test_nearest_timestep(f, dumpfile):
+    with DumbCheckpoint(dumpfile, mode=FILE_CREATE) as chk:
+        for i, t in enumerate([0.5, 0.1, 0.3]):
+            chk.set_timestep(t, idx=10*i)
+            chk.store(f)
+
+    with DumbCheckpoint(dumpfile, mode=FILE_READ) as chk:
+        steps, indices = chk.get_timesteps()
+        assert np.allclose(steps, [0.5, 0.1, 0.3])
+        assert np.allclose(indices, [0, 10, 20])
+        assert chk.get_nearest_timestep(0.35) == (0.3, 20)
+        assert chk.get_nearest_timestep(1.0) == (0.5, 0)
+        assert chk.get_nearest_timestep(0.0) == (0.1, 10)
+
+
 def test_new_file(f, dumpfile):
     custom_name = "%s_custom" % dumpfile
     with DumbCheckpoint(dumpfile, single_file=False, mode=FILE_CREATE) as chk:
@@ -71,6 +71,70 @@ def run_write_read(mesh, fs, degree, dumpfile):
     assert np.allclose(f.dat.data_ro, f2.dat.data_ro)
 
 
+@pytest.mark.parametrize("options",
+                         [dict(chunk_size=4),
+                          dict(compression="gzip", shuffle=True),
+                          dict(chunk_size=7, compression="gzip", compression_opts=9)],
+                         ids=["chunked", "gzip-shuffle", "chunked-gzip"])
+def test_write_read_compressed(f, dumpfile, options):
+    g = Function(f.function_space(), name="g")
+    with HDF5File(dumpfile, "w", **options) as h5:
+        h5.write(f, "/solution", timestamp=0.1)
+        h5.read(g, "/solution", timestamp=0.1)
+        dset = h5._h5file["/solution/%.15e" % 0.1]
+        assert dset.chunks is not None
+        assert dset.compression == options.get("compression")
+
+    assert np.allclose(f.dat.data_ro, g.dat.data_ro)
+
+
+def test_write_read_async(f, dumpfile):
+    g = Function(f.function_space(), name="g")
+    h = Function(f.function_space(), name="h")
+    with HDF5File(dumpfile, "w", async_write=True) as h5:
+        h5.write(f, "/solution", timestamp=0.1)
+        # Modifying the function after write must not change the file
+        h.assign(f)
+        f.assign(2*f)
+        h5.write(f, "/solution", timestamp=0.2)
+        h5.wait()
+        h5.read(g, "/solution", timestamp=0.1)
+        assert np.allclose(g.dat.data_ro, h.dat.data_ro)
+        f.assign(0.5*f)
+
+    with HDF5File(dumpfile, "r") as h5:
+        h5.read(g, "/solution", timestamp=0.2)
+        assert np.allclose(g.dat.data_ro, 2*f.dat.data_ro)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_write_read_async_parallel(dumpfile):
+    dumpfile = MPI.COMM_WORLD.bcast(dumpfile, root=0)
+    mesh = UnitSquareMesh(8, 8)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+    t = Constant(0)
+    uh = Function(V, name="u")
+    solver = LinearVariationalSolver(LinearVariationalProblem(u*v*dx, (1 + t)*x*y*v*dx, uh))
+    # Each solve runs while the previous write is in flight
+    with HDF5File(dumpfile, "w", async_write=True) as h5:
+        for i in range(4):
+            t.assign(i)
+            solver.solve()
+            h5.write(uh, "/solution", timestamp=i)
+
+    g = Function(V)
+    with HDF5File(dumpfile, "r") as h5:
+        assert np.allclose(h5.get_timestamps(), range(4))
+        for i in range(4):
+            h5.read(g, "/solution", timestamp=i)
+            t.assign(i)
+            solver.solve()
+            assert np.allclose(g.dat.data_ro, uh.dat.data_ro)
+
+
 def test_checkpoint_fails_for_non_function(dumpfile):
     dumpfile = MPI.COMM_WORLD.bcast(dumpfile, root=0)
     with HDF5File(dumpfile, "w", comm=MPI.COMM_WORLD) as h5:
@@ -130,6 +194,33 @@ def test_multiple_timestamps(f, dumpfile):
         assert np.allclose(timestamps, [0.1, 0.2])
 
 
+def test_nearest_timestamp(f, dumpfile):
+    with HDF5File(dumpfile, "w") as h5:
+        with pytest.raises(ValueError):
+            h5.get_nearest_timestamp(0)
+        for t in [0.1, 0.2, 0.4]:
+            h5.write(f, "/solution", timestamp=t)
+
+    with HDF5File(dumpfile, "r") as h5:
+        assert np.allclose(h5.get_timestamps(), [0.1, 0.2, 0.4])
+        assert h5.get_nearest_timestamp(0.32) == 0.4
+        assert h5.get_nearest_timestamp(-1) == 0.1
+        g = Function(f.function_space())
+        h5.read(g, "/solution", timestamp=h5.get_nearest_timestamp(0.21))
+        assert np.allclose(g.dat.data_ro, f.dat.data_ro)
+
+
+def test_legacy_timestamps(f, dumpfile):
+    with HDF5File(dumpfile, "w") as h5:
+        h5.attributes("/")["stored_timestamps"] = [0.1, 0.2]
+
+    with HDF5File(dumpfile, "a") as h5:
+        assert np.allclose(h5.get_timestamps(), [0.1, 0.2])
+        h5.write(f, "/solution", timestamp=0.3)
+        assert "stored_timestamps" not in h5.attributes("/")
+        assert np.allclose(h5.get_timestamps(), [0.1, 0.2, 0.3])
+
+
 if __name__ == "__main__":
     import os
     pytest.main(os.path.abspath(__file__))
@@ -0,0 +1,175 @@
+import pytest
+from firedrake import *
+from firedrake import dmplex
+from firedrake.petsc import PETSc
+from os.path import abspath, dirname, join
+import numpy as np
+
+
+cwd = abspath(dirname(__file__))
+
+
+@pytest.fixture(params=[False, True],
+                ids=["simplex", "quad"])
+def mesh(request):
+    return UnitSquareMesh(4, 4, quadrilateral=request.param)
+
+
+@pytest.fixture
+def dumpfile(tmpdir):
+    return str(tmpdir.join("mesh.h5"))
+
+
+def run_save_load(mesh, dumpfile):
+    dumpfile = mesh.comm.bcast(dumpfile, root=0)
+    mesh.save(dumpfile)
+
+    loaded = Mesh(dumpfile, comm=mesh.comm)
+
+    assert loaded.name == mesh.name
+    assert np.allclose(loaded.coordinates.dat.data_ro_with_halos,
+                       mesh.coordinates.dat.data_ro_with_halos)
+    assert np.array_equal(loaded.cell_closure, mesh.cell_closure)
+    assert loaded.cell_set.sizes == mesh.cell_set.sizes
+    assert loaded.exterior_facets.set.sizes == mesh.exterior_facets.set.sizes
+    assert np.array_equal(loaded.exterior_facets.markers, mesh.exterior_facets.markers)
+
+    V = FunctionSpace(mesh, "CG", 2)
+    Vl = FunctionSpace(loaded, "CG", 2)
+    assert np.array_equal(V.cell_node_list, Vl.cell_node_list)
+
+    x, y = SpatialCoordinate(mesh)
+    xl, yl = SpatialCoordinate(loaded)
+    assert np.allclose(assemble(x*y*dx + x*ds(1)),
+                       assemble(xl*yl*dx(domain=loaded) + xl*ds(1, domain=loaded)))
+
+    f = Function(Vl)
+    f.interpolate(xl + yl)
+    assert np.allclose(assemble(f*dx), 1.0)
+
+
+def test_save_load(mesh, dumpfile):
+    run_save_load(mesh, dumpfile)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_save_load_parallel(mesh, dumpfile):
+    run_save_load(mesh, dumpfile)
+
+
+def test_save_load_moved_mesh(dumpfile):
+    mesh = UnitSquareMesh(3, 3)
+    mesh.coordinates.dat.data[:] *= 2
+    mesh.save(dumpfile)
+    loaded = Mesh(dumpfile)
+    assert np.allclose(assemble(Constant(1)*dx(domain=loaded)), 4)
+
+
+def run_save_load_coordinates(mesh, dumpfile):
+    dumpfile = mesh.comm.bcast(dumpfile, root=0)
+    mesh.save(dumpfile)
+    loaded = Mesh(dumpfile, comm=mesh.comm)
+    assert loaded.ufl_coordinate_element() == mesh.ufl_coordinate_element()
+    assert loaded.coordinates.ufl_element() == mesh.coordinates.ufl_element()
+    x, y = SpatialCoordinate(mesh)
+    xl, yl = SpatialCoordinate(loaded)
+    assert np.allclose(assemble(Constant(1)*dx(domain=loaded)),
+                       assemble(Constant(1)*dx(domain=mesh)))
+    assert np.allclose(assemble(xl*yl*dx(domain=loaded)),
+                       assemble(x*y*dx(domain=mesh)))
+
+
+def curved_mesh():
+    base = UnitSquareMesh(3, 3)
+    V = VectorFunctionSpace(base, "CG", 2)
+    x, y = SpatialCoordinate(base)
+    # Curved cells, not representable with linear coordinates
+    return Mesh(interpolate(as_vector([x + 0.1*y*(1 - y), y + 0.1*x*(1 - x)]), V))
+
+
+def test_save_load_p2_coordinates(dumpfile):
+    run_save_load_coordinates(curved_mesh(), dumpfile)
+
+
+def test_save_load_periodic(dumpfile):
+    run_save_load_coordinates(PeriodicUnitSquareMesh(4, 4), dumpfile)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_save_load_p2_coordinates_parallel(dumpfile):
+    run_save_load_coordinates(curved_mesh(), dumpfile)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_save_load_periodic_parallel(dumpfile):
+    run_save_load_coordinates(PeriodicUnitSquareMesh(4, 4), dumpfile)
+
+
+@pytest.mark.parallel(nprocs=2)
+def test_load_process_mismatch(dumpfile):
+    mesh = UnitSquareMesh(2, 2, comm=COMM_SELF)
+    dumpfile = "%s.%d" % (dumpfile, COMM_WORLD.rank)
+    mesh.save(dumpfile)
+    fname = COMM_WORLD.bcast(dumpfile, root=0)
+    with pytest.raises(ValueError):
+        Mesh(fname, comm=COMM_WORLD)
+
+
+def test_save_extruded_fails(dumpfile):
+    mesh = ExtrudedMesh(UnitSquareMesh(2, 2), 2)
+    with pytest.raises(NotImplementedError):
+        mesh.save(dumpfile)
+
+
+@pytest.fixture(params=["cell-sets.msh", "t11_quad.msh"])
+def meshfile(request):
+    return join(cwd, "..", "meshes", request.param)
+
+
+def run_partitioned(meshfile, dumpfile):
+    comm = COMM_WORLD
+    dumpfile = comm.bcast(dumpfile, root=0)
+    if comm.rank == 0:
+        write_partitioned_mesh(meshfile, dumpfile)
+    comm.barrier()
+
+    mesh = Mesh(meshfile)
+    loaded = Mesh(dumpfile)
+
+    assert loaded.num_cells() == mesh.num_cells()
+    assert np.array_equal(loaded.exterior_facets.unique_markers,
+                          mesh.exterior_facets.unique_markers)
+    for m in mesh.exterior_facets.unique_markers:
+        assert np.allclose(assemble(Constant(1)*ds(int(m), domain=loaded)),
+                           assemble(Constant(1)*ds(int(m), domain=mesh)))
+    assert np.allclose(assemble(Constant(1)*dx(domain=loaded)),
+                       assemble(Constant(1)*dx(domain=mesh)))
+    assert np.allclose(assemble(Constant(1)*dS(domain=loaded)),
+                       assemble(Constant(1)*dS(domain=mesh)))
+    x = SpatialCoordinate(loaded)
+    xm = SpatialCoordinate(mesh)
+    assert np.allclose(assemble(x[0]*dx(1, domain=loaded)),
+                       assemble(xm[0]*dx(1, domain=mesh)))
+
+
+def test_partitioned_mesh(meshfile, dumpfile):
+    run_partitioned(meshfile, dumpfile)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_partitioned_mesh_parallel(meshfile, dumpfile):
+    run_partitioned(meshfile, dumpfile)
+
+
+def test_partitioned_mesh_hexahedra_unsupported():
+    cells = np.array([[0, 1, 3, 2, 4, 5, 7, 6]], dtype=np.int32)
+    coords = np.array([[i & 1, (i >> 1) & 1, i >> 2] for i in range(8)],
+                      dtype=float)
+    plex = PETSc.DMPlex().createFromCellList(3, cells, coords, comm=PETSc.COMM_SELF)
+    with pytest.raises(NotImplementedError):
+        dmplex.get_cell_vertices(plex)
+
+
+if __name__ == "__main__":
+    import os
+    pytest.main(os.path.abspath(__file__))
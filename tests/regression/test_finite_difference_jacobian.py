@@ -0,0 +1,85 @@
+from firedrake import *
+from firedrake.matrix import FiniteDifferenceJacobian
+from firedrake.matrix_free.operators import FiniteDifferenceJacobianContext
+import pytest
+import numpy as np
+
+
+@pytest.fixture
+def problem():
+    mesh = UnitSquareMesh(8, 8)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+    F = inner((1 + u**2)*grad(u), grad(v))*dx - sin(pi*x)*sin(pi*y)*v*dx
+    bcs = DirichletBC(V, x, (1, 2, 3, 4))
+    return F, u, bcs
+
+
+parameters = {"snes_rtol": 1e-10,
+              "ksp_type": "gmres",
+              "ksp_rtol": 1e-10,
+              "pc_type": "lu"}
+
+
+def test_fd_jacobian_matches_assembled(problem):
+    F, u, bcs = problem
+    solve(F == 0, u, bcs=bcs, solver_parameters=parameters)
+    expect = Function(u)
+
+    u.assign(0)
+    solver = NonlinearVariationalSolver(NonlinearVariationalProblem(F, u, bcs=bcs),
+                                        solver_parameters=dict(parameters, jacobian="fd"))
+    solver.solve()
+
+    J, P = solver.snes.getKSP().getOperators()
+    assert J.getType() == "python"
+    assert isinstance(J.getPythonContext(), FiniteDifferenceJacobianContext)
+    assert J.getPythonContext().residual_evaluations > 0
+    assert P.getType() != "python"
+    assert solver.snes.getIterationNumber() < 10
+    assert np.allclose(u.dat.data_ro, expect.dat.data_ro, atol=1e-8)
+
+
+def test_fd_jacobian_with_jp(problem):
+    F, u, bcs = problem
+    solve(F == 0, u, bcs=bcs, solver_parameters=parameters)
+    expect = Function(u)
+
+    u.assign(0)
+    V = u.function_space()
+    Jp = inner(grad(TrialFunction(V)), grad(TestFunction(V)))*dx
+    solver = NonlinearVariationalSolver(NonlinearVariationalProblem(F, u, bcs=bcs, Jp=Jp),
+                                        solver_parameters=dict(parameters, jacobian="fd"))
+    solver.solve()
+    assert np.allclose(u.dat.data_ro, expect.dat.data_ro, atol=1e-8)
+
+
+def test_fd_jacobian_action(problem):
+    F, u, bcs = problem
+    V = u.function_space()
+    u.interpolate(SpatialCoordinate(V.mesh())[0])
+    J = derivative(F, u)
+    A = assemble(J, bcs=bcs)
+    fd = FiniteDifferenceJacobian(J, [bcs], F, u)
+    fd.assemble()
+
+    w = Function(V).interpolate(SpatialCoordinate(V.mesh())[1]**2)
+    state = Function(u)
+    expect = Function(V)
+    actual = Function(V)
+    with w.dat.vec_ro as x, expect.dat.vec as y:
+        A.petscmat.mult(x, y)
+    with w.dat.vec_ro as x, actual.dat.vec as y:
+        fd.petscmat.mult(x, y)
+    assert np.allclose(actual.dat.data_ro, expect.dat.data_ro, atol=1e-6)
+    # The state is left untouched
+    assert np.array_equal(u.dat.data_ro, state.dat.data_ro)
+
+
+def test_fd_jacobian_invalid(problem):
+    F, u, bcs = problem
+    with pytest.raises(ValueError):
+        NonlinearVariationalSolver(NonlinearVariationalProblem(F, u, bcs=bcs),
+                                   solver_parameters={"jacobian": "bogus"})
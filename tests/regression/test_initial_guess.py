@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+def run(nsteps=8, **parameters):
+    mesh = UnitSquareMesh(16, 16)
+    V = FunctionSpace(mesh, "CG", 1)
+    x, y = SpatialCoordinate(mesh)
+    t = Constant(0)
+    dt = 0.05
+    u = Function(V)
+    u_old = Function(V)
+    v = TestFunction(V)
+    f = 10*sin(pi*x)*sin(pi*y)*cos(t)
+    F = (u - u_old)/dt*v*dx + inner(grad(u), grad(v))*dx - f*v*dx
+    problem = NonlinearVariationalProblem(F, u, bcs=DirichletBC(V, 0, "on_boundary"))
+    parameters.update({"snes_type": "ksponly",
+                       "ksp_type": "cg",
+                       "pc_type": "jacobi",
+                       "ksp_rtol": 1e-8})
+    solver = NonlinearVariationalSolver(problem, solver_parameters=parameters)
+    its = 0
+    for i in range(nsteps):
+        t.assign((i + 1)*dt)
+        solver.solve()
+        if i > 2:
+            its += solver.snes.getLinearSolveIterations()
+        u_old.assign(u)
+    return u, its
+
+
+@pytest.mark.parametrize("guess_type", ["extrapolate", "projection"])
+def test_initial_guess_reduces_iterations(guess_type):
+    expect, expect_its = run()
+    u, its = run(initial_guess_type=guess_type)
+    assert its < expect_its
+    assert np.allclose(u.dat.data_ro, expect.dat.data_ro, atol=1e-6)
+
+
+def test_initial_guess_history_size():
+    mesh = UnitIntervalMesh(4)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    problem = NonlinearVariationalProblem(u*v*dx - v*dx, u)
+    solver = NonlinearVariationalSolver(problem,
+                                        solver_parameters={"initial_guess_type": "extrapolate",
+                                                           "initial_guess_history": 3})
+    for i in range(5):
+        solver.solve()
+    assert len(solver._ctx._solution_history.solutions) == 3
+
+
+@pytest.mark.parametrize("nonzero", [False, True])
+def test_initial_guess_keeps_ksp_setting(nonzero):
+    mesh = UnitIntervalMesh(4)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    problem = NonlinearVariationalProblem(u**3*v*dx + u*v*dx - v*dx, u)
+    solver = NonlinearVariationalSolver(problem,
+                                        solver_parameters={"initial_guess_type": "extrapolate",
+                                                           "ksp_type": "cg",
+                                                           "pc_type": "jacobi",
+                                                           "ksp_initial_guess_nonzero": nonzero})
+    for i in range(3):
+        solver.solve()
+        assert solver.snes.getIterationNumber() > 1
+        assert solver.snes.getKSP().getInitialGuessNonzero() == nonzero
+
+
+def test_initial_guess_invalid_type():
+    mesh = UnitIntervalMesh(4)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    problem = NonlinearVariationalProblem(u*v*dx - v*dx, u)
+    with pytest.raises(ValueError):
+        NonlinearVariationalSolver(problem, solver_parameters={"initial_guess_type": "guess"})
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
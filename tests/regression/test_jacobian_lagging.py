@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+@pytest.fixture
+def problem():
+    mesh = UnitSquareMesh(8, 8)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    f = Constant(10)
+    F = (1 + 0.1*u**2)*inner(grad(u), grad(v))*dx - f*v*dx
+    bcs = DirichletBC(V, 0, "on_boundary")
+    return NonlinearVariationalProblem(F, u, bcs=bcs)
+
+
+def solve_problem(problem, **parameters):
+    parameters.update({"snes_rtol": 1e-10,
+                       "ksp_type": "cg",
+                       "pc_type": "jacobi",
+                       "ksp_rtol": 1e-12})
+    problem.u.assign(0)
+    solver = NonlinearVariationalSolver(problem, solver_parameters=parameters)
+    solver.solve()
+    return solver, problem.u.copy(deepcopy=True)
+
+
+@pytest.mark.parametrize("lag_type", ["fixed", "residual", "ksp_iterations"])
+def test_lagged_jacobian_solution(problem, lag_type):
+    solver, expect = solve_problem(problem)
+    stats = solver.jacobian_statistics
+    assert stats["assemblies_avoided"] == 0
+    assert stats["assemblies"] == solver.snes.getIterationNumber()
+
+    solver, u = solve_problem(problem, lag_jacobian_type=lag_type,
+                              lag_jacobian_max_age=2)
+    stats = solver.jacobian_statistics
+    assert stats["assemblies_avoided"] > 0
+    assert stats["pc_setups_avoided"] == stats["assemblies_avoided"]
+    assert np.allclose(u.dat.data_ro, expect.dat.data_ro)
+
+
+def test_lagged_jacobian_persists(problem):
+    solver, _ = solve_problem(problem, lag_jacobian_type="fixed",
+                              lag_jacobian_max_age=100)
+    assemblies = solver.jacobian_statistics["assemblies"]
+    assert assemblies == 1
+    problem.u.assign(0)
+    solver.solve()
+    assert solver.jacobian_statistics["assemblies"] == assemblies
+
+
+def test_lagged_jacobian_not_persistent(problem):
+    solver, _ = solve_problem(problem, lag_jacobian_type="fixed",
+                              lag_jacobian_max_age=100,
+                              lag_jacobian_persists=False)
+    problem.u.assign(0)
+    solver.solve()
+    assert solver.jacobian_statistics["assemblies"] == 2
+
+
+def test_lagged_jacobian_invalid_type(problem):
+    with pytest.raises(ValueError):
+        solve_problem(problem, lag_jacobian_type="sometimes")
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
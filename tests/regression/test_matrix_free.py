@@ -292,3 +292,38 @@ def test_get_info(a, bcs, infotype):
         ctx = A.petscmat.getPythonContext()
         info = ctx.getInfo(A.petscmat, info=itype)
         assert info["memory"] == 2*expect
+
+
+@pytest.mark.parametrize("extruded", [False, True],
+                         ids=["quadrilateral", "extruded"])
+def test_matrixfree_action_sum_factorised(extruded):
+    from firedrake.matrix_free.operators import action_parameters
+    mesh = UnitSquareMesh(3, 3, quadrilateral=True)
+    if extruded:
+        mesh = ExtrudedMesh(mesh, 3)
+    V = FunctionSpace(mesh, "CG", 4)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    a = inner(grad(u), grad(v))*dx + u*v*dx
+    assert action_parameters(a)["mode"] == "spectral"
+    assert action_parameters(a, {"mode": "vanilla"})["mode"] == "vanilla"
+
+    f = Function(V)
+    x = SpatialCoordinate(mesh)
+    f.interpolate(x[0]*sin(x[1]*2*pi))
+    expect = Function(V)
+    actual = Function(V)
+    A = assemble(a)
+    Amf = assemble(a, mat_type="matfree")
+    with f.dat.vec_ro as x:
+        with expect.dat.vec as y:
+            A.petscmat.mult(x, y)
+        with actual.dat.vec as y:
+            Amf.petscmat.mult(x, y)
+
+    assert np.allclose(expect.dat.data_ro, actual.dat.data_ro)
+
+
+def test_matrixfree_action_parameters_simplex(a):
+    from firedrake.matrix_free.operators import action_parameters
+    assert action_parameters(a) is None
@@ -0,0 +1,76 @@
+import logging
+import pytest
+import numpy as np
+from firedrake import *
+from firedrake.memory import categories
+
+
+@pytest.fixture
+def mesh():
+    return UnitSquareMesh(8, 8)
+
+
+def total(report, category):
+    return report["categories"][category]["max"]
+
+
+def test_memory_report_categories(mesh):
+    V = FunctionSpace(mesh, "CG", 1)
+    f = Function(V).assign(1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    A = assemble(u*v*dx)
+    report = memory_report()
+
+    assert set(report["categories"]) == set(categories)
+    for category in ["mesh", "maps", "shared_data", "functions", "matrices", "sparsities"]:
+        assert total(report, category) > 0
+    assert np.allclose(report["total"]["max"],
+                       sum(total(report, c) for c in categories))
+    assert report["meshes"][mesh.name]["functions"]["max"] >= f.dat.nbytes
+    assert report["meshes"][mesh.name]["matrices"]["max"] > 0
+    assert report["meshes"][mesh.name]["maps"]["max"] >= V.cell_node_map().values.nbytes
+    del A
+
+
+def test_memory_report_counts_functions(mesh):
+    V = FunctionSpace(mesh, "CG", 3)
+    before = memory_report()
+    f = Function(V).assign(1)
+    after = memory_report()
+    assert total(after, "functions") - total(before, "functions") >= f.dat.nbytes
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_memory_report_parallel(mesh):
+    V = FunctionSpace(mesh, "CG", 1)
+    f = Function(V).assign(1)  # noqa: F841
+    report = memory_report(comm=mesh.comm, verbose=True)
+    for stats in report["categories"].values():
+        assert stats["min"] <= stats["mean"] <= stats["max"]
+    assert report["total"]["min"] > 0
+
+
+def test_memory_logging(mesh):
+    records = []
+
+    class Handler(logging.Handler):
+        def emit(self, record):
+            records.append(record.getMessage())
+
+    logger = logging.getLogger("firedrake")
+    handler = Handler()
+    logger.addHandler(handler)
+    try:
+        set_memory_logging(WARNING)
+        V = FunctionSpace(mesh, "CG", 1)
+        assemble(TestFunction(V)*dx)
+    finally:
+        set_memory_logging(None)
+        logger.removeHandler(handler)
+    assert any(r.startswith("assemble: resident memory") for r in records)
+
+
+if __name__ == "__main__":
+    import os
+    pytest.main(os.path.abspath(__file__))
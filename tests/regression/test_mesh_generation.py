@@ -191,6 +191,41 @@ def test_unit_cube_parallel():
     assert abs(integrate_one(UnitCubeMesh(3, 3, 3)) - 1) < 1e-3
 
 
+def run_boundary_markers(m, lengths):
+    """Check the size of the marked boundaries of a rectangle or box."""
+    volume = np.prod(lengths)
+    for marker in range(1, 2*len(lengths) + 1):
+        area = volume / lengths[(marker - 1) // 2]
+        assert np.allclose(assemble(Constant(1)*ds(marker, domain=m)), area)
+    area = sum(2*volume/L for L in lengths)
+    assert np.allclose(assemble(Constant(1)*ds(domain=m)), area)
+
+
+@pytest.mark.parallel(nprocs=3)
+@pytest.mark.parametrize("quadrilateral", [False, True])
+def test_rectangle_parallel_generation(quadrilateral):
+    m = RectangleMesh(7, 5, 2.0, 3.0, quadrilateral=quadrilateral)
+    assert m.comm.allreduce(m.cell_set.size) == 7*5*(1 if quadrilateral else 2)
+    run_boundary_markers(m, [2.0, 3.0])
+    serial = RectangleMesh(7, 5, 2.0, 3.0, quadrilateral=quadrilateral, distribute=False)
+    assert np.allclose(assemble(Constant(1)*dS(domain=m)),
+                       assemble(Constant(1)*dS(domain=serial)))
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_box_parallel_generation():
+    m = BoxMesh(4, 3, 5, 1.0, 2.0, 3.0)
+    assert m.comm.allreduce(m.cell_set.size) == 4*3*5*6
+    run_boundary_markers(m, [1.0, 2.0, 3.0])
+    assert abs(integrate_one(m) - 6.0) < 1e-3
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_tiny_rectangle_parallel():
+    m = RectangleMesh(1, 2, 1.0, 1.0)
+    run_boundary_markers(m, [1.0, 1.0])
+
+
 def assert_num_exterior_facets_equals_zero(m):
     # Need to initialise the mesh so that exterior facets have been
     # built.
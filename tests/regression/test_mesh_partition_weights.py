@@ -0,0 +1,88 @@
+from os.path import abspath, dirname, join
+import pytest
+import numpy as np
+
+from firedrake import *
+from firedrake.mesh import _cell_centroids, _curve_partition
+
+cwd = abspath(dirname(__file__))
+
+
+@pytest.fixture
+def meshfile():
+    return join(cwd, "..", "meshes", "t11_tria.msh")
+
+
+def heavy_right(plex):
+    return np.where(_cell_centroids(plex)[:, 0] > 0, 10.0, 1.0)
+
+
+def owned_weights(mesh):
+    x, y = SpatialCoordinate(mesh)
+    weight = Function(FunctionSpace(mesh, "DG", 0))
+    weight.interpolate(conditional(gt(x, 0), 10.0, 1.0))
+    return mesh.comm.allgather(weight.dat.data_ro.sum())
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_partition_weights_balance(meshfile):
+    mesh = Mesh(meshfile, partition_weights=heavy_right)
+    weights = owned_weights(mesh)
+    assert max(weights) / min(weights) < 1.2
+
+    # The unweighted partition balances the number of cells instead.
+    mesh = Mesh(meshfile)
+    weights = owned_weights(mesh)
+    assert max(weights) / min(weights) > 1.2
+
+
+@pytest.mark.parallel(nprocs=2)
+def test_partition_weights_by_subdomain():
+    mesh = Mesh(join(cwd, "..", "meshes", "cell-sets.msh"),
+                partition_weights={1: 1.0, 2: 2.0})
+    assert np.allclose(assemble(Constant(1)*dx(domain=mesh)), 0.75)
+    assert np.allclose(assemble(Constant(1)*dx(2, domain=mesh)), 0.25)
+    # Each rank's weight is within a cell's weight of an even share.
+    owned = mesh.cell_set.size
+    heavy = np.count_nonzero(mesh.cell_subset(2).indices < owned)
+    weights = mesh.comm.allgather(owned + heavy)
+    assert all(abs(w - sum(weights) / 2) <= 2.0 for w in weights)
+
+
+@pytest.mark.parallel(nprocs=2)
+def test_partition_weights_wrong_shape(meshfile):
+    with pytest.raises(ValueError):
+        Mesh(meshfile, partition_weights=lambda plex: np.ones(3))
+
+
+def test_partition_weights_with_explicit_partition(meshfile):
+    with pytest.raises(ValueError):
+        Mesh(meshfile, distribute=([1], [0]), partition_weights=heavy_right)
+
+
+def test_curve_partition_equal_keys():
+    keys = np.zeros(10, dtype=np.uint64)
+    parts = _curve_partition(keys, np.ones(10), 4, COMM_SELF)
+    assert sorted(np.bincount(parts, minlength=4)) == [2, 2, 3, 3]
+
+
+def test_curve_partition_heavy_cell():
+    keys = np.arange(10, dtype=np.uint64)
+    weights = np.ones(10)
+    weights[0] = 1e6
+    parts = _curve_partition(keys, weights, 4, COMM_SELF)
+    assert (np.bincount(parts, minlength=4) > 0).all()
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_curve_partition_equal_keys_parallel():
+    # Ties are broken by the global cell number, so every rank's
+    # (equal) cells go to the part of the same rank.
+    keys = np.zeros(5, dtype=np.uint64)
+    parts = _curve_partition(keys, np.ones(5), COMM_WORLD.size, COMM_WORLD)
+    assert (parts == COMM_WORLD.rank).all()
+
+
+if __name__ == "__main__":
+    import os
+    pytest.main(os.path.abspath(__file__))
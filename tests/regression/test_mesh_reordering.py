@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+from firedrake import *
+from firedrake.mesh import _hilbert_keys
+
+
+@pytest.fixture(params=[False, True],
+                ids=["simplex", "quad"])
+def quadrilateral(request):
+    return request.param
+
+
+def reverse_cells(plex):
+    cStart, cEnd = plex.getHeightStratum(0)
+    return np.arange(cEnd - cStart)[::-1]
+
+
+@pytest.mark.parametrize("reorder", [False, True, "rcm", "hilbert", "morton", reverse_cells],
+                         ids=["none", "default", "rcm", "hilbert", "morton", "callable"])
+def test_reordering_assembly(quadrilateral, reorder):
+    mesh = UnitSquareMesh(8, 8, quadrilateral=quadrilateral, reorder=reorder)
+    V = FunctionSpace(mesh, "CG", 2)
+    x, y = SpatialCoordinate(mesh)
+    f = Function(V).interpolate(x*y)
+    assert np.allclose(assemble(f*dx), 0.25)
+    assert np.allclose(assemble(f*ds(2)), 0.5)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    A = assemble(inner(grad(u), grad(v))*dx)
+    assert np.allclose(A.M.values.sum(axis=1), 0)
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_reordering_parallel():
+    mesh = UnitCubeMesh(4, 4, 4, reorder="hilbert")
+    assert np.allclose(assemble(Constant(1)*dx(domain=mesh)), 1)
+    assert np.allclose(assemble(Constant(1)*ds(domain=mesh)), 6)
+
+
+def test_reordering_unknown():
+    with pytest.raises(ValueError):
+        UnitSquareMesh(2, 2, reorder="bogus").init()
+
+
+def test_reordering_callable_wrong_shape():
+    with pytest.raises(ValueError):
+        UnitSquareMesh(2, 2, reorder=lambda plex: np.arange(3)).init()
+
+
+def test_hilbert_keys_adjacent():
+    n = 8
+    points = np.stack(np.meshgrid(np.arange(n), np.arange(n), indexing="ij"), axis=-1)
+    points = points.reshape(-1, 2) + 0.5
+    order = np.argsort(_hilbert_keys(points))
+    steps = np.abs(np.diff(points[order], axis=0)).sum(axis=1)
+    assert np.allclose(steps, 1)
+
+
+if __name__ == "__main__":
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -0,0 +1,89 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+@pytest.fixture
+def mesh():
+    return UnitSquareMesh(4, 4)
+
+
+def test_coordinates_version_increments(mesh):
+    version = mesh.coordinates_version
+    mesh.coordinates.assign(2*mesh.coordinates)
+    assert mesh.coordinates_version == version + 1
+    mesh.coordinates += 1
+    assert mesh.coordinates_version == version + 2
+    mesh.notify_coordinates_changed()
+    assert mesh.coordinates_version == version + 3
+
+
+def test_point_eval_follows_mesh(mesh):
+    V = FunctionSpace(mesh, "DG", 0)
+    f = Function(V).assign(1)
+    assert np.allclose(f.at((0.5, 0.5)), 1)
+    old_index = mesh.spatial_index
+
+    x, y = SpatialCoordinate(mesh)
+    mesh.coordinates.interpolate(as_vector([x + 2, y]))
+    assert mesh.spatial_index is not old_index
+    assert np.allclose(f.at((2.5, 0.5)), 1)
+    assert f.at((0.5, 0.5), dont_raise=True) is None
+
+
+def test_notify_after_writing_data(mesh):
+    V = FunctionSpace(mesh, "DG", 0)
+    f = Function(V).assign(1)
+    assert np.allclose(f.at((0.5, 0.5)), 1)
+    mesh.coordinates.dat.data[:, 0] += 2
+    mesh.notify_coordinates_changed()
+    assert np.allclose(f.at((2.5, 0.5)), 1)
+
+
+def test_topological_caches_survive(mesh):
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    cell_node_map = V.cell_node_map()
+    A = assemble(u*v*dx)
+    A.force_evaluation()
+    mesh.coordinates.assign(2*mesh.coordinates)
+    B = assemble(u*v*dx)
+    B.force_evaluation()
+    assert V.cell_node_map() is cell_node_map
+    assert A.M.sparsity is B.M.sparsity
+    assert np.allclose(B.M.values, 4*A.M.values)
+
+
+def test_cell_orientations_follow_mesh():
+    mesh = UnitIcosahedralSphereMesh()
+    mesh.init_cell_orientations(SpatialCoordinate(mesh))
+    before = mesh.cell_orientations().dat.data_ro.copy()
+    mesh.coordinates.assign(-mesh.coordinates)
+    after = mesh.cell_orientations().dat.data_ro
+    assert np.array_equal(after, 1 - before)
+
+
+def test_cached_solver_follows_cell_orientations():
+    mesh = UnitIcosahedralSphereMesh()
+    x = SpatialCoordinate(mesh)
+    mesh.init_cell_orientations(x)
+    V = FunctionSpace(mesh, "DG", 0)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    n = CellNormal(mesh)
+    uh = Function(V)
+    solver = LinearVariationalSolver(LinearVariationalProblem(u*v*dx, dot(n, x)*v*dx, uh))
+    solver.solve()
+    before = uh.dat.data_ro.copy()
+    assert (before > 0).all()
+
+    # Mirrored, the outward normals are still outward.
+    mesh.coordinates.assign(-mesh.coordinates)
+    solver.solve()
+    assert np.allclose(uh.dat.data_ro, before)
+
+
+if __name__ == "__main__":
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -0,0 +1,113 @@
+from firedrake import *
+from firedrake.matrix import PartiallyAssembledMatrix
+from firedrake.matrix_free.operators import PartialAssemblyContext
+import pytest
+import numpy as np
+
+
+@pytest.fixture(params=["scalar", "vector"])
+def V(request):
+    mesh = UnitSquareMesh(6, 6)
+    if request.param == "scalar":
+        return FunctionSpace(mesh, "CG", 2)
+    else:
+        return VectorFunctionSpace(mesh, "CG", 1)
+
+
+@pytest.fixture
+def a(V):
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(V.mesh())
+    return (1 + x*y)*inner(grad(u), grad(v))*dx + inner(u, v)*dx
+
+
+@pytest.mark.parametrize("with_bcs", [False, True])
+def test_partial_assembly_action(V, a, with_bcs):
+    bcs = DirichletBC(V, zero(V.ufl_element().value_shape()), (1, 3)) if with_bcs else None
+    A = assemble(a, bcs=bcs, mat_type="aij")
+    Ap = assemble(a, bcs=bcs, mat_type="partial")
+    assert isinstance(Ap, PartiallyAssembledMatrix)
+    assert isinstance(Ap.petscmat.getPythonContext(), PartialAssemblyContext)
+
+    x = Function(V)
+    x.dat.data[:] = np.random.rand(*x.dat.data.shape)
+    for transpose in [False, True]:
+        expect = Function(V)
+        actual = Function(V)
+        with x.dat.vec_ro as xv, expect.dat.vec as ev, actual.dat.vec as av:
+            if transpose:
+                A.petscmat.multTranspose(xv, ev)
+                Ap.petscmat.multTranspose(xv, av)
+            else:
+                A.petscmat.mult(xv, ev)
+                Ap.petscmat.mult(xv, av)
+        assert np.allclose(actual.dat.data_ro, expect.dat.data_ro)
+
+
+def test_partial_assembly_reassemble():
+    mesh = UnitSquareMesh(4, 4)
+    V = FunctionSpace(mesh, "CG", 1)
+    c = Constant(1.0)
+    a = c*TrialFunction(V)*TestFunction(V)*dx
+    Ap = assemble(a, mat_type="partial")
+    c.assign(2.0)
+    assemble(a, tensor=Ap, mat_type="partial")
+
+    x = Function(V).assign(1)
+    y = Function(V)
+    with x.dat.vec_ro as xv, y.dat.vec as yv:
+        Ap.petscmat.mult(xv, yv)
+    assert np.allclose(y.dat.data_ro.sum(), 2.0)
+
+
+def test_partial_assembly_solve(V, a):
+    shape = V.ufl_element().value_shape()
+    f = Constant(np.ones(shape)) if shape else Constant(1)
+    L = inner(f, TestFunction(V))*dx
+    bcs = DirichletBC(V, zero(shape), (1, 2, 3, 4))
+    expect = Function(V)
+    solve(a == L, expect, bcs=bcs, solver_parameters={"ksp_type": "preonly",
+                                                      "pc_type": "lu"})
+    u = Function(V)
+    solver = LinearVariationalSolver(LinearVariationalProblem(a, L, u, bcs=bcs),
+                                     solver_parameters={"mat_type": "partial",
+                                                        "pmat_type": "aij",
+                                                        "ksp_type": "cg",
+                                                        "ksp_rtol": 1e-12,
+                                                        "pc_type": "jacobi"})
+    solver.solve()
+    J, P = solver.snes.getKSP().getOperators()
+    assert J.getType() == "python"
+    assert P.getType() != "python"
+    assert np.allclose(u.dat.data_ro, expect.dat.data_ro)
+
+
+def test_partial_assembly_unsupported():
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    with pytest.raises(NotImplementedError):
+        assemble(u*v*ds, mat_type="partial")
+
+
+@pytest.mark.parallel(nprocs=3)
+def test_partial_assembly_action_parallel():
+    mesh = UnitSquareMesh(8, 8)
+    V = FunctionSpace(mesh, "CG", 2)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+    a = (1 + x*y)*inner(grad(u), grad(v))*dx + u*v*dx
+    bcs = DirichletBC(V, 0, (1, 3))
+    A = assemble(a, bcs=bcs, mat_type="aij")
+    Ap = assemble(a, bcs=bcs, mat_type="partial")
+
+    f = Function(V).interpolate(x*sin(2*pi*y))
+    expect = Function(V)
+    actual = Function(V)
+    with f.dat.vec_ro as xv, expect.dat.vec as ev, actual.dat.vec as av:
+        A.petscmat.mult(xv, ev)
+        Ap.petscmat.mult(xv, av)
+    assert np.allclose(actual.dat.data_ro, expect.dat.data_ro)
@@ -0,0 +1,62 @@
+import gc
+import pytest
+from firedrake import *
+
+
+def test_shared_data_cache_statistics():
+    mesh = UnitSquareMesh(2, 2)
+    FunctionSpace(mesh, "CG", 2)
+    before = mesh.cache_info()["get_global_numbering"]
+    FunctionSpace(mesh, "CG", 2)
+    after = mesh.cache_info()["get_global_numbering"]
+    assert after["hits"] > before["hits"]
+    assert after["misses"] == before["misses"]
+    assert after["entries"] == before["entries"]
+    assert after["nbytes"] > 0
+
+
+def test_clear_caches_keeps_live_spaces():
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    W = FunctionSpace(mesh, "CG", 3)
+    DirichletBC(W, 0, 1).nodes
+    mesh.clear_caches()
+    entries = mesh.cache_info()["get_node_set"]["entries"]
+
+    del W
+    gc.collect()
+    assert mesh.clear_caches() > 0
+    info = mesh.cache_info()
+    assert info["get_node_set"]["entries"] == entries - 1
+    assert info["get_boundary_nodes"]["entries"] == 0
+    assert all(i["entries"] == i["in_use"] for i in info.values())
+    assert FunctionSpace(mesh, "CG", 1) == V
+
+
+def test_clear_caches_kind():
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 3)
+    DirichletBC(V, 0, 1).nodes
+    del V
+    gc.collect()
+    entries = mesh.cache_info()["get_node_set"]["entries"]
+    assert mesh.clear_caches(kind="get_boundary_nodes") == 1
+    assert mesh.cache_info()["get_node_set"]["entries"] == entries
+    with pytest.raises(ValueError):
+        mesh.clear_caches(kind="not_a_cache")
+
+
+def test_clear_caches_keeps_checked_out_work_functions():
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    f = V.get_work_function()
+    mesh.clear_caches(kind="get_work_function_cache")
+    assert V.num_work_functions == 1
+    V.restore_work_function(f)
+    mesh.clear_caches(kind="get_work_function_cache")
+    assert V.num_work_functions == 0
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -0,0 +1,59 @@
+import json
+import pytest
+from firedrake import *
+
+
+@pytest.fixture
+def solver():
+    mesh = UnitSquareMesh(4, 4)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = Function(V)
+    v = TestFunction(V)
+    F = (1 + u**2)*inner(grad(u), grad(v))*dx - v*dx
+    problem = NonlinearVariationalProblem(F, u, bcs=DirichletBC(V, 0, "on_boundary"))
+    return NonlinearVariationalSolver(problem, solver_parameters={"ksp_type": "cg",
+                                                                  "pc_type": "jacobi"})
+
+
+def test_profile_disabled(solver):
+    solver.solve()
+    assert solver.profile.records == []
+
+
+def test_profile_records(solver):
+    solver.profile.enable()
+    solver.solve()
+    solver.solve()
+    assert len(solver.profile.records) == 2
+    record = solver.profile.records[0]
+    assert set(record) == set(solver.profile.fields)
+    assert record["snes_iterations"] > 0
+    assert record["ksp_iterations"] > 0
+    assert record["residual_evaluations"] > record["snes_iterations"]
+    assert record["jacobian_assemblies"] == record["snes_iterations"]
+    assert record["solve_time"] >= record["residual_time"] + record["jacobian_time"]
+    assert all(record[f] >= 0 for f in solver.profile.fields)
+
+
+def test_profile_export(solver, tmpdir):
+    solver.profile.enable()
+    solver.solve()
+    columns = solver.profile.as_dict(reduce="max")
+    assert columns["solve"] == [0]
+    assert columns["ksp_iterations"] == [solver.snes.getLinearSolveIterations()]
+
+    filename = str(tmpdir.join("profile.jsonl"))
+    solver.profile.to_json_lines(filename)
+    if solver.profile.comm.rank == 0:
+        with open(filename) as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 1
+        assert lines[0]["ksp_iterations"] == columns["ksp_iterations"][0]
+
+    with pytest.raises(ValueError):
+        solver.profile.as_dict(reduce="median")
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
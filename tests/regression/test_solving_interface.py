@@ -1,7 +1,9 @@
 import pytest
 from firedrake import *
+from firedrake import solving
 from firedrake.petsc import PETSc
 from numpy.linalg import norm as np_norm
+import numpy as np
 import gc
 
 
@@ -22,6 +24,15 @@ def a_L_out():
     return u*v*dx, f*v*dx, out
 
 
+@pytest.fixture
+def cached():
+    size = parameters["solve_cache_size"]
+    parameters["solve_cache_size"] = 8
+    yield
+    parameters["solve_cache_size"] = size
+    solving._solver_cache.clear()
+
+
 def test_linear_solver_api(a_L_out):
     a, L, out = a_L_out
     p = LinearVariationalProblem(a, L, out)
@@ -94,6 +105,49 @@ def test_nonlinear_solver_gced(a_L_out):
     assert before == after
 
 
+def test_solve_reuses_solver(cached):
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    out = Function(V)
+
+    def solve_once():
+        u = TrialFunction(V)
+        v = TestFunction(V)
+        solve(inner(grad(u), grad(v))*dx + u*v*dx == v*dx, out,
+              solver_parameters={"ksp_type": "cg"})
+        return next(reversed(solving._solver_cache.values()))
+
+    solver = solve_once()
+    assert solve_once() is solver
+    assert np.allclose(out.dat.data_ro, 1)
+
+
+def test_solve_cache_bounded(cached):
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    for i in range(parameters["solve_cache_size"] + 2):
+        solve(u*v*dx == v*dx, Function(V))
+    assert len(solving._solver_cache) == parameters["solve_cache_size"]
+
+
+@pytest.mark.parametrize("coefficient", ["constant", "function"])
+def test_solve_cache_jacobian_updated(coefficient, cached):
+    mesh = UnitSquareMesh(2, 2)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    q = Constant(1) if coefficient == "constant" else Function(V).assign(1)
+    out = Function(V)
+
+    solve(q*u*v*dx == v*dx, out)
+    assert np.allclose(out.dat.data_ro, 1)
+    q.assign(4)
+    solve(q*u*v*dx == v*dx, out)
+    assert np.allclose(out.dat.data_ro, 0.25)
+
+
 def test_nonlinear_solver_api(a_L_out):
     a, L, out = a_L_out
     J = a
@@ -138,6 +192,68 @@ def test_linear_solves_equivalent():
     assert np_norm(sol.vector()[:] - sol3.vector()[:]) < 5e-14
 
 
+@pytest.mark.parametrize("bcs", [False, True])
+@pytest.mark.parametrize("parameters", [{"ksp_type": "preonly", "pc_type": "lu"},
+                                        {"ksp_type": "cg", "pc_type": "jacobi",
+                                         "ksp_rtol": 1e-12}])
+def test_linear_solver_solve_many(bcs, parameters):
+    mesh = UnitSquareMesh(10, 10)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    x, y = SpatialCoordinate(mesh)
+
+    bc = DirichletBC(V, 1 + x, 1) if bcs else None
+    A = assemble(inner(grad(u), grad(v))*dx + u*v*dx, bcs=bc)
+    bs = [assemble(f*v*dx) for f in (Constant(1), x, sin(x*y))]
+
+    solver = LinearSolver(A, solver_parameters=parameters)
+    expect = [Function(V) for _ in bs]
+    for e, b in zip(expect, bs):
+        solver.solve(e, b)
+
+    xs = [Function(V) for _ in bs]
+    solver.solve_many(xs, bs)
+    for x_, e in zip(xs, expect):
+        assert np.allclose(x_.dat.data_ro, e.dat.data_ro)
+
+    with pytest.raises(ValueError):
+        solver.solve_many(xs, bs[:2])
+
+
+def test_linear_solvers_share_preconditioner():
+    from firedrake.solving_utils import SharedPreconditioner
+
+    mesh = UnitSquareMesh(5, 5)
+    V = FunctionSpace(mesh, "CG", 1)
+    u = TrialFunction(V)
+    v = TestFunction(V)
+    A = assemble(inner(grad(u), grad(v))*dx + u*v*dx)
+    b = assemble(v*dx)
+
+    lu = {"ksp_type": "preonly", "pc_type": "lu", "share_pc": True}
+    first = LinearSolver(A, solver_parameters=lu)
+    second = LinearSolver(A, solver_parameters=dict(lu, ksp_type="richardson"))
+    other = LinearSolver(A, solver_parameters={"pc_type": "jacobi", "share_pc": True})
+    unshared = LinearSolver(A, solver_parameters={"ksp_type": "preonly", "pc_type": "lu"})
+    pcs = [s.ksp.getPC().handle for s in (first, second, other, unshared)]
+    assert pcs[0] == pcs[1]
+    assert len(set(pcs)) == 3
+    with pytest.raises(ValueError):
+        LinearSolver(A, solver_parameters=lu, options_prefix="shared_pc_")
+
+    x1 = Function(V)
+    x2 = Function(V)
+    first.solve(x1, b)
+    second.solve(x2, b)
+    assert np.allclose(x1.dat.data_ro, x2.dat.data_ro)
+
+    nshared = len(SharedPreconditioner._registry)
+    del first, second
+    gc.collect()
+    assert len(SharedPreconditioner._registry) == nshared - 1
+
+
 def test_constant_jacobian_lvs():
     mesh = UnitSquareMesh(2, 2)
     V = FunctionSpace(mesh, "CG", 1)
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+from firedrake import *
+
+
+@pytest.fixture(params=["triangle", "quadrilateral", "tetrahedron"])
+def mesh(request):
+    if request.param == "triangle":
+        m = UnitSquareMesh(3, 4)
+    elif request.param == "quadrilateral":
+        m = UnitSquareMesh(3, 4, quadrilateral=True)
+    else:
+        m = UnitCubeMesh(2, 3, 2)
+    # Distort the mesh, so the cells differ
+    x = SpatialCoordinate(m)
+    m.coordinates.interpolate(x + 0.05*as_vector([x[i]*x[i] for i in range(len(x))]))
+    return m
+
+
+def forms(mesh):
+    V = FunctionSpace(mesh, "DG", 1)
+    u = Function(V).interpolate(SpatialCoordinate(mesh)[0])
+    h = CellVolume(mesh)
+    yield u*h*dx
+    if mesh.is_piecewise_linear_simplex_domain():
+        yield u*Circumradius(mesh)*dx
+    yield jump(u)**2/avg(h)*FacetArea(mesh)*dS
+    yield u*FacetArea(mesh)*ds + h('+')*dS
+    yield u*abs(JacobianDeterminant(mesh))*dx
+    yield inner(Jacobian(mesh), Jacobian(mesh))*dx
+    yield inner(JacobianInverse(mesh), JacobianInverse(mesh))*dx
+
+
+def test_static_geometry_values(mesh):
+    expected = [assemble(form) for form in forms(mesh)]
+    mesh.static_geometry = True
+    for form, value in zip(forms(mesh), expected):
+        assert np.allclose(assemble(form), value)
+
+
+def test_static_geometry_substitutes():
+    mesh = UnitSquareMesh(2, 2)
+    mesh.static_geometry = True
+    form = CellVolume(mesh)*FacetArea(mesh)*ds
+    volume = mesh.geometric_quantity("cell_volume")
+    area = mesh.geometric_quantity("facet_area")
+    from firedrake.assemble import substitute_geometric_quantities
+    assert set(substitute_geometric_quantities(form).coefficients()) == {volume, area}
+    mesh.static_geometry = False
+    assert substitute_geometric_quantities(form) is form
+
+
+def test_geometric_quantity_follows_mesh():
+    mesh = UnitSquareMesh(2, 2)
+    volume = mesh.geometric_quantity("cell_volume")
+    assert np.allclose(volume.dat.data_ro, 1/8)
+    mesh.coordinates.assign(2*mesh.coordinates)
+    assert mesh.geometric_quantity("cell_volume") is volume
+    assert np.allclose(volume.dat.data_ro, 1/2)
+
+
+def test_geometric_quantity_unsupported():
+    mesh = UnitSquareMesh(2, 2, quadrilateral=True)
+    assert mesh.has_geometric_quantity("cell_volume")
+    assert not mesh.has_geometric_quantity("jacobian")
+    with pytest.raises(NotImplementedError):
+        mesh.geometric_quantity("jacobian")
+
+
+if __name__ == '__main__':
+    import os
+    pytest.main(os.path.abspath(__file__))
@@ -155,6 +155,24 @@ if mesh.comm.rank == 0:
     assert np.allclose(expect, actual)
 
 
+def test_limiters_share_centroid_preconditioner():
+    mesh = UnitSquareMesh(4, 4)
+    V = FunctionSpace(mesh, "DG", 1)
+    first = VertexBasedLimiter(V)
+    second = VertexBasedLimiter(V)
+    assert first.centroid_solver.A is second.centroid_solver.A
+    assert first.centroid_solver.ksp.getPC().handle == second.centroid_solver.ksp.getPC().handle
+
+    mesh.coordinates.dat.data[:] *= 2
+    mesh.notify_coordinates_changed()
+    moved = VertexBasedLimiter(V)
+    assert moved.centroid_solver.A is not first.centroid_solver.A
+
+    # In use by the live limiters
+    mesh.clear_caches(kind="mass_matrix")
+    assert VertexBasedLimiter(V).centroid_solver.A is moved.centroid_solver.A
+
+
 if __name__ == '__main__':
     import os
     pytest.main(os.path.abspath(__file__))